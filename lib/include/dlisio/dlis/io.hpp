@@ -4,6 +4,7 @@
 #include <array>
 #include <string>
 #include <tuple>
+#include <utility>
 #include <vector>
 #include <map>
 
@@ -21,9 +22,30 @@ struct stream_offsets {
     std::vector< long long > explicits;
     std::vector< long long > implicits;
     std::vector< long long > broken;
+    std::map< dl::ident, std::vector< long long > > fdata;
+    /*
+     * Size of the body of every record in fdata, not counting the OBNAME,
+     * in the same order as the tells. Segment padding and trailers are
+     * included, so this is an upper bound on the size of the frame data.
+     */
+    std::map< dl::ident, std::vector< long long > > fdata_sizes;
+    /*
+     * The frame number of the first frame in every record in fdata, or -1
+     * when there is none (NOFORMAT records, empty or broken records).
+     */
+    std::map< dl::ident, std::vector< long long > > fdata_framenos;
+    /*
+     * The [begin, end) tells of the last segment body of every record in
+     * fdata, with padding and trailers trimmed away, i.e. end is where the
+     * last frame of the record ends. end is -1 if it could not be determined.
+     */
+    std::map< dl::ident,
+              std::vector< std::pair< long long, long long > > > fdata_tails;
 };
 
-dlisio::stream open(const std::string&, std::int64_t) noexcept (false);
+dlisio::stream open(const std::string&,
+                    std::int64_t,
+                    bool mapped = false) noexcept (false);
 dlisio::stream open_rp66(const dlisio::stream&) noexcept (false);
 dlisio::stream open_tapeimage(const dlisio::stream&) noexcept (false);
 
@@ -56,6 +78,38 @@ dl::record extract(dlisio::stream&, long long, dl::error_handler&) noexcept (fal
 dl::record& extract(dlisio::stream&, long long, long long, dl::record&,
     dl::error_handler&) noexcept (false);
 
+/* A logical record, as a view into a memory-mapped file
+ *
+ * Like dl::record, but rather than owning a copy of the body, begin and end
+ * point straight into the mapping. The view is valid until the stream it was
+ * extracted from is closed.
+ */
+struct record_view {
+    bool isencrypted() const noexcept (true);
+
+    int type;
+    std::uint8_t attributes;
+    const char* begin;
+    const char* end;
+};
+
+/* Extract the record at tell as a view, without copying it
+ *
+ * Only records that are a single segment, laid out consecutively on disk in
+ * a memory-mapped stream can be viewed. For any other record false is
+ * returned, and the record must be read with extract. The stream position is
+ * undefined after the call.
+ */
+bool extract_view(dlisio::stream&, long long, dl::record_view&) noexcept (false);
+
+/* Index the logical records of a logical file.
+ *
+ * Stream is expected to be positioned at the start of the logical file.
+ * Records are traversed until the next logical file (FILE-HEADER) or EOF.
+ * Implicit records are indexed by their OBNAME in the same pass, keyed by
+ * the fingerprint of the FRAME (or NO-FORMAT) they belong to, along with the
+ * size of their bodies and the number of their first frame.
+ */
 stream_offsets findoffsets(dlisio::stream&, dl::error_handler&) noexcept (false);
 
 std::map< dl::ident, std::vector< long long > >
@@ -5,7 +5,9 @@
 #include <cstdint>
 #include <exception>
 #include <tuple>
+#include <string>
 #include <type_traits>
+#include <unordered_map>
 #include <utility>
 #include <vector>
 
@@ -269,7 +271,48 @@ struct matcher {
     virtual ~matcher() = default;
 };
 
-/* A queryable pool of metadata objects */
+/*
+ * Matches when pattern and candidate are equal. The matchers below are pure
+ * C++, so pool::get does not have to call back into another language to use
+ * them.
+ *
+ * Names that are not UTF-8 may be in some other encoding, and an
+ * exact_matcher may derive from this to consider two differently encoded
+ * names equal. It must still match names that are byte-for-byte equal, and
+ * only those if both names are UTF-8, see pool.
+ */
+struct exact_matcher : public matcher {
+    bool match(const dl::ident& pattern, const dl::ident& candidate)
+        const noexcept (false) override;
+};
+
+/*
+ * Matches when pattern and candidate are equal, ignoring the case of ASCII
+ * letters
+ */
+struct icase_matcher : public matcher {
+    bool match(const dl::ident& pattern, const dl::ident& candidate)
+        const noexcept (false) override;
+};
+
+/*
+ * True if str is valid UTF-8, and has no NUL characters
+ */
+bool is_utf8(const std::string& str) noexcept (true);
+
+/*
+ * A queryable pool of metadata objects
+ *
+ * On first use, the pool builds an index of the sets by type, and on the
+ * first query by name for a type, an index of the objects of that type by
+ * name. With the exact_matcher, lookups go straight to the index. Other
+ * matchers are only run once for every distinct type and name, rather than
+ * for every set and object. The objects are returned in the order they
+ * appear in the sets either way.
+ *
+ * Types and names that are not UTF-8 are always passed to the matcher, also
+ * the exact_matcher, as they may be equal to a pattern in another encoding.
+ */
 class pool {
 public:
     explicit pool( std::vector< dl::object_set > e ) : eflrs(std::move(e)) {};
@@ -285,8 +328,55 @@ public:
                       const dl::matcher& matcher,
                       const error_handler& errorhandler) noexcept (false);
 
+    /*
+     * The objects of type with exactly this name, origin and copy number,
+     * i.e. with this fingerprint. There is normally only one. The matcher
+     * is only used for types and names that are not UTF-8.
+     */
+    object_vector get(const std::string& type,
+                      const dl::obname& name,
+                      const dl::exact_matcher& matcher,
+                      const error_handler& errorhandler) noexcept (false);
+
 private:
+    /* (set, object in set) */
+    using position = std::pair< std::size_t, std::size_t >;
+
+    struct type_index {
+        std::vector< std::size_t > sets;
+
+        /* The distinct names of the objects, and where they are */
+        bool named = false;
+        std::vector< std::string > names;
+        std::unordered_map< std::string, std::vector< position > > objects;
+        /* The names that are not UTF-8 */
+        std::vector< std::string > foreign;
+    };
+
     std::vector< dl::object_set > eflrs;
+
+    /* The distinct types, in the order they first appear */
+    bool indexed = false;
+    std::vector< std::string > type_names;
+    std::unordered_map< std::string, type_index > index;
+    /* The types that are not UTF-8 */
+    std::vector< std::string > foreign_types;
+
+    bool fingerprinted = false;
+    std::unordered_map< std::string, std::vector< position > > fingerprints;
+
+    void build_index() noexcept (false);
+    void build_names(type_index&) noexcept (false);
+    void build_fingerprints() noexcept (false);
+
+    std::vector< type_index* > match_types(const std::string& type,
+                                           const dl::matcher& matcher)
+    noexcept (false);
+
+    object_vector collect(std::vector< std::size_t > sets,
+                          std::vector< position > positions,
+                          const error_handler& errorhandler)
+    noexcept (false);
 };
 
 } // namespace dlis
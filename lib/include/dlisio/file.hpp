@@ -22,6 +22,12 @@ namespace dlisio {
 class stream {
 public:
     explicit stream( lfp_protocol* p ) noexcept (true) : f(p) {};
+    /* A stream over a memory-mapped file, where data is the mapping of the
+     * whole file, see fopen. The mapping is owned by the innermost protocol,
+     * and is unmapped by close.
+     */
+    stream( lfp_protocol* p, const char* data, std::int64_t size )
+    noexcept (true) : f(p), map(data), mapsize(size) {};
 
     void seek( std::int64_t offset ) noexcept (false);
 
@@ -60,6 +66,23 @@ public:
 
     std::int64_t read( char* dst, int n ) noexcept (false);
 
+    /** View the next n bytes, without copying
+     *
+     * When the file is memory-mapped, and the next n (logical) bytes are
+     * also consecutive bytes on disk, i.e. there are no envelope headers or
+     * tapemarks in between, return a pointer to them in the mapping and
+     * advance the stream past them. Otherwise return nullptr, and leave the
+     * position undefined. The caller is expected to seek and fall back to
+     * read.
+     *
+     * The pointer is valid until the stream is closed.
+     */
+    const char* view( std::int64_t n ) noexcept (false);
+
+    /* The mapping of the whole file, or nullptr if the file is not mapped */
+    const char* mapping() const noexcept (true);
+    std::int64_t mapping_size() const noexcept (true);
+
     /* return a pointer to the current lfp_protocol */
     lfp_protocol* protocol() const noexcept (true);
 
@@ -70,10 +93,27 @@ public:
     int peof() const noexcept (false);
 private:
     lfp_protocol* f;
+    const char* map = nullptr;
+    std::int64_t mapsize = 0;
 };
 
-/* Opens a file in 'rb' mode */
-std::FILE* fopen( const char* path ) noexcept (false);
+/* Opens a file in 'rb' mode
+ *
+ * When mapped is true, the file is memory-mapped and the returned FILE* reads
+ * straight from the mapping, so seeks and reads are served from the page
+ * cache without any system calls. The handle keeps the default stdio
+ * buffering, as unbuffered stdio handles feed lfp's reads through the
+ * mapping one byte at a time. The mapping itself is written to data and size, so that it can be handed to a
+ * stream, which can then give views into it rather than copies, see
+ * stream::view. The mapping lives until the FILE* is closed.
+ *
+ * On platforms without support for custom FILE* streams this falls back to a
+ * regular fopen, and data is set to nullptr.
+ */
+std::FILE* fopen( const char* path,
+                  bool mapped = false,
+                  const char** data = nullptr,
+                  std::int64_t* size = nullptr ) noexcept (false);
 
 } // namespace dlisio
 
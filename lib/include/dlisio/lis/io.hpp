@@ -147,6 +147,8 @@ private:
 struct iodevice : public dlisio::stream {
 public:
     explicit iodevice( lfp_protocol* p ) : dlisio::stream(p) {};
+    iodevice( lfp_protocol* p, const char* data, std::int64_t size ) :
+        dlisio::stream(p, data, size) {};
 
     /* Read the physical header from the file. UB if the next byte that is
      * _not_ a padbyte is not a part of the header [1]
@@ -213,6 +215,18 @@ public:
      */
     record_info index_record() noexcept (false);
     record read_record( const record_info& ) noexcept (false);
+
+    /** View a record, without copying it
+     *
+     * Like read_record, but rather than copying the record, begin and end are
+     * set to point straight into the memory-mapped file. Only records that
+     * are contained in a single PR, laid out consecutively on disk, can be
+     * viewed. For any other record false is returned, and the record must be
+     * read with read_record. The view is valid until the iodevice is closed.
+     */
+    bool view_record( const record_info&,
+                      const char** begin,
+                      const char** end ) noexcept (false);
     std::vector<record> read_records(const record_index&,
                                      const record_type&) noexcept(false);
 };
@@ -233,8 +247,14 @@ public:
  *
  * To make this process more smooth, open reads a single byte to verify that
  * the iodevice is not opened at EOF. If it is, open throws a lis::eof_error.
+ *
+ * If 'mapped' is true, the file is read through a memory-mapping, see
+ * dlisio::fopen.
  * */
-iodevice open( const std::string& path, std::int64_t offset, bool tapemark)
+iodevice open( const std::string& path,
+               std::int64_t offset,
+               bool tapemark,
+               bool mapped = false)
 noexcept (false);
 
 } // namespace lis79
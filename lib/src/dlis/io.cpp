@@ -24,9 +24,11 @@ namespace dl = dlisio::dlis;
 
 namespace dlisio { namespace dlis {
 
-dlisio::stream open(const std::string& path, std::int64_t offset)
+dlisio::stream open(const std::string& path, std::int64_t offset, bool mapped)
 noexcept (false) {
-    auto* file = dlisio::fopen(path.c_str());
+    const char* data;
+    std::int64_t size;
+    auto* file = dlisio::fopen(path.c_str(), mapped, &data, &size);
     if (!file) {
         auto msg = "unable to open file for path {} : {}";
         throw dlisio::io_error(fmt::format(msg, path, strerror(errno)));
@@ -39,7 +41,7 @@ noexcept (false) {
         throw dlisio::io_error(fmt::format(msg, offset));
     }
 
-    return dlisio::stream(protocol);
+    return dlisio::stream(protocol, data, size);
 }
 
 dlisio::stream open_rp66(const dlisio::stream& f) noexcept (false) {
@@ -51,7 +53,7 @@ dlisio::stream open_rp66(const dlisio::stream& f) noexcept (false) {
             throw dlisio::io_error("lfp: unable to apply rp66 protocol");
     }
 
-    return dlisio::stream(protocol);
+    return dlisio::stream(protocol, f.mapping(), f.mapping_size());
 }
 
 dlisio::stream open_tapeimage(const dlisio::stream& f) noexcept (false) {
@@ -62,7 +64,7 @@ dlisio::stream open_tapeimage(const dlisio::stream& f) noexcept (false) {
         else
             throw dlisio::io_error("lfp: unable to apply tapeimage protocol");
     }
-    return dlisio::stream(protocol);
+    return dlisio::stream(protocol, f.mapping(), f.mapping_size());
 }
 
 namespace {
@@ -381,6 +383,46 @@ record& extract(dlisio::stream& file, long long tell, long long bytes, record& r
     }
 }
 
+bool record_view::isencrypted() const noexcept (true) {
+    return this->attributes & DLIS_SEGATTR_ENCRYPT;
+}
+
+bool extract_view(dlisio::stream& file, long long tell, record_view& rec)
+noexcept (false) {
+    if (not file.mapping()) return false;
+
+    file.seek(tell);
+    char buffer[ DLIS_LRSH_SIZE ];
+    auto nread = file.read( buffer, DLIS_LRSH_SIZE );
+    if ( nread < DLIS_LRSH_SIZE ) return false;
+
+    int len, type;
+    std::uint8_t attrs;
+    dlis_lrsh( buffer, &len, &attrs, &type );
+    len -= DLIS_LRSH_SIZE;
+
+    /*
+     * Records that span multiple segments are interleaved with headers (and
+     * possibly trailers) on disk, and must be copied into one buffer anyway
+     */
+    if (attrs & DLIS_SEGATTR_SUCCSEG) return false;
+    if (len <= 0) return false;
+
+    const auto* begin = file.view(len);
+    if (not begin) return false;
+
+    int trim = 0;
+    const auto err = dlis_trim_record_segment(attrs, begin, begin + len, &trim);
+    if (err != DLIS_OK) return false;
+
+    static const auto fmtenc = DLIS_SEGATTR_EXFMTLR | DLIS_SEGATTR_ENCRYPT;
+    rec.type = type;
+    rec.attributes = attrs & fmtenc;
+    rec.begin = begin;
+    rec.end = begin + len - trim;
+    return true;
+}
+
 stream_offsets findoffsets( dlisio::stream& file, dl::error_handler& errorhandler)
 noexcept (false) {
     stream_offsets ofs;
@@ -406,6 +448,260 @@ noexcept (false) {
         ofs.broken.push_back( lr_offset );
     };
 
+    /*
+     * Implicit records are indexed by the OBNAME that prefixes their body,
+     * and the FRAMENO (UVARI) that follows it. Rather than revisiting every
+     * IFLR after the offsets are found, the leading bytes of each IFLR are
+     * collected while its segments are traversed, so the file is only read
+     * once.
+     */
+    constexpr std::size_t OBNAME_SIZE_MAX = 262;
+    constexpr std::size_t HEAD_SIZE_MAX = OBNAME_SIZE_MAX + 4;
+
+    std::vector< char > obname_bytes;
+    obname_bytes.reserve( HEAD_SIZE_MAX );
+
+    /* Pad count, checksum and trailing length */
+    constexpr int TAIL_SIZE_MAX = 5;
+    long long tail_begin = -1;
+    long long tail_end = -1;
+
+    int lr_type = 0;
+    bool lr_skip = false;
+    long long lr_size = 0;
+
+    const auto handle_fdata = [&]( const std::string& problem ) {
+        const auto context = "dlis::findoffsets: Indexing implicit records";
+        const auto debug = "Physical tell: {} (dec), "
+                           "Logical Record tell: {} (dec)";
+        errorhandler.log(dl::error_severity::CRITICAL, context, problem, "",
+                         "Record is skipped",
+                         fmt::format(debug, file.ptell(), lr_offset));
+    };
+
+    const auto index_fdata = [&]() {
+        if (lr_skip) return;
+        if (lr_type != 0 and lr_type != 1) return;
+        if (obname_bytes.size() == 0) return;
+
+        /*
+         * Zero-pad the collected bytes so that dlis_obname and dlis_uvari
+         * never read outside the buffer, even when the record is truncated
+         */
+        const auto size = obname_bytes.size();
+        obname_bytes.resize( HEAD_SIZE_MAX, 0 );
+
+        int32_t origin;
+        uint8_t copy;
+        int32_t idlen;
+        char id[ 256 ];
+        const char* begin = obname_bytes.data();
+        const char* cur = dlis_obname(begin, &origin, &copy, &idlen, id);
+
+        std::size_t obname_size = cur - begin;
+        if (obname_size > size) {
+            const auto problem =
+                "fdata record corrupted, error on reading obname";
+            handle_fdata(problem);
+            return;
+        }
+        dl::obname tmp{ dl::origin{ origin },
+                        dl::ushort{ copy },
+                        dl::ident{ std::string{ id, id + idlen } } };
+
+        const auto fingerprint = lr_type == 0
+                               ? tmp.fingerprint("FRAME")
+                               : tmp.fingerprint("NO-FORMAT");
+
+        long long frameno = -1;
+        if (lr_type == 0 and obname_size < size) {
+            std::int32_t no;
+            const char* next = dlis_uvari(cur, &no);
+            if (std::size_t(next - begin) <= size)
+                frameno = no;
+        }
+
+        ofs.fdata[fingerprint].push_back( lr_offset );
+        ofs.fdata_sizes[fingerprint].push_back( lr_size - (long long)obname_size );
+        ofs.fdata_framenos[fingerprint].push_back( frameno );
+        ofs.fdata_tails[fingerprint].push_back( { tail_begin, tail_end } );
+    };
+
+    /*
+     * The last frame of an implicit record ends where the body of its last
+     * segment ends, minus padding and trailers. Only the last few bytes of
+     * the segment are needed to find the trim, which are collected while the
+     * segment is traversed anyway. This is enough to find the last frame of
+     * records with fixed-size frames without reading the record, see
+     * read_index_ranges.
+     */
+    const auto find_tail = [&]( std::uint8_t attrs,
+                                std::int64_t body_offset,
+                                const char* last,
+                                int nlast,
+                                int segment_size ) {
+        tail_begin = body_offset;
+        tail_end = -1;
+
+        /* The pad count is the byte before checksum and trailing length */
+        if ((attrs & DLIS_SEGATTR_PADDING) and nlast < TAIL_SIZE_MAX)
+            return;
+
+        int trim = 0;
+        dlis_trim_record_segment(attrs, last, last + nlast, &trim);
+        if (trim > segment_size) return;
+        tail_end = body_offset + segment_size - trim;
+    };
+
+    /*
+     * Bookkeeping shared by the buffered and the segment-by-segment
+     * traversal. begin_segment must be called for every segment before
+     * lrs_offset is moved past it, end_segment after.
+     */
+    const auto begin_segment = [&]( int type, std::uint8_t attrs, int len ) {
+        if (lrs_offset == lr_offset) {
+            /*
+             * First segment of a new logical record. Like extract, the record
+             * type and encryption are decided by the first segment
+             */
+            obname_bytes.clear();
+            lr_type = type;
+            lr_skip = (attrs & DLIS_SEGATTR_EXFMTLR)
+                   or (attrs & DLIS_SEGATTR_ENCRYPT);
+            lr_size = 0;
+        }
+        lr_size += len - DLIS_LRSH_SIZE;
+    };
+
+    const auto collect_size = [&]( std::uint8_t attrs, int segment_size ) {
+        /*
+         * Number of body bytes needed from the current segment. Like in
+         * extract, a partial segment is only enough as long as there is no
+         * padding, checksum or trailing length.
+         */
+        if (lr_skip or obname_bytes.size() >= HEAD_SIZE_MAX) return 0;
+
+        const int remaining = HEAD_SIZE_MAX - obname_bytes.size();
+        if ( not (attrs & DLIS_SEGATTR_PADDING) and
+             not (attrs & DLIS_SEGATTR_TRAILEN) and
+             not (attrs & DLIS_SEGATTR_CHCKSUM) and
+             remaining < segment_size ) {
+
+            return remaining;
+        }
+        return segment_size;
+    };
+
+    const auto trim_collected = [&]( std::uint8_t attrs,
+                                     std::size_t prevsize,
+                                     int segment_size ) {
+        try {
+            const auto* fst = obname_bytes.data() + prevsize;
+            trim_segment(attrs, fst, segment_size, obname_bytes, errorhandler);
+        } catch (const std::exception& e) {
+            handle_fdata(e.what());
+            lr_skip = true;
+        }
+
+        if (obname_bytes.size() > HEAD_SIZE_MAX)
+            obname_bytes.resize( HEAD_SIZE_MAX );
+    };
+
+    const auto end_segment = [&]( bool isexplicit ) {
+        if (has_successor) return;
+
+        if (isexplicit)
+            ofs.explicits.push_back( lr_offset );
+        else {
+            ofs.implicits.push_back( lr_offset );
+            index_fdata();
+        }
+
+        lr_offset = lrs_offset;
+    };
+
+    /*
+     * Buffered traversal. Large blocks are read, and the segments that are
+     * entirely contained in a block are indexed from memory. This avoids a
+     * seek and read per segment, which dominates indexing time for files with
+     * many small segments.
+     *
+     * A segment that is entirely in memory is by definition not truncated.
+     * Anything out of the ordinary - read errors, short reads at the end of
+     * the data, malformed headers and the end of the logical file - is left
+     * for the segment-by-segment traversal below, which picks up at the
+     * first segment not processed here. That way all error reporting, and the
+     * final position of the stream, is exactly as if the entire logical file
+     * had been traversed segment by segment.
+     */
+    constexpr int BLOCK_SIZE = 1 << 20;
+
+    std::vector< char > block;
+    std::int64_t block_offset = 0;
+    bool last_block = false;
+
+    while (true) {
+        const std::int64_t pos = lrs_offset - block_offset;
+        const std::int64_t available = std::int64_t(block.size()) - pos;
+
+        if (available < DLIS_LRSH_SIZE) {
+            if (last_block) break;
+            block.resize( BLOCK_SIZE );
+            std::int64_t nread = 0;
+            try {
+                file.seek(lrs_offset);
+                nread = file.read(block.data(), BLOCK_SIZE);
+            } catch (const std::exception&) {
+                break;
+            }
+            block.resize( nread );
+            block_offset = lrs_offset;
+            last_block = nread < BLOCK_SIZE;
+            continue;
+        }
+
+        const char* segment = block.data() + pos;
+
+        int len, type;
+        std::uint8_t attrs;
+        dlis_lrsh( segment, &len, &attrs, &type );
+        if (len < 4) break;
+
+        const bool isexplicit      = attrs & DLIS_SEGATTR_EXFMTLR;
+        const bool has_predecessor = attrs & DLIS_SEGATTR_PREDSEG;
+        if (not has_predecessor and isexplicit and type == 0
+                                and ofs.explicits.size())
+            break;
+
+        if (available < len) {
+            if (last_block) break;
+            // Segment crosses the block boundary, read a new block from here
+            block.clear();
+            continue;
+        }
+
+        begin_segment(type, attrs, len);
+        has_successor = attrs & DLIS_SEGATTR_SUCCSEG;
+
+        const int segment_size = len - DLIS_LRSH_SIZE;
+        const auto* body = segment + DLIS_LRSH_SIZE;
+        const int nlast = std::min(segment_size, TAIL_SIZE_MAX);
+        find_tail(attrs, lrs_offset + DLIS_LRSH_SIZE,
+                  body + segment_size - nlast, nlast, segment_size);
+        lrs_offset += len;
+
+        const int to_copy = collect_size(attrs, segment_size);
+        if (to_copy > 0) {
+            const auto prevsize = obname_bytes.size();
+            obname_bytes.insert(obname_bytes.end(), body, body + to_copy);
+
+            if (to_copy == segment_size)
+                trim_collected(attrs, prevsize, segment_size);
+        }
+
+        end_segment(isexplicit);
+    }
+
     int len = 0;
     auto read = 0;
 
@@ -485,51 +781,95 @@ noexcept (false) {
             }
         }
 
+        begin_segment(type, attrs, len);
         has_successor = attrs & DLIS_SEGATTR_SUCCSEG;
         lrs_offset += len;
 
         /*
-         * Skip the segment by moving the cursor to the next offset.
-         * Seek operation alone isn't enough to correctly set EOF. To make sure
-         * record is not truncated, read its last byte instead of seeking
-         * to the new offset.
-         *
-         * Note that lfp returns UNEXPECTED_EOF for cfile when truncation
-         * happens inside of declared data
-         * TODO: assure behavior for other io types
+         * Collect the leading bytes of the implicit record body. If the
+         * segment is read to its very end, the read itself proves that the
+         * segment is not truncated.
          */
-
-        char tmp;
-        try {
-            file.seek(lrs_offset - 1);
-        } catch (std::exception& e) {
-            handle(e.what());
-            break;
-        }
-        try {
-            file.read(&tmp, 1);
-        } catch (const std::runtime_error& e) {
-            const auto problem = "File truncated in Logical Record Segment";
-            handle(problem);
-            break;
+        const int segment_size = len - DLIS_LRSH_SIZE;
+        const int to_read = collect_size(attrs, segment_size);
+        const int nlast = std::min(segment_size, TAIL_SIZE_MAX);
+        bool segment_read = false;
+
+        if (to_read > 0) {
+            const auto prevsize = obname_bytes.size();
+            obname_bytes.resize( prevsize + to_read );
+            try {
+                read = file.read(obname_bytes.data() + prevsize, to_read);
+            } catch (const std::runtime_error& e) {
+                const auto problem = "File truncated in Logical Record Segment";
+                handle(problem);
+                break;
+            }
+            obname_bytes.resize( prevsize + read );
+
+            if (read == segment_size) {
+                segment_read = true;
+                const auto* last =
+                    obname_bytes.data() + prevsize + segment_size - nlast;
+                find_tail(attrs, lrs_offset - segment_size,
+                          last, nlast, segment_size);
+                trim_collected(attrs, prevsize, segment_size);
+            }
         }
 
-
-        if (not (has_successor)) {
-            if (isexplicit)
-                ofs.explicits.push_back( lr_offset );
+        if (not segment_read) {
             /*
-             * Consider doing fdata-indexing on the fly as we are now at the
-             * correct offset to read the OBNAME. That would mean we only
-             * need to traverse the file a single time to index it.
-             * Additionally it would make the caller code from python way
-             * nicer.
+             * Skip the segment by moving the cursor to the next offset.
+             * Seek operation alone isn't enough to correctly set EOF. To make
+             * sure record is not truncated, read its last byte instead of
+             * seeking to the new offset.
+             *
+             * Note that lfp returns UNEXPECTED_EOF for cfile when truncation
+             * happens inside of declared data
+             * TODO: assure behavior for other io types
              */
-            else
-                ofs.implicits.push_back( lr_offset );
 
-            lr_offset = lrs_offset;
+            char tmp;
+            try {
+                file.seek(lrs_offset - 1);
+            } catch (std::exception& e) {
+                handle(e.what());
+                break;
+            }
+            try {
+                file.read(&tmp, 1);
+            } catch (const std::runtime_error& e) {
+                const auto problem = "File truncated in Logical Record Segment";
+                handle(problem);
+                break;
+            }
+
+            /*
+             * The segment is not truncated, so the bytes just before are
+             * there too. Read them to find the tail of the implicit record,
+             * which is only needed for its last segment
+             */
+            tail_begin = tail_end = -1;
+            const bool implicit = lr_type == 0 or lr_type == 1;
+            if (implicit and not lr_skip and not has_successor) {
+                char last[ TAIL_SIZE_MAX ];
+                try {
+                    file.seek(lrs_offset - nlast);
+                    if (file.read(last, nlast) == nlast)
+                        find_tail(attrs, lrs_offset - segment_size,
+                                  last, nlast, segment_size);
+                } catch (const std::exception&) {}
+
+                try {
+                    file.seek(lrs_offset);
+                } catch (std::exception& e) {
+                    handle(e.what());
+                    break;
+                }
+            }
         }
+
+        end_segment(isexplicit);
     }
     return ofs;
 }
@@ -1147,6 +1147,64 @@ dl::object_vector& object_set::objects() noexcept (false) {
     return this->objs;
 }
 
+bool exact_matcher::match(const dl::ident& pattern,
+                          const dl::ident& candidate)
+const noexcept (false) {
+    return pattern == candidate;
+}
+
+bool icase_matcher::match(const dl::ident& pattern,
+                          const dl::ident& candidate)
+const noexcept (false) {
+    const auto& lhs = static_cast< const std::string& >(pattern);
+    const auto& rhs = static_cast< const std::string& >(candidate);
+    if (lhs.size() != rhs.size()) return false;
+
+    /* Not std::tolower, which depends on the locale */
+    const auto lower = [](char c) {
+        return (c >= 'A' and c <= 'Z') ? char(c - 'A' + 'a') : c;
+    };
+    return std::equal(lhs.begin(), lhs.end(), rhs.begin(),
+        [&lower](char x, char y) { return lower(x) == lower(y); }
+    );
+}
+
+bool is_utf8(const std::string& str) noexcept (true) {
+    /*
+     * As strict as the UTF-8 decoder in python, i.e. no overlong encodings,
+     * no surrogates and nothing past U+10FFFF
+     */
+    const auto* cur = reinterpret_cast< const unsigned char* >(str.data());
+    const auto* end = cur + str.size();
+
+    while (cur != end) {
+        const auto c = *cur++;
+        if (c == 0x00) return false;
+        if (c  < 0x80) continue;
+
+        int follow;
+        unsigned char lo = 0x80;
+        unsigned char hi = 0xBF;
+        if      (c  < 0xC2) return false;
+        else if (c  < 0xE0) follow = 1;
+        else if (c == 0xE0) { follow = 2; lo = 0xA0; }
+        else if (c == 0xED) { follow = 2; hi = 0x9F; }
+        else if (c  < 0xF0) follow = 2;
+        else if (c == 0xF0) { follow = 3; lo = 0x90; }
+        else if (c  < 0xF4) follow = 3;
+        else if (c == 0xF4) { follow = 3; hi = 0x8F; }
+        else return false;
+
+        if (end - cur < follow) return false;
+        if (*cur < lo or *cur > hi) return false;
+        ++cur;
+        for (int i = 1; i < follow; ++i, ++cur) {
+            if (*cur < 0x80 or *cur > 0xBF) return false;
+        }
+    }
+    return true;
+}
+
 std::vector< dl::ident > pool::types() const noexcept (true) {
     std::vector< dl::ident > types;
     for (const auto& eflr : this->eflrs) {
@@ -1155,21 +1213,116 @@ std::vector< dl::ident > pool::types() const noexcept (true) {
     return types;
 }
 
-object_vector pool::get(const std::string& type,
-                        const std::string& name,
-                        const dl::matcher& m,
-                        const error_handler& errorhandler)
+void pool::build_index() noexcept (false) {
+    if (this->indexed) return;
+
+    for (std::size_t i = 0; i < this->eflrs.size(); ++i) {
+        const auto& type = dl::decay(this->eflrs[i].type);
+        auto itr = this->index.find(type);
+        if (itr == this->index.end()) {
+            this->type_names.push_back(type);
+            if (not is_utf8(type)) this->foreign_types.push_back(type);
+            itr = this->index.emplace(type, type_index()).first;
+        }
+        itr->second.sets.push_back(i);
+    }
+    this->indexed = true;
+}
+
+void pool::build_names(type_index& ti) noexcept (false) {
+    if (ti.named) return;
+
+    for (auto set : ti.sets) {
+        const auto& objects = this->eflrs[set].objects();
+        for (std::size_t i = 0; i < objects.size(); ++i) {
+            const auto& name = dl::decay(objects[i].object_name.id);
+            auto itr = ti.objects.find(name);
+            if (itr == ti.objects.end()) {
+                ti.names.push_back(name);
+                if (not is_utf8(name)) ti.foreign.push_back(name);
+                itr = ti.objects.emplace(name, std::vector< position >()).first;
+            }
+            itr->second.emplace_back(set, i);
+        }
+    }
+    ti.named = true;
+}
+
+namespace {
+
+/*
+ * Key of an object in the fingerprint index. Equivalent to the fingerprint
+ * of the object, but cheaper to make, and defined for all names.
+ */
+std::string object_key(const std::string& type, const dl::obname& name)
 noexcept (false) {
-    object_vector objs;
+    return type + '\0'
+         + dl::decay(name.id) + '\0'
+         + std::to_string(dl::decay(name.origin)) + '\0'
+         + std::to_string(dl::decay(name.copy));
+}
+
+}
+
+void pool::build_fingerprints() noexcept (false) {
+    if (this->fingerprinted) return;
+
+    this->build_index();
+    for (const auto& type : this->type_names) {
+        for (auto set : this->index[type].sets) {
+            const auto& objects = this->eflrs[set].objects();
+            for (std::size_t i = 0; i < objects.size(); ++i) {
+                const auto key = object_key(type, objects[i].object_name);
+                this->fingerprints[key].emplace_back(set, i);
+            }
+        }
+    }
+    this->fingerprinted = true;
+}
 
-    for (auto& eflr : this->eflrs) {
-        if (not m.match(dl::ident{type}, eflr.type)) continue;
+std::vector< pool::type_index* >
+pool::match_types(const std::string& type, const dl::matcher& m)
+noexcept (false) {
+    this->build_index();
 
-        for (const auto& obj : eflr.objects()) {
-            if (not m.match(dl::ident{name}, obj.object_name.id)) continue;
+    std::vector< type_index* > matches;
+    if (dynamic_cast< const dl::exact_matcher* >(&m) and is_utf8(type)) {
+        const auto itr = this->index.find(type);
+        if (itr != this->index.end())
+            matches.push_back(&itr->second);
 
-            objs.push_back(obj);
+        for (const auto& candidate : this->foreign_types) {
+            if (m.match(dl::ident{type}, dl::ident{candidate}))
+                matches.push_back(&this->index[candidate]);
         }
+        return matches;
+    }
+
+    for (const auto& candidate : this->type_names) {
+        if (m.match(dl::ident{type}, dl::ident{candidate}))
+            matches.push_back(&this->index[candidate]);
+    }
+    return matches;
+}
+
+/*
+ * The objects at positions, in the order of the sets. The errors of all the
+ * sets are reported, whether there are objects from them or not.
+ */
+object_vector pool::collect(std::vector< std::size_t > sets,
+                            std::vector< position > positions,
+                            const error_handler& errorhandler)
+noexcept (false) {
+    std::sort(sets.begin(), sets.end());
+    std::sort(positions.begin(), positions.end());
+
+    object_vector objs;
+    auto pos = positions.begin();
+    for (auto set : sets) {
+        auto& eflr = this->eflrs[set];
+        const auto& objects = eflr.objects();
+        for (; pos != positions.end() and pos->first == set; ++pos)
+            objs.push_back(objects[pos->second]);
 
         report_set_errors (eflr, errorhandler);
     }
@@ -1177,15 +1330,52 @@ noexcept (false) {
 }
 
 object_vector pool::get(const std::string& type,
+                        const std::string& name,
                         const dl::matcher& m,
                         const error_handler& errorhandler)
 noexcept (false) {
-    object_vector objs;
+    const bool exact = dynamic_cast< const dl::exact_matcher* >(&m)
+                   and is_utf8(name);
+
+    std::vector< std::size_t > sets;
+    std::vector< position > positions;
+    for (auto* ti : this->match_types(type, m)) {
+        this->build_names(*ti);
+        sets.insert(sets.end(), ti->sets.begin(), ti->sets.end());
+
+        /* Names that are not UTF-8 are not in the index under name */
+        const auto& candidates = exact ? ti->foreign : ti->names;
+        if (exact) {
+            const auto itr = ti->objects.find(name);
+            if (itr != ti->objects.end()) {
+                const auto& found = itr->second;
+                positions.insert(positions.end(), found.begin(), found.end());
+            }
+        }
+
+        for (const auto& candidate : candidates) {
+            if (not m.match(dl::ident{name}, dl::ident{candidate})) continue;
+            const auto& found = ti->objects[candidate];
+            positions.insert(positions.end(), found.begin(), found.end());
+        }
+    }
+
+    return this->collect(std::move(sets), std::move(positions), errorhandler);
+}
 
-    for (auto& eflr : this->eflrs) {
-        if (not m.match(dl::ident{type}, eflr.type)) continue;
+object_vector pool::get(const std::string& type,
+                        const dl::matcher& m,
+                        const error_handler& errorhandler)
+noexcept (false) {
+    std::vector< std::size_t > sets;
+    for (const auto* ti : this->match_types(type, m))
+        sets.insert(sets.end(), ti->sets.begin(), ti->sets.end());
+    std::sort(sets.begin(), sets.end());
 
-        auto tmp = eflr.objects();
+    object_vector objs;
+    for (auto set : sets) {
+        auto& eflr = this->eflrs[set];
+        const auto& tmp = eflr.objects();
         objs.insert(objs.end(), tmp.begin(), tmp.end());
 
         report_set_errors (eflr, errorhandler);
@@ -1193,6 +1383,53 @@ noexcept (false) {
     return objs;
 }
 
+object_vector pool::get(const std::string& type,
+                        const dl::obname& name,
+                        const dl::exact_matcher& m,
+                        const error_handler& errorhandler)
+noexcept (false) {
+    this->build_index();
+
+    const auto& id = dl::decay(name.id);
+    bool foreign = not this->foreign_types.empty()
+                or not is_utf8(type)
+                or not is_utf8(id);
+
+    const auto ti = this->index.find(type);
+    if (not foreign and ti != this->index.end()) {
+        this->build_names(ti->second);
+        foreign = not ti->second.foreign.empty();
+    }
+
+    /*
+     * Some other encoding may make a name equal to this one, so look the
+     * objects up by name, and then by origin and copy number
+     */
+    if (foreign) {
+        auto objs = this->get(type, id, m, errorhandler);
+        const auto other = [&name](const dl::basic_object& obj) {
+            return dl::decay(obj.object_name.origin) != dl::decay(name.origin)
+                or dl::decay(obj.object_name.copy)   != dl::decay(name.copy);
+        };
+        objs.erase(std::remove_if(objs.begin(), objs.end(), other),
+                   objs.end());
+        return objs;
+    }
+
+    this->build_fingerprints();
+
+    std::vector< std::size_t > sets;
+    if (ti != this->index.end())
+        sets = ti->second.sets;
+
+    std::vector< position > positions;
+    const auto itr = this->fingerprints.find(object_key(type, name));
+    if (itr != this->fingerprints.end())
+        positions = itr->second;
+
+    return this->collect(std::move(sets), std::move(positions), errorhandler);
+}
+
 } // namespace dlis
 
 } // namespace dlisio
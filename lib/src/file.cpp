@@ -1,6 +1,9 @@
+#include <algorithm>
 #include <stdexcept>
+#include <cerrno>
 #include <cstdint>
 #include <cstdio>
+#include <cstring>
 #include <string>
 #include <cassert>
 
@@ -8,10 +11,185 @@
     #include <windows.h>
 #endif
 
+#if defined(__GLIBC__) || defined(__APPLE__) \
+ || defined(__FreeBSD__) || defined(__NetBSD__) || defined(__OpenBSD__)
+    #define DLISIO_HAVE_MMAP_STREAM
+    #include <fcntl.h>
+    #include <sys/mman.h>
+    #include <sys/stat.h>
+    #include <unistd.h>
+#endif
+
 #include <lfp/lfp.h>
 
 #include <dlisio/file.hpp>
 
+#ifdef DLISIO_HAVE_MMAP_STREAM
+namespace {
+
+/*
+ * A read-only memory-mapped file, with a cursor.
+ *
+ * This is the state behind the FILE* handed out by fopen(path, true). The
+ * stdio cookie functions just move the cursor and copy out of the mapping,
+ * which leaves lfp unaware that the file is mapped. The mapping is also
+ * handed out on the side, for stream::view.
+ */
+struct mapping {
+    char* data;
+    std::int64_t size;
+    std::int64_t pos;
+};
+
+mapping* map_file( const char* path ) noexcept (true) {
+    const int fd = ::open(path, O_RDONLY);
+    if (fd == -1) return nullptr;
+
+    struct stat st;
+    if (::fstat(fd, &st) == -1) {
+        const int err = errno;
+        ::close(fd);
+        errno = err;
+        return nullptr;
+    }
+
+    /* mmap refuses zero-length mappings, but an empty file is still a
+     * perfectly valid (albeit useless) file to open
+     */
+    void* data = nullptr;
+    if (st.st_size > 0) {
+        data = ::mmap(nullptr, st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+        if (data == MAP_FAILED) {
+            const int err = errno;
+            ::close(fd);
+            errno = err;
+            return nullptr;
+        }
+    }
+
+    /* The mapping stays valid after the descriptor is closed */
+    ::close(fd);
+    return new mapping{ static_cast< char* >(data), st.st_size, 0 };
+}
+
+std::size_t mapping_read( mapping* m, char* dst, std::size_t n )
+noexcept (true) {
+    const auto left = m->size - m->pos;
+    if (left <= 0) return 0;
+
+    const auto count = std::min< std::int64_t >(n, left);
+    std::memcpy(dst, m->data + m->pos, count);
+    m->pos += count;
+    return count;
+}
+
+int mapping_seek( mapping* m, std::int64_t* offset, int whence )
+noexcept (true) {
+    std::int64_t base;
+    switch (whence) {
+        case SEEK_SET: base = 0;       break;
+        case SEEK_CUR: base = m->pos;  break;
+        case SEEK_END: base = m->size; break;
+        default:
+            errno = EINVAL;
+            return -1;
+    }
+
+    if (base + *offset < 0) {
+        errno = EINVAL;
+        return -1;
+    }
+
+    /* Seeking past the end is allowed, just as for regular files. Reads
+     * from there on simply report EOF.
+     */
+    m->pos = base + *offset;
+    *offset = m->pos;
+    return 0;
+}
+
+int mapping_close( mapping* m ) noexcept (true) {
+    if (m->size > 0) ::munmap(m->data, m->size);
+    delete m;
+    return 0;
+}
+
+#if defined(__GLIBC__)
+
+ssize_t cookie_read( void* cookie, char* dst, std::size_t n ) {
+    return mapping_read(static_cast< mapping* >(cookie), dst, n);
+}
+
+int cookie_seek( void* cookie, off64_t* offset, int whence ) {
+    std::int64_t off = *offset;
+    const auto err = mapping_seek(static_cast< mapping* >(cookie), &off, whence);
+    *offset = off;
+    return err;
+}
+
+int cookie_close( void* cookie ) {
+    return mapping_close(static_cast< mapping* >(cookie));
+}
+
+std::FILE* open_cookie( mapping* m ) noexcept (true) {
+    cookie_io_functions_t io;
+    io.read  = cookie_read;
+    io.write = nullptr;
+    io.seek  = cookie_seek;
+    io.close = cookie_close;
+    return fopencookie(m, "rb", io);
+}
+
+#else
+
+int cookie_read( void* cookie, char* dst, int n ) {
+    return mapping_read(static_cast< mapping* >(cookie), dst, n);
+}
+
+fpos_t cookie_seek( void* cookie, fpos_t offset, int whence ) {
+    std::int64_t off = offset;
+    const auto err = mapping_seek(static_cast< mapping* >(cookie), &off, whence);
+    if (err) return -1;
+    return off;
+}
+
+int cookie_close( void* cookie ) {
+    return mapping_close(static_cast< mapping* >(cookie));
+}
+
+std::FILE* open_cookie( mapping* m ) noexcept (true) {
+    return funopen(m, cookie_read, nullptr, cookie_seek, cookie_close);
+}
+
+#endif
+
+std::FILE* fopen_mapped( const char* path,
+                         const char** data,
+                         std::int64_t* size ) noexcept (true) {
+    auto* m = map_file(path);
+    if (not m) return nullptr;
+
+    auto* file = open_cookie(m);
+    if (not file) {
+        const int err = errno;
+        mapping_close(m);
+        errno = err;
+        return nullptr;
+    }
+
+    /*
+     * The stdio buffer is kept. Unbuffered, glibc serves the reads of lfp
+     * from the cookie one byte at a time, which is far slower than the extra
+     * copy. Records that are read in place use stream::view, not the buffer.
+     */
+    if (data) *data = m->data;
+    if (size) *size = m->size;
+    return file;
+}
+
+}
+#endif // DLISIO_HAVE_MMAP_STREAM
+
 namespace dlisio {
 
 void stream::seek( std::int64_t offset ) noexcept (false) {
@@ -55,6 +233,44 @@ noexcept (false) {
     return nread;
 }
 
+const char* stream::view( std::int64_t n ) noexcept (false) {
+    if (not this->map or n <= 0) return nullptr;
+
+    /*
+     * lfp does not promise that the physical tell is accurate at protocol
+     * boundaries, e.g. it may point to the envelope header right before the
+     * next byte rather than the byte itself. Rather than trusting it, read
+     * the first and last byte, and check that they are exactly n - 1 bytes
+     * apart on disk, and that they are the bytes in the mapping. Any header
+     * or tapemark between them would offset the physical tell.
+     */
+    const auto start = this->ptell();
+    if (start < 0 or n > this->mapsize - start) return nullptr;
+
+    const auto ltell = this->ltell();
+    char byte;
+    if (this->read(&byte, 1) < 1) return nullptr;
+    if (this->ptell() != start + 1) return nullptr;
+    if (byte != this->map[start]) return nullptr;
+
+    if (n > 1) {
+        this->seek(ltell + n - 1);
+        if (this->read(&byte, 1) < 1) return nullptr;
+        if (this->ptell() != start + n) return nullptr;
+        if (byte != this->map[start + n - 1]) return nullptr;
+    }
+
+    return this->map + start;
+}
+
+const char* stream::mapping() const noexcept (true) {
+    return this->map;
+}
+
+std::int64_t stream::mapping_size() const noexcept (true) {
+    return this->mapsize;
+}
+
 lfp_protocol* stream::protocol() const noexcept (true) {
     return this->f;
 }
@@ -86,9 +302,21 @@ int stream::peof() const noexcept (false) {
     }
 }
 
-std::FILE* fopen( const char* path) noexcept (false) {
+std::FILE* fopen( const char* path,
+                  bool mapped,
+                  const char** data,
+                  std::int64_t* size ) noexcept (false) {
     std::FILE* file;
 
+    if (data) *data = nullptr;
+    if (size) *size = 0;
+
+#ifdef DLISIO_HAVE_MMAP_STREAM
+    if (mapped) return fopen_mapped(path, data, size);
+#else
+    (void) mapped;
+#endif
+
 #ifdef _WIN32
     auto wpathlen = MultiByteToWideChar(CP_UTF8, 0, path, -1, NULL, 0);
 
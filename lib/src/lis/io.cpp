@@ -561,6 +561,38 @@ record iodevice::read_record(const record_info& info) noexcept (false) {
     return rec;
 }
 
+bool iodevice::view_record(const record_info& info,
+                           const char** begin,
+                           const char** end) noexcept (false) {
+    if (not this->mapping()) return false;
+
+    this->seek(info.ltell);
+    const auto prh = this->read_physical_header();
+
+    /* LRs spanning multiple PRs are interleaved with PRHs on disk */
+    if ( prh.attributes & lis::prheader::predces ) return false;
+    if ( prh.attributes & lis::prheader::succses ) return false;
+
+    std::uint8_t trlen = 0;
+    if ( prh.attributes & lis::prheader::reconum ) trlen += 2;
+    if ( prh.attributes & lis::prheader::filenum ) trlen += 2;
+    if ( prh.attributes & lis::prheader::chcksum ) trlen += 2;
+
+    const std::int64_t toread = prh.length
+                              - lis::prheader::size
+                              - lis::lrheader::size
+                              - trlen;
+    if (toread <= 0) return false;
+
+    this->seek(this->ltell() + lis::lrheader::size);
+    const auto* data = this->view(toread);
+    if (not data) return false;
+
+    *begin = data;
+    *end = data + toread;
+    return true;
+}
+
 std::vector<record>
 iodevice::read_records(const record_index& index,
                        const record_type& type) noexcept(false) {
@@ -574,9 +606,14 @@ iodevice::read_records(const record_index& index,
 }
 
 /* miscellaneous */
-iodevice open( const std::string& path, std::int64_t offset, bool tapeimage )
+iodevice open( const std::string& path,
+               std::int64_t offset,
+               bool tapeimage,
+               bool mapped )
 noexcept (false) {
-    auto* file = dlisio::fopen(path.c_str());
+    const char* data;
+    std::int64_t size;
+    auto* file = dlisio::fopen(path.c_str(), mapped, &data, &size);
     if ( not file ) {
         auto msg = "lis::open: unable to open file for path {} : {}";
         throw dlisio::io_error(fmt::format(msg, path, strerror(errno)));
@@ -600,7 +637,7 @@ noexcept (false) {
         protocol = tif;
     }
 
-    auto device = iodevice( protocol );
+    auto device = iodevice( protocol, data, size );
 
     /* Verify that the device is not opened at EOF by attempting to read one byte */
     try {
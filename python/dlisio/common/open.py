@@ -1,6 +1,6 @@
 from .. import core
 
-def open(path, offset = 0):
+def open(path, offset = 0, mmap = False):
     """ Open a file
 
     Open a low-level file handle. This is not intended for end-users - rather,
@@ -11,6 +11,8 @@ def open(path, offset = 0):
     path : str_like
     offset: int
         Physical file offset at which handle must be opened
+    mmap : bool
+        Read the file through a memory-mapping
 
     Returns
     -------
@@ -21,4 +23,4 @@ def open(path, offset = 0):
     dlisio.dlis.load
     dlisio.lis.load
     """
-    return core.open(str(path), offset)
+    return core.open(str(path), offset, mmap)
@@ -1,4 +1,4 @@
-from .load import load
+from .load import load, load_many
 from .file import PhysicalFile, LogicalFile, regex, exact
 
 from .basicobject import BasicObject
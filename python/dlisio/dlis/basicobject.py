@@ -164,6 +164,9 @@ class BasicObject():
         self.attic       = attic
         self.logicalfile = lf
 
+        # Parsed attribute values, see __getitem__
+        self.attribute_cache = {}
+
     def __repr__(self):
         """Return a string representation of the object"""
         return '{}({})'.format(self.type.capitalize(), self.name)
@@ -183,6 +186,13 @@ class BasicObject():
 
         Returns a default value for missing attributes. I.e. attributes defined
         in :attr:`attributes` but are not in :attr:`attic`.
+
+        When the logical file caches its objects (see
+        :func:`LogicalFile.cache_metadata`), the parsed value is cached too,
+        and the attribute is only parsed, and its errors only reported, the
+        first time. The cached value is tied to the parsing and linkage rules,
+        and the encodings (see :func:`dlisio.common.set_encodings`), it was
+        made with, so changing them takes effect on the next access.
         """
         if key not in self.attributes and key not in self.attic.keys():
             raise KeyError("'{}'".format(key))
@@ -193,6 +203,30 @@ class BasicObject():
             # No rule for parsing, keep rp66value as is, i.e. vector
             parse_as = utils.vector
 
+        reftype = self.linkage.get(key)
+        # Strings are decoded with the encodings when they are parsed
+        encodings = tuple(core.get_encodings())
+        try:
+            rules, value = self.attribute_cache[key]
+            if (rules[0] == parse_as and rules[1] is reftype and
+                rules[2] == encodings):
+                return copyvalue(value)
+        except KeyError:
+            pass
+
+        value = self.parse(key, parse_as, reftype)
+
+        store = getattr(self.logicalfile, 'store', None)
+        if store is not None and store.caching:
+            rules = (parse_as, reftype, encodings)
+            self.attribute_cache[key] = (rules, value)
+            return copyvalue(value)
+
+        return value
+
+    def parse(self, key, parse_as, reftype):
+        """ Parse attribute key from attic, see __getitem__ """
+
         # report errors before checking for key presence - it might be a symptom
         if len(self.attic.log) > 0:
             # TODO: here and for attribute: we use fingerprint to report
@@ -222,8 +256,7 @@ class BasicObject():
         if rp66value is None: return utils.defaultvalue(parse_as)
         if rp66value == []  : return utils.defaultvalue(parse_as)
 
-        if key in self.linkage and utils.isreference(rp66value[0]):
-            reftype = self.linkage[key]
+        if reftype is not None and utils.isreference(rp66value[0]):
             value = [utils.lookup(self.logicalfile, reftype, v) for v in rp66value]
         else:
             value = [v.strip() if isinstance(v, str) else v for v in rp66value]
@@ -350,3 +383,10 @@ class BasicObject():
         This method is intended to be called internally from describe()
         """
         pass
+
+def copyvalue(value):
+    """A shallow copy of lists, so that a cached attribute value can not be
+    modified through the value returned to the caller"""
+    if isinstance(value, list):
+        return list(value)
+    return value
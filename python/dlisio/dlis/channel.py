@@ -109,18 +109,11 @@ class Channel(BasicObject):
             log.info(msg.format(self))
             return None
 
-        # Find the frame(s) that are claiming ownership over this channel
-        frames = []
-        for frame in self.logicalfile.frames:
-            for channel in frame.channels:
-                if channel.attic.name != self.attic.name: continue
-
-                # Only add the channel once if it is referenced multiple times
-                # in the same frame. This is spec violation, but not
-                # necessarily an issue. This function is far to general to
-                # deal with it, so let it slide.
-                if frame not in frames:
-                    frames.append(frame)
+        # Find the frame(s) that are claiming ownership over this channel.
+        # A channel referenced multiple times in the same frame is a spec
+        # violation, but not necessarily an issue. This function is far to
+        # general to deal with it, so let it slide.
+        frames = self.logicalfile.store.frames_of(self)
 
         if len(frames) == 1:
             return frames[0]
@@ -220,14 +213,16 @@ class Channel(BasicObject):
         Notes
         -----
 
-        This method should only be used if there is only *one* channel of
-        interest in a particular frame.
+        Only the samples of this channel are decoded, directly into a
+        contiguous array, and the rest of every frame is skipped. The records
+        of the frame are still read from disk, so reading many channels from
+        the same frame one-by-one with this method is slower than reading
+        them together with :func:`Frame.curves()`, e.g. with its channels
+        argument.
 
-        Due to the memory-layout of dlis-files, reading a single channel from
-        disk and reading the entire frame is almost equally fast. That means
-        reading channels from the same frame one-by-one with this method is
-        _way_ slower than reading the entire frame with :func:`Frame.curves()`
-        and then indexing on the channels-of-interest.
+        If curve caching is enabled with :func:`LogicalFile.cache_curves`, and
+        the curves of the frame are cached, the curve is copied from the
+        cached curves without reading the frame again.
 
         Examples
         --------
@@ -258,8 +253,29 @@ class Channel(BasicObject):
         >>> curve[0][1][2]
         6
         """
-        if self.frame is not None:
-            return np.copy(self.frame.curves()[self.fingerprint])
+        frame = self.frame
+        if frame is not None:
+            dtype = frame.dtype()
+
+            cache = frame.logicalfile.curve_cache
+            if cache is not None:
+                key = utils.curves_key(frame, True, None, None, None, 'rows')
+                curves = cache.get(key)
+                if curves is not None:
+                    return np.copy(curves[self.fingerprint])
+
+            # Read as a column, which is decoded into an array of its own,
+            # rather than as a field of the frame
+            position = [x == self for x in frame.channels].index(True)
+            columns = utils.curves(frame.logicalfile,
+                                   frame,
+                                   dtype,
+                                   "",
+                                   frame.fmtstr(),
+                                   "",
+                                   channels = [self],
+                                   layout = 'columns')
+            return columns[dtype.names[position + 1]]
 
         msg = 'There is no recorded curve-data for {}'
         log.info(msg.format(self))
@@ -150,14 +150,43 @@ class ObjectStore():
       }
     """
     def __init__(self, logical_file, object_sets):
-        self.pool         = object_sets
         self.logical_file = logical_file
 
+        # object_sets is either the dl::pool, or a callable that creates it.
+        # The latter defers extraction and parsing of the object sets until
+        # the store is first queried
+        if callable(object_sets):
+            self.object_sets = None
+            self.parse       = object_sets
+        else:
+            self.object_sets = object_sets
+            self.parse       = None
+
         #: Turn on/off caching. If set to False, nothing is ever cached in
         #: :attr:`store`, and objects will be re-created from
         #: :attr:`object_sets` on each query.
         self.caching = True
         self.cache   = {}
+        # Channel fingerprint -> the frames that have the channel, see
+        # frames_of. Kept with the cached objects
+        self.owners  = None
+        # Fingerprint -> the cached objects with that fingerprint, see
+        # fullname. Filled in as the object types are cached
+        self.fingerprints = {}
+
+    @property
+    def pool(self):
+        if self.object_sets is None:
+            self.object_sets = self.parse()
+            self.parse = None
+            self.logical_file.check_updates()
+
+        return self.object_sets
+
+    @property
+    def parsed(self):
+        """ True if the object sets are extracted and parsed """
+        return self.object_sets is not None
 
     def types(self):
         return set(self.pool.types)
@@ -206,12 +235,44 @@ class ObjectStore():
 
         if self.caching:
             self.cache[object_type] = objects
+            for objs in objects.values():
+                for obj in objs:
+                    fingerprint = obj.fingerprint
+                    self.fingerprints.setdefault(fingerprint, []).append(obj)
 
         return objects
 
     def clear_cache(self):
         """Clear all cached objects """
-        self.cache = {}
+        self.cache  = {}
+        self.owners = None
+        self.fingerprints = {}
+
+    def frames_of(self, channel):
+        """ Returns the frames that have channel among their channels
+
+        The map from channel to frames is built in a single pass over all the
+        frames the first time it is needed, and is kept for as long as the
+        cached objects are. Without caching, it is built for every call.
+        """
+        owners = self.owners
+        if owners is None:
+            owners = defaultdict(list)
+            for frame in self.logical_file.frames:
+                for ch in frame.channels:
+                    # Channels that can not be found are None
+                    if ch is None: continue
+
+                    # Only add the frame once if the channel is referenced
+                    # multiple times in the same frame
+                    frames = owners[ch.fingerprint]
+                    if frame not in frames:
+                        frames.append(frame)
+
+            if self.caching:
+                self.owners = owners
+
+        return list(owners.get(channel.fingerprint, []))
 
     def find(self, object_type, object_name=None, matcher=None):
         """ Returns matching objects
@@ -253,6 +314,42 @@ class ObjectStore():
                     matches.extend(objs)
         return matches
 
+    def fullname(self, object_type, object_name, origin, copynr):
+        """ Returns the objects with exactly this type, name, origin and
+        copynumber, i.e. this fingerprint
+
+        With caching, the objects are looked up in :attr:`fingerprints`, which
+        is filled in when the objects of a type are first cached. Without
+        caching, the objects are looked up directly in the fingerprint index
+        of the pool.
+        """
+        if self.caching:
+            try:
+                fingerprint = core.fingerprint(object_type, object_name,
+                                               origin, copynr)
+            except (TypeError, ValueError):
+                # origin or copynr is outside the range of ORIGIN or USHORT,
+                # so no object can have it
+                return []
+
+            # Make sure the objects of object_type are cached, and so indexed
+            _ = self[object_type]
+            return list(self.fingerprints.get(fingerprint, []))
+
+        try:
+            attics = self.pool.get(
+                object_type,
+                object_name,
+                origin,
+                copynr,
+                self.logical_file.error_handler
+            )
+        except TypeError:
+            # origin or copynr is outside the range of ORIGIN or USHORT, so
+            # no object can have it
+            return []
+        return self.promote(attics)
+
     def promote(self, attics):
         """Promote dlisio.core.basic_objects to first-class Python objects
 
@@ -344,15 +441,41 @@ class LogicalFile(object):
     then the users responsibility of ensuring correctness for the custom class.
     """
 
-    def __init__(self, stream, object_sets, fdata_index, sul, error_handler):
+    def __init__(self, stream, object_sets, fdata_index, sul, error_handler,
+                 fdata_sizes = None, fdata_framenos = None,
+                 fdata_tails = None, reopen = None):
+        if fdata_sizes is None:    fdata_sizes = {}
+        if fdata_framenos is None: fdata_framenos = {}
+        if fdata_tails is None:    fdata_tails = {}
+
         self.file = stream
         self.sul  = sul
 
         self.fdata_index = fdata_index
-        self.store       = ObjectStore(self, object_sets)
+        # Per record in fdata_index: an upper bound of the size of its frame
+        # data, the FRAMENO of its first frame (or -1), and where its last
+        # frame ends. Used to size the curves up front, and to find the
+        # records of a range of frames or of index values.
+        self.fdata_sizes    = fdata_sizes
+        self.fdata_framenos = fdata_framenos
+        self.fdata_tails    = fdata_tails
+        # Zone maps of the frames, see utils.index_ranges
+        self.fdata_zones    = {}
+        # Opens another stream of the logical file, and the streams opened so
+        # far for reading curves with multiple threads, see Frame.curves
+        self.reopen         = reopen
+        self.worker_streams = []
+        # Decoded curves, see cache_curves
+        self.curve_cache    = None
+        self.store          = ObjectStore(self, object_sets)
 
         self.error_handler = error_handler
 
+        if self.store.parsed:
+            self.check_updates()
+
+    def check_updates(self):
+        """ Warn about UPDATE-objects in the logical file """
         if 'UPDATE' in self.store.types():
             msg = ('{} contains UPDATE-object(s) which changes other '
                    'objects. dlisio lacks support for UPDATEs, hence the '
@@ -372,6 +495,9 @@ class LogicalFile(object):
         It is not necessary to call this method if you're using the `with`
         statement, which will close the file for you.
         """
+        for stream in self.worker_streams:
+            stream.close()
+        self.worker_streams = []
         self.file.close()
 
     def __repr__(self):
@@ -397,6 +523,48 @@ class LogicalFile(object):
         self.store.clear_cache()
         self.store.caching = cache
 
+    def cache_curves(self, budget):
+        """ Toggle caching of curves
+
+        By default, every call to :func:`Frame.curves` and
+        :func:`Channel.curves` reads and decodes the curves from disk. With
+        curve caching, the decoded curves are kept in memory, and repeated
+        reads of the same curves are served from the cache. The cache is
+        keyed by the frame and the arguments to :func:`Frame.curves`, and
+        the least recently used curves are evicted when the cache is full.
+        Channel.curves is served from the cached curves of its frame.
+
+        The cached arrays are shared between all the callers, and are
+        read-only.
+
+        Parameters
+        ----------
+
+        budget : int or None
+            Maximum number of bytes of cached curves, or None to turn off
+            caching. Turning caching on or off clears the cache.
+
+        Returns
+        -------
+
+        cache : dlisio.dlis.utils.CurveCache or None
+            The cache, with hit and miss counters
+
+        Examples
+        --------
+
+        >>> cache = f.cache_curves(512 * 1024 * 1024)
+        >>> curves = frame.curves()
+        >>> curves = frame.curves()
+        >>> cache.hits, cache.misses
+        (1, 1)
+        """
+        if budget is None:
+            self.curve_cache = None
+        else:
+            self.curve_cache = utils.CurveCache(budget)
+        return self.curve_cache
+
     class IndexedObjectDescriptor:
         """ Return all objects of this type"""
         def __init__(self, t):
@@ -510,6 +678,7 @@ class LogicalFile(object):
         --------
 
         dlisio.dlis.utils.exact_matcher : str comparison w/ str.__eq__
+        dlisio.dlis.utils.icase_matcher : case-insensitive str comparison
         dlisio.dlis.utils.regex_matcher : str comparison w/ python's re module
 
         Examples
@@ -581,13 +750,16 @@ class LogicalFile(object):
         MKAP
 
         """
-        matches = self.store.find(type, name, exact)
+        if origin is not None and copynr is not None:
+            matches = self.store.fullname(type, name, origin, copynr)
+        else:
+            matches = self.store.find(type, name, exact)
 
-        if origin is not None:
-            matches = [o for o in matches if o.origin == origin]
+            if origin is not None:
+                matches = [o for o in matches if o.origin == origin]
 
-        if copynr is not None:
-            matches = [o for o in matches if o.copynumber == copynr]
+            if copynr is not None:
+                matches = [o for o in matches if o.copynumber == copynr]
 
         if len(matches) == 1: return matches[0]
 
@@ -610,6 +782,50 @@ class LogicalFile(object):
         msg += ''.join(candidates)
         raise ValueError(msg.format(type, name))
 
+    def curves_all(self, strict=True):
+        """The curves of all the frames in the logical file
+
+        Read the curves of every frame in :attr:`frames` in a single pass
+        over the file. The records of the frames are usually interleaved,
+        and reading one frame at a time with :func:`Frame.curves` goes
+        through the file once per frame. Here the records are read once, in
+        the order they appear in the file, and every record is decoded into
+        the curves of its frame.
+
+        Parameters
+        ----------
+
+        strict : boolean, optional
+            See :func:`Frame.curves`
+
+        Returns
+        -------
+
+        curves : dict
+            Frame fingerprint -> curves, with the same curves as
+            :func:`Frame.curves` for every frame
+
+        Raises
+        ------
+
+        ValueError
+            If strict and a frame has multiple channels with identical name,
+            origin and copynumber
+
+        See also
+        --------
+
+        Frame.curves : The curves of a single frame
+
+        Examples
+        --------
+
+        >>> curves = f.curves_all()
+        >>> for frame in f.frames:
+        ...     print(frame.name, len(curves[frame.fingerprint]))
+        """
+        return utils.curves_all(self, self.frames, strict)
+
 
     def describe(self, width=80, indent=''):
         """Printable summary of the logical file
@@ -659,6 +875,38 @@ class LogicalFile(object):
         """ Force load all objects - mainly indended for debugging"""
         _ = [self.find(x, matcher=exact) for x in self.store.types()]
 
+    def resolve_all(self):
+        """ Force load all objects and resolve all their references
+
+        References between objects, e.g. the channels of a frame, are
+        normally resolved the first time the attribute is accessed. This
+        loads all the objects, and then resolves the references of every
+        object in a single pass, so later attribute access only returns the
+        already linked objects.
+
+        Notes
+        -----
+        The resolved references are kept with the cached objects. With
+        metadata caching turned off (see :func:`cache_metadata`), the
+        references are resolved, and any errors reported, but nothing is
+        kept.
+
+        Examples
+        --------
+
+        >>> f.resolve_all()
+        >>> frame = f.object('FRAME', 'FRAME1')
+        >>> frame.channels
+        [Channel(TDEP), Channel(GR)]
+        """
+        objects = [self.find(x, matcher=exact) for x in self.store.types()]
+
+        for objs in objects:
+            for obj in objs:
+                for key in obj.linkage:
+                    if key not in obj.attic.keys(): continue
+                    _ = obj[key]
+
     def storage_label(self):
         """Return the storage label of the physical file
 
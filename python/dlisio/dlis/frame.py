@@ -292,7 +292,8 @@ class Frame(BasicObject):
         # variable-lenght unsigned integer (i).
         return 'i' + ''.join([x.fmtstr() for x in self.channels])
 
-    def curves(self, strict=True):
+    def curves(self, strict=True, frames=None, index_range=None,
+               channels=None, out=None, layout='rows', workers=None):
         """All curves belonging to this frame
 
         Get all the curves in this frame as a structured numpy array. The frame
@@ -310,11 +311,69 @@ class Frame(BasicObject):
             numerical values (i.e. 0, 1, 2 ..) to the labels used for
             column-names in the returned array.
 
+        frames : slice, optional
+            Only get the frames with a frame number (FRAMENO) in the range of
+            the slice, e.g. slice(1000, 2000). Either end can be left out.
+            Note that frame numbers start at 1. The records that hold the
+            requested frames are found from the index created by load, and
+            only those records are read.
+
+        index_range : tuple of (lo, hi), optional
+            Only get the frames where the index (see :attr:`index`) is in the
+            closed range [lo, hi], e.g. (2500, 2600). The order of lo and hi
+            does not matter, so the same range works for frames with
+            decreasing index (:attr:`direction`). On first use, the range of
+            the index in every record is computed and kept for later calls.
+            For frames of fixed size, this only reads the first and last frame
+            of every record, otherwise all records are read. After that, only
+            the records that overlap the range are read.
+            Mutually exclusive with frames.
+
+        channels : list of Channel or str, optional
+            Only get the curves of these channels, given as Channel objects or
+            by name. The other channels are skipped rather than decoded, which
+            is much faster than reading the full frame when only a few of
+            many channels are needed. FRAMENO is always included, and the
+            columns are in the same order as in the frame.
+
+        out : np.ndarray, optional
+            Write the curves to the start of this array instead of allocating
+            a new one, e.g. to reuse the same array for many files, or to
+            write to a np.memmap or shared memory. It must be a contiguous,
+            one-dimensional array with the dtype of the returned curves, and
+            big enough for all the frames. With index_range, the index
+            channel must be among the channels.
+
+        layout : {'rows', 'columns'}, optional
+            With 'rows' (the default), the curves are returned as one
+            structured array with one row per frame. With 'columns', every
+            channel is decoded directly into its own contiguous array, and a
+            dict of column name -> array is returned, with the same names as
+            the structured array. This is the better fit for column-oriented
+            tools, e.g. pandas or Arrow, as no column has to be copied out of
+            the rows. Can not be combined with out.
+
+        workers : int, optional
+            Read the records of the frame with this many threads, each with
+            its own handle to the file. The result is the same as with a
+            single thread, but for large frames the decoding is spread over
+            multiple cores. Frames with channels of string-like types, e.g.
+            ASCII or OBNAME, are always read by a single thread. The file
+            handles are kept open until the logical file is closed. By default
+            the curves are read by a single thread.
+
         Returns
         -------
         curves : np.ndarray
             curves with dtype = self.dtype
 
+        count : int
+            If out is given, the number of frames written to out is returned
+            instead
+
+        columns : dict of np.ndarray
+            If layout='columns', one array per column, including FRAMENO
+
         Raises
         ------
 
@@ -322,6 +381,34 @@ class Frame(BasicObject):
             If there multiple channels with identical name, origin, copynumber
             in Frame.channels. This can be suppressed by passing strict=False
 
+        ValueError
+            If frames has a step other than 1
+
+        ValueError
+            If the index channel is not a scalar number and index_range is
+            used
+
+        ValueError
+            If a channel is not in the frame, or if a name matches more than
+            one channel
+
+        ValueError
+            If out has the wrong dtype or layout, or is too small
+
+        ValueError
+            If layout is not 'rows' or 'columns'
+
+        ValueError
+            If workers is less than 1
+
+        Notes
+        -----
+
+        If curve caching is enabled with :func:`LogicalFile.cache_curves`,
+        the curves are served from the cache when the same curves have been
+        read before, and the returned arrays are read-only. Curves read into
+        out are never cached.
+
         See also
         --------
         Channel.curves : Access the curve-data directly through the Channel
@@ -461,13 +548,130 @@ class Frame(BasicObject):
         >>> curves = frame.curves(strict=False)
         >>> curves.dtype.names
         ('FRAMENO', 'TDEP.0.0(0)', 'TDEP.0.0(1)', 'GR')
+
+        Read a range of frames, without reading the rest of the frame:
+
+        >>> curves = frame.curves(frames=slice(1000000, 1001000))
+        >>> curves['FRAMENO'][0], curves['FRAMENO'][-1]
+        (1000000, 1000999)
+
+        Read the frames between two depths:
+
+        >>> frame.index
+        'TDEP'
+        >>> curves = frame.curves(index_range=(2500, 2600))
+
+        Read only some of the channels:
+
+        >>> curves = frame.curves(channels=['TDEP', 'GR'])
+        >>> curves.dtype.names
+        ('FRAMENO', 'TDEP', 'GR')
+
+        Read into an existing array:
+
+        >>> out = np.empty(100000, dtype=frame.dtype())
+        >>> n = frame.curves(out=out)
+        >>> curves = out[:n]
+
+        Read into one array per channel, e.g. to create a pandas DataFrame:
+
+        >>> columns = frame.curves(channels=['TDEP', 'GR'], layout='columns')
+        >>> columns['GR'].flags['C_CONTIGUOUS']
+        True
+        >>> df = pd.DataFrame(columns)
+
+        Read a large frame with 4 threads:
+
+        >>> curves = frame.curves(workers=4)
+        """
+        cache = None
+        if out is None:
+            cache = self.logicalfile.curve_cache
+
+        if cache is not None:
+            try:
+                key = utils.curves_key(self, strict, frames, index_range,
+                                       channels, layout)
+            except (TypeError, AttributeError):
+                cache = None
+
+        if cache is not None:
+            curves = cache.get(key)
+            if curves is not None:
+                return curves
+
+        curves = utils.curves(self.logicalfile,
+                              self,
+                              self.dtype(strict=strict),
+                              "",
+                              self.fmtstr(),
+                              "",
+                              frames,
+                              index_range,
+                              channels,
+                              out,
+                              layout,
+                              workers)
+
+        if cache is not None:
+            curves = cache.put(key, curves)
+        return curves
+
+    def iter_curves(self, chunk_frames=10000, strict=True, channels=None):
+        """Iterate over the curves of this frame, in chunks of frames
+
+        Like :func:`curves`, but rather than reading all the frames into one
+        array, the frames are read a few records at a time and yielded in
+        chunks of chunk_frames frames. The memory used is bounded by the size
+        of a chunk, not by the number of frames, which makes it possible to
+        process frames that are too big to fit in memory, such as frames with
+        image channels.
+
+        Parameters
+        ----------
+
+        chunk_frames : int, optional
+            Number of frames in every chunk. The last chunk may be shorter.
+
+        strict : boolean, optional
+            See :func:`curves`
+
+        channels : list of Channel or str, optional
+            See :func:`curves`
+
+        Yields
+        ------
+        curves : np.ndarray
+            chunk_frames frames with dtype = self.dtype
+
+        Raises
+        ------
+
+        ValueError
+            If chunk_frames is not positive
+
+        Notes
+        -----
+
+        The same buffer is reused for every chunk, so a chunk is only valid
+        until the next one is requested. Copy it to keep it around, e.g.
+        ``chunk.copy()``.
+
+        Examples
+        --------
+        Compute the mean of a channel without reading all of it at once
+
+        >>> total, count = 0, 0
+        >>> for chunk in frame.iter_curves(chunk_frames=1000):
+        ...     total += chunk['GR'].sum()
+        ...     count += len(chunk)
         """
-        return utils.curves(self.logicalfile,
-                            self,
-                            self.dtype(strict=strict),
-                            "",
-                            self.fmtstr(),
-                            "")
+        return utils.iter_curves(self.logicalfile,
+                                 self,
+                                 self.dtype(strict=strict),
+                                 self.fmtstr(),
+                                 chunk_frames,
+                                 channels)
 
     def fmtstrchannel(self, channel):
         """Generate format-strings for one Frame channel
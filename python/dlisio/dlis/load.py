@@ -1,11 +1,17 @@
+import concurrent.futures
+import functools
+import hashlib
+import json
 import os
+import tempfile
 
 from .. import core
 from .. import common
 from .file import PhysicalFile, LogicalFile
 
 
-def load(path, error_handler = None):
+def load(path, error_handler = None, index_cache = None, lazy = False,
+         mmap = False):
     """ Loads a file and returns one filehandle pr logical file.
 
     Load does more than just opening the file. A DLIS file has no random access
@@ -26,6 +32,32 @@ def load(path, error_handler = None):
             Handler will be added to all the logical files, so users may modify
             the behavior at any time.
 
+    index_cache : str_like, optional
+            Directory for persisting the index of the file. When supplied, load
+            first looks for an index of path in this directory, and if one is
+            found, and the file has not changed since, the scan of the file is
+            skipped. Otherwise the file is scanned as usual and the index is
+            stored in the directory for the next load. Only files that can be
+            indexed without any errors are cached.
+
+    lazy : bool, optional
+            Defer reading the metadata of each logical file until it is first
+            queried. The physical file is still scanned to find the logical
+            files and their curve data, but explicit records are not extracted
+            or parsed up front. This makes load considerably faster when only
+            some of the logical files are of interest. Note that errors in the
+            metadata are then reported when the metadata is first queried,
+            rather than by load. Defaults to False.
+
+    mmap : bool, optional
+            Read the file through a memory-mapping rather than with regular
+            file reads. For files on fast, local storage this removes the
+            system call overhead of the many small seeks and reads that
+            indexing and reading curves are made of. Frame data that is laid
+            out consecutively on disk is decoded straight from the mapping,
+            without being copied first. The option has no effect on platforms
+            where mapped reading is unsupported. Defaults to False.
+
     Returns
     -------
 
@@ -62,20 +94,59 @@ def load(path, error_handler = None):
     statement.  The asterisk allows an arbitrary number of extra logical files
     to be stored in tail. Use len(tail) to check how many extra logical files
     there are.
+
+    Files that are loaded over and over again can skip the scan by keeping
+    the index in a cache directory:
+
+    >>> with dlis.load(filename, index_cache='/tmp/dlisio') as files:
+    ...     pass
     """
     if not error_handler:
         error_handler = common.ErrorHandler()
 
+    path = regular_file(path)
+
+    cache = None
+    if index_cache is not None:
+        cache = IndexCache(index_cache, path)
+        index = cache.read()
+        if index is not None:
+            logical_files = open_index(path, index, error_handler, lazy,
+                                       mmap)
+            return PhysicalFile(logical_files)
+
+    indexer = index_file(path, error_handler, lazy, mmap)
+
+    if cache is not None and not indexer.index_errors.logged:
+        cache.write(indexer.index())
+
+    return PhysicalFile(indexer.logical_files)
+
+
+def regular_file(path):
+    """ Returns path as str, or raises OSError if it is not a regular file
+
+    Shared by load and the worker processes of load_many, so that the error is
+    the same regardless of how the file is loaded.
+    """
     path = str(path)
     if not os.path.isfile(path):
         raise OSError("'{}' is not an existing regular file".format(path))
+    return path
 
-    stream = common.open(path)
+
+def index_file(path, error_handler, lazy = False, mmap = False):
+    """ Scans path and opens all its logical files
+
+    Returns the FileIndexer, which holds the opened logical files and the
+    index of the file.
+    """
+    stream = common.open(path, mmap = mmap)
     tm = core.read_tapemark(stream)
     is_tif = core.valid_tapemark(tm)
     stream.close()
 
-    indexer = FileIndexer(path, is_tif, error_handler)
+    indexer = FileIndexer(path, is_tif, error_handler, lazy, mmap)
     try:
         while (not indexer.end_of_data()):
             indexer.open_stream()
@@ -100,7 +171,374 @@ def load(path, error_handler = None):
         indexer.close()
         raise
 
-    return PhysicalFile(indexer.logical_files)
+    return indexer
+
+
+def load_many(paths, workers = None, executor = 'thread', error_handler = None,
+              index_cache = None, lazy = False, mmap = False):
+    """ Loads many files concurrently
+
+    Indexes the files in paths with a pool of workers, and yields each file
+    as soon as it is loaded. Files are yielded in the order they complete,
+    which is not necessarily the order of paths.
+
+    Only a bounded number of files are in flight at any time, so paths can be
+    an arbitrarily long (or lazy) iterable. Files that are yielded are owned
+    by the caller and should be closed when no longer needed.
+
+    Parameters
+    ----------
+
+    paths : iterable of str_like
+
+    workers : int, optional
+            Number of workers. Defaults to the number of CPUs.
+
+    executor : {'thread', 'process'}, optional
+            With 'thread', files are loaded in a thread pool. dlisio releases
+            the GIL while scanning files, so this scales well as long as the
+            files are mostly curve data. With 'process', files are scanned in
+            a process pool, and only the index of each file is sent back to
+            be opened in the calling process. This also parallelizes the
+            parsing of the metadata, which holds the GIL. Defaults to 'thread'.
+
+    error_handler : dlisio.common.ErrorHandler, optional
+            Error handling rules, see :func:`dlisio.dlis.load`. Any error that
+            makes loading of a file fail is reported as a critical error.
+            Unless critical errors are raised, that file is skipped and the
+            remaining files are loaded as usual.
+
+    index_cache : str_like, optional
+            See :func:`dlisio.dlis.load`
+
+    lazy : bool, optional
+            See :func:`dlisio.dlis.load`
+
+    mmap : bool, optional
+            See :func:`dlisio.dlis.load`
+
+    Yields
+    ------
+
+    path : str
+            The path, as given in paths
+
+    dlis : dlisio.dlis.PhysicalFile
+
+    Examples
+    --------
+
+    >>> from dlisio import dlis
+    >>> for path, files in dlis.load_many(paths, workers=8):
+    ...     with files:
+    ...         pass
+
+    Keep going when some of the files are unreadable:
+
+    >>> from dlisio.common import ErrorHandler, Actions
+    >>> handler = ErrorHandler(critical=Actions.LOG_ERROR)
+    >>> for path, files in dlis.load_many(paths, error_handler=handler):
+    ...     with files:
+    ...         pass
+    """
+    if not error_handler:
+        error_handler = common.ErrorHandler()
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('workers must be positive, was {}'.format(workers))
+
+    if index_cache is not None:
+        index_cache = str(index_cache)
+
+    if executor == 'thread':
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers = workers)
+        def submit(path):
+            return pool.submit(load, path, error_handler, index_cache, lazy,
+                               mmap)
+
+        def result(path, future):
+            return future.result()
+
+    elif executor == 'process':
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers = workers)
+        encodings = core.get_encodings()
+        def submit(path):
+            return pool.submit(index_in_process, str(path), encodings,
+                               index_cache, mmap)
+
+        def result(path, future):
+            index, issues = future.result()
+            for severity, *issue in issues:
+                error_handler.log(core.error_severity(severity), *issue)
+            logical_files = open_index(str(path), index, error_handler, lazy,
+                                       mmap)
+            return PhysicalFile(logical_files)
+
+    else:
+        msg = "executor must be 'thread' or 'process', was '{}'"
+        raise ValueError(msg.format(executor))
+
+    # Twice as many files as there are workers are in flight, so that the
+    # workers are kept busy while the caller works on the yielded files
+    inflight = {}
+    paths = iter(paths)
+    try:
+        while True:
+            for path in paths:
+                inflight[submit(path)] = path
+                if len(inflight) >= 2 * workers:
+                    break
+
+            if not inflight:
+                return
+
+            done, _ = concurrent.futures.wait(
+                inflight,
+                return_when = concurrent.futures.FIRST_COMPLETED
+            )
+
+            for future in done:
+                path = inflight.pop(future)
+                try:
+                    f = result(path, future)
+                except Exception as e:
+                    error_handler.log(
+                        core.error_severity.critical,
+                        "dlis::load_many: Loading {}".format(path),
+                        e,
+                        "",
+                        "File is skipped",
+                        "")
+                    continue
+                yield path, f
+    finally:
+        # Drain the files that were loaded, but never handed to the caller
+        for future in inflight:
+            future.cancel()
+        pool.shutdown(wait = True)
+        if executor == 'thread':
+            for future in inflight:
+                if future.cancelled() or future.exception() is not None:
+                    continue
+                future.result().close()
+
+
+def index_in_process(path, encodings, index_cache, mmap):
+    """ Indexes path, for load_many in a worker process
+
+    Returns the index of path, along with all the errors reported while
+    indexing it. Errors never stop the indexing, they are instead replayed
+    with the user's error handler when the file is opened in the calling
+    process. The metadata is parsed in the calling process.
+    """
+    core.set_encodings(encodings)
+    path = regular_file(path)
+
+    cache = None
+    if index_cache is not None:
+        cache = IndexCache(index_cache, path)
+        index = cache.read()
+        if index is not None:
+            return index, []
+
+    errors = RecordingErrors()
+    indexer = index_file(path, errors, lazy = True, mmap = mmap)
+    indexer.close()
+
+    index = indexer.index()
+    if cache is not None and not errors.issues:
+        cache.write(index)
+
+    return index, errors.issues
+
+
+def open_logical_file(stream, explicits, fdata, fdata_sizes, fdata_framenos,
+                      fdata_tails, sul, error_handler, lazy = False,
+                      reopen = None):
+    """ Creates a LogicalFile from an indexed rp66 stream
+
+    If lazy, the explicit records are extracted and parsed when the metadata
+    of the logical file is first queried. reopen opens another, independent
+    rp66 stream of the same logical file, see open_rp66.
+    """
+    def parse():
+        recs = core.extract(stream, explicits, error_handler)
+        sets = core.parse_objects(recs, error_handler)
+        return core.pool(sets)
+
+    object_sets = parse if lazy else parse()
+    return LogicalFile(stream, object_sets, fdata, sul, error_handler,
+                       fdata_sizes, fdata_framenos, fdata_tails, reopen)
+
+
+def open_rp66(path, tell, vr_tell, is_tif, mmap = False):
+    """ Opens the rp66 stream of a logical file
+
+    The stream is opened at tell, which for TIFed files is the tapemark, and
+    the rp66 protocol at the visible record at vr_tell. Offsets in the stream
+    are the same for every stream opened this way, so the index of a logical
+    file applies to all of them.
+    """
+    stream = common.open(path, tell, mmap)
+    try:
+        if is_tif:
+            stream = core.open_tif(stream)
+        stream.seek(vr_tell)
+        return core.open_rp66(stream)
+    except:
+        stream.close()
+        raise
+
+
+def open_index(path, index, error_handler, lazy = False, mmap = False):
+    """ Opens the logical files of path from a previously created index
+
+    The index has the layout of FileIndexer.index(). No part of the file is
+    scanned, each logical stream is opened directly at its visible record.
+    """
+    logical_files = []
+    try:
+        for entry in index['logical_files']:
+            reopen = functools.partial(open_rp66, path, entry['tell'],
+                                       entry['vr_tell'], index['is_tif'],
+                                       mmap)
+            stream = reopen()
+
+            sul = entry['sul']
+            if sul is not None:
+                sul = bytearray.fromhex(sul)
+
+            try:
+                lf = open_logical_file(stream, entry['explicits'],
+                                       entry['fdata'], entry['fdata_sizes'],
+                                       entry['fdata_framenos'],
+                                       entry['fdata_tails'], sul,
+                                       error_handler, lazy, reopen)
+            except:
+                stream.close()
+                raise
+            logical_files.append(lf)
+    except:
+        for lf in logical_files:
+            lf.close()
+        raise
+
+    return logical_files
+
+
+class IndexCache:
+    """ On-disk cache of file indices
+
+    Each file has its own entry in the cache directory, named after its
+    absolute path. An entry is only valid as long as the size, modification
+    time and leading bytes of the file are unchanged, and the same encodings
+    are in use. The cache is best-effort: unreadable or outdated entries are
+    ignored, and failures to write are silent.
+    """
+    version = 4
+    header_size = 4096
+
+    def __init__(self, directory, path):
+        self.directory = str(directory)
+        self.path = os.path.realpath(path)
+
+        name = self.path.encode('utf-8', 'surrogateescape')
+        name = hashlib.sha256(name).hexdigest()
+        self.entry = os.path.join(self.directory, name + '.json')
+
+    def key(self):
+        """ Identity of the current state of the file
+        """
+        st = os.stat(self.path)
+        with open(self.path, 'rb') as f:
+            header = f.read(self.header_size)
+
+        return {
+            'version'   : self.version,
+            'path'      : self.path,
+            'size'      : st.st_size,
+            'mtime_ns'  : st.st_mtime_ns,
+            'header'    : hashlib.sha256(header).hexdigest(),
+            'encodings' : list(core.get_encodings()),
+        }
+
+    def read(self):
+        """ Returns the cached index, or None if there is no valid entry
+        """
+        try:
+            with open(self.entry, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            if cached.get('key') != self.key():
+                return None
+        except OSError:
+            return None
+
+        return cached.get('index')
+
+    def write(self, index):
+        """ Stores index in the cache
+
+        Entries are written to a temporary file which is then moved in place,
+        so that concurrent loads never observe partially written entries.
+        """
+        for entry in index['logical_files']:
+            # Fingerprints that could not be decoded are returned as bytes,
+            # which has no representation in the cache
+            if not all(isinstance(key, str) for key in entry['fdata']):
+                return
+
+        try:
+            cached = { 'key' : self.key(), 'index' : index }
+            os.makedirs(self.directory, exist_ok = True)
+            fd, tmp = tempfile.mkstemp(dir = self.directory, suffix = '.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(cached, f)
+                os.replace(tmp, self.entry)
+            except:
+                os.remove(tmp)
+                raise
+        except OSError:
+            pass
+
+
+class IndexingErrors(core.error_handler):
+    """ Error handler used while indexing
+
+    Forwards everything to the user's error handler, but remembers if
+    anything was logged. Errors from the scan of the file are not reproduced
+    when an index is read from the cache, so only error-free indices are
+    cached.
+    """
+    def __init__(self, error_handler):
+        core.error_handler.__init__(self)
+        self.error_handler = error_handler
+        self.logged = False
+
+    def log(self, severity, context, problem, spec, action, debug):
+        self.logged = True
+        self.error_handler.log(severity, context, problem, spec, action, debug)
+
+
+class RecordingErrors(core.error_handler):
+    """ Error handler that records all errors
+
+    Errors are stored as picklable tuples of the arguments to log, so that
+    they can be sent between processes.
+    """
+    def __init__(self):
+        core.error_handler.__init__(self)
+        self.issues = []
+
+    def log(self, severity, context, problem, spec, action, debug):
+        self.issues.append((int(severity), str(context), str(problem),
+                            str(spec), str(action), str(debug)))
 
 
 class FileIndexer:
@@ -109,16 +547,23 @@ class FileIndexer:
     Contains all the internal information required to correctly parse logical
     files.
     """
-    def __init__(self, path, is_tif, error_handler):
+    def __init__(self, path, is_tif, error_handler, lazy = False,
+                 mmap = False):
         self.error_handler = error_handler
+        self.index_errors = IndexingErrors(error_handler)
         self.is_tif = is_tif
         self.path = path
+        self.lazy = lazy
+        self.mmap = mmap
 
         self.logical_files = []
+        self.entries = []
         self.sul = None
         self.stream = None
 
         self.open_next_at_tell = 0
+        self.opened_at_tell = 0
+        self.vr_tell = 0
         self.data_end = False
 
     def open_stream(self):
@@ -130,7 +575,9 @@ class FileIndexer:
 
         In case of TIFed files stream must always be opened at the TM.
         """
-        self.stream = common.open(self.path, self.open_next_at_tell)
+        self.opened_at_tell = self.open_next_at_tell
+        self.stream = common.open(self.path, self.open_next_at_tell,
+                                  self.mmap)
         if self.is_tif:
             self.stream = core.open_tif(self.stream)
 
@@ -146,7 +593,8 @@ class FileIndexer:
 
         Positions on next VR and opens rp66 protocol from that VR.
         """
-        core.findvrl(self.stream, self.error_handler)
+        core.findvrl(self.stream, self.index_errors)
+        self.vr_tell = self.stream.ltell
         self.stream = core.open_rp66(self.stream)
 
     def index_logical_file(self):
@@ -154,15 +602,16 @@ class FileIndexer:
         needed to open the next one
 
         Due to the essence of core.findoffsets function both these things are
-        done at the same time.
+        done at the same time. The implicit records are indexed by their
+        frame fingerprint in the same pass.
         Code may become more straightforward if findoffsets are ever refactored
         to deal with this internally and explicitly return the final tell.
 
         Warning: lfp does *not* make physical tell reliable.
             We rely on it anyway.
         """
-        explicits, implicits, broken = core.findoffsets(
-            self.stream, self.error_handler)
+        offsets = core.findoffsets(self.stream, self.index_errors)
+        explicits, _, broken, fdata, sizes, framenos, tails = offsets
         if len(broken):
             self.data_end = True
 
@@ -175,22 +624,43 @@ class FileIndexer:
             if self.is_tif:
                 self.open_next_at_tell -= 12
 
-        return explicits, implicits
+        return explicits, fdata, sizes, framenos, tails
 
     def parse_logical_file(self):
         """ Parses new logical file
 
         In the process gathers data about the next logical file
         """
-        explicits, implicits = self.index_logical_file()
-        recs = core.extract(self.stream, explicits, self.error_handler)
-        sets = core.parse_objects(recs, self.error_handler)
-        pool = core.pool(sets)
-        fdata = core.findfdata(self.stream, implicits, self.error_handler)
-
-        lf = LogicalFile(self.stream, pool, fdata, self.sul, self.error_handler)
+        explicits, fdata, sizes, framenos, tails = self.index_logical_file()
+        reopen = functools.partial(open_rp66, self.path, self.opened_at_tell,
+                                   self.vr_tell, self.is_tif, self.mmap)
+        lf = open_logical_file(self.stream, explicits, fdata, sizes, framenos,
+                               tails, self.sul, self.error_handler, self.lazy,
+                               reopen)
         self.logical_files.append(lf)
 
+        self.entries.append({
+            'tell'           : self.opened_at_tell,
+            'vr_tell'        : self.vr_tell,
+            'sul'            : self.sul.hex() if self.sul is not None else None,
+            'explicits'      : explicits,
+            'fdata'          : fdata,
+            'fdata_sizes'    : sizes,
+            'fdata_framenos' : framenos,
+            'fdata_tails'    : tails,
+        })
+
+    def index(self):
+        """ Index of all the processed logical files
+
+        The index contains everything needed to reopen the logical files
+        without scanning the file, see open_index.
+        """
+        return {
+            'is_tif'        : self.is_tif,
+            'logical_files' : self.entries,
+        }
+
     def end_of_data(self):
         """ Tests for end of data which indexer is able to process
 
@@ -225,7 +695,7 @@ class FileIndexer:
         try:
             self.stream.get(bytearray(1), ltell, 1)
         except Exception as e:
-            self.error_handler.log(
+            self.index_errors.log(
                 core.error_severity.critical,
                 "dlis::load: Testing logical eof",
                 e,
@@ -257,10 +727,10 @@ class FileIndexer:
         """
         expected = not self.sul and (len(self.logical_files) == 0)
         try:
-            core.findsul(self.stream, self.error_handler, expected)
+            core.findsul(self.stream, self.index_errors, expected)
 
             if not expected:
-                self.error_handler.log(
+                self.index_errors.log(
                     core.error_severity.minor,
                     "dlis::load: Looking for SUL",
                     "SUL is expected only at the start of the file",
@@ -273,7 +743,7 @@ class FileIndexer:
             return True
         except RuntimeError as e:
             if expected:
-                self.error_handler.log(
+                self.index_errors.log(
                     core.error_severity.minor,
                     "dlis::load: Looking for SUL",
                     "Exactly one SUL is expected at the start of the file, but "
@@ -295,7 +765,7 @@ class FileIndexer:
             sulbytes, self.stream.ltell, sulsize)
 
         if read != sulsize:
-            self.error_handler.log(
+            self.index_errors.log(
                 core.error_severity.major,
                 "dlis::load: Reading SUL",
                 "SUL is expected to be 80 bytes, but was {}".format(read),
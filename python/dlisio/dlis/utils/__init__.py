@@ -1,3 +1,4 @@
+from .curvecache import *
 from .describe import *
 from .dimensional import *
 from .fdata import *
@@ -0,0 +1,137 @@
+import threading
+from collections import OrderedDict
+
+class CurveCache():
+    """ Cache of decoded curves
+
+    A least-recently-used cache of the curves read by Frame.curves, bounded by
+    the total size of the cached arrays. The arrays are made read-only when
+    they are cached, as they are shared between all the callers that get
+    them from the cache.
+
+    Parameters
+    ----------
+
+    budget : int
+        Maximum number of bytes of cached arrays. Curves that are bigger than
+        the budget are never cached.
+
+    Attributes
+    ----------
+
+    hits : int
+        Number of lookups that found the curves in the cache
+
+    misses : int
+        Number of lookups that did not
+
+    nbytes : int
+        Number of bytes of the cached arrays
+    """
+    def __init__(self, budget):
+        if budget < 0:
+            msg = 'budget must be non-negative, was {}'
+            raise ValueError(msg.format(budget))
+
+        self.budget = budget
+        self.hits   = 0
+        self.misses = 0
+        self.nbytes = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        msg = 'CurveCache(entries={}, nbytes={}, budget={}, hits={}, misses={})'
+        return msg.format(len(self), self.nbytes, self.budget, self.hits,
+                          self.misses)
+
+    def get(self, key):
+        """ The curves of key, or None if they are not cached """
+        with self.lock:
+            try:
+                curves = self.entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return shallowcopy(curves)
+
+    def put(self, key, curves):
+        """ Cache curves, and return them as read-only
+
+        Curves that are bigger than the budget are returned as they are. The
+        least recently used curves are evicted until the cache is within
+        its budget.
+        """
+        size = sizeof(curves)
+        if size > self.budget:
+            return curves
+
+        readonly(curves)
+
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= sizeof(old)
+
+            while self.entries and self.nbytes + size > self.budget:
+                _, evicted = self.entries.popitem(last = False)
+                self.nbytes -= sizeof(evicted)
+
+            self.entries[key] = curves
+            self.nbytes += size
+
+        return shallowcopy(curves)
+
+    def clear(self):
+        """ Remove all curves from the cache, and reset the counters """
+        with self.lock:
+            self.entries = OrderedDict()
+            self.nbytes = 0
+            self.hits   = 0
+            self.misses = 0
+
+def curves_key(frame, strict, frames, index_range, channels, layout):
+    """ The key of the curves of frame in a CurveCache
+
+    The key is made of the arguments of Frame.curves, with channels given by
+    name or fingerprint. Raises TypeError if the arguments are not hashable.
+    """
+    if frames is not None:
+        frames = (frames.start, frames.stop, frames.step)
+
+    if index_range is not None:
+        index_range = tuple(index_range)
+
+    if channels is not None:
+        channels = tuple(
+            x if isinstance(x, str) else x.fingerprint for x in channels
+        )
+
+    key = (frame.fingerprint, strict, frames, index_range, channels, layout)
+    hash(key)
+    return key
+
+def sizeof(curves):
+    """ Number of bytes of curves, an array or a dict of arrays """
+    if isinstance(curves, dict):
+        return sum(x.nbytes for x in curves.values())
+    return curves.nbytes
+
+def readonly(curves):
+    """ Make curves, an array or a dict of arrays, read-only """
+    arrays = curves.values() if isinstance(curves, dict) else [curves]
+    for array in arrays:
+        array.flags.writeable = False
+
+def shallowcopy(curves):
+    """ A new dict for a dict of arrays, so that the cached dict can not be
+    modified by the caller. Arrays are returned as they are """
+    if isinstance(curves, dict):
+        return dict(curves)
+    return curves
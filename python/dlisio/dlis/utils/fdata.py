@@ -2,31 +2,617 @@
 Supporing methods for dlis class.
 Are moved into separate file in order not to clutter interface
 """
+import bisect
+
 import numpy as np
+from numpy.lib import recfunctions
 from ... import core
 
-def curves(dlis, frame, dtype, pre_fmt, fmt, post_fmt):
+def curves(dlis, frame, dtype, pre_fmt, fmt, post_fmt, frames = None,
+           index_range = None, channels = None, out = None, layout = 'rows',
+           workers = None):
     """ For internal use.
     Reads curves for provided frame and position defined by frame format:
     pre_fmt (to skip), fmt (to read), post_fmt (to skip)
+
+    If frames is a slice, only the frames with FRAMENO in that range are
+    returned, and only the records that may hold them are read. Likewise for
+    index_range, which is a range of values of the index of the frame.
+
+    If channels is a list of channels, only the columns of those channels
+    (and FRAMENO) are decoded, and the rest of every frame is skipped.
+
+    If out is an array, the frames are written to the start of out instead
+    of a new array, and the number of frames written is returned.
+
+    If layout is 'columns', the curves are decoded into one array per column,
+    and returned as a dict of column name -> array.
+
+    If workers is a number, the records are decoded by that many threads.
+    """
+    if frames is not None and index_range is not None:
+        raise ValueError('frames and index_range are mutually exclusive')
+
+    if layout not in ('rows', 'columns'):
+        msg = "layout must be 'rows' or 'columns', was {}"
+        raise ValueError(msg.format(layout))
+
+    if layout == 'columns' and out is not None:
+        raise ValueError("out can not be used with layout='columns'")
+
+    if workers is not None and workers < 1:
+        msg = 'workers must be positive, was {}'
+        raise ValueError(msg.format(workers))
+
+    # The index is needed to filter on index_range, even if it is not among
+    # the requested channels
+    names = dtype.names
+    if channels is not None:
+        names = projection(dtype, selection(frame, channels)).names
+    withindex = index_range is not None and has_index(frame)
+    selected, colfmt, dtype = columns(frame, dtype, fmt, channels, withindex)
+
+    if out is not None:
+        if dtype.names != names:
+            msg = ('out can not be used with index_range unless the index '
+                   'channel is among the channels')
+            raise ValueError(msg)
+        checkout(out, dtype)
+
+    indices, sizes = fdata_records(dlis, frame)
+
+    subset = None
+    if frames is not None:
+        start, stop = framerange(frames)
+        framenos = dlis.fdata_framenos.get(frame.fingerprint, [])
+        first, last = records_of_frames(framenos, len(indices), start, stop)
+        subset = range(first, last)
+
+    if index_range is not None:
+        lo, hi = sorted(index_range)
+        ranges = index_ranges(dlis, frame)
+        subset = records_in_range(ranges, lo, hi)
+
+    if subset is not None:
+        if len(sizes) == len(indices):
+            sizes = [sizes[i] for i in subset]
+        else:
+            sizes = []
+        indices = [indices[i] for i in subset]
+
+    curves = decode(dlis, pre_fmt, fmt, post_fmt, indices, sizes,
+                    dtype, colfmt, selected, out, layout, workers)
+    if out is not None:
+        curves = out[:curves]
+
+    mask = None
+    if frames is not None:
+        frameno = curves['FRAMENO']
+        mask = np.ones(len(frameno), dtype = bool)
+        if start is not None: mask &= frameno >= start
+        if stop  is not None: mask &= frameno < stop
+
+    if index_range is not None:
+        index = curves[index_column(frame, dtype)]
+        mask = (index >= lo) & (index <= hi)
+
+    if layout == 'columns':
+        if mask is None:
+            return { name : curves[name] for name in names }
+        return { name : curves[name][mask] for name in names }
+
+    if out is not None:
+        if mask is None:
+            return len(curves)
+        # Move the selected frames to the start of out
+        kept = curves[mask]
+        out[:len(kept)] = kept
+        return len(kept)
+
+    if mask is not None:
+        curves = curves[mask]
+
+    if curves.dtype.names != names:
+        curves = recfunctions.repack_fields(curves[list(names)])
+
+    return curves
+
+def curves_all(dlis, frames, strict = True):
+    """ For internal use.
+    The curves of all the frames, read in a single pass over the file, as a
+    dict of frame fingerprint -> curves
+    """
+    dtypes, fmts, indices, sizes, itemsizes, allocs, raws = (
+        [], [], [], [], [], [], []
+    )
+    for frame in frames:
+        dtype = frame.dtype(strict = strict)
+        fmt = frame.fmtstr()
+        raw = fixedwidth(fmt)
+        rawtype = raw_dtype(dtype, fmt) if raw else dtype
+
+        idx, size = fdata_records(dlis, frame)
+        if len(size) != len(idx):
+            size = []
+
+        dtypes.append(dtype)
+        fmts.append(fmt)
+        indices.append(idx)
+        sizes.append(size)
+        itemsizes.append(rawtype.itemsize)
+        allocs.append(lambda size, t = rawtype: np.empty(shape = size,
+                                                         dtype = t))
+        raws.append(raw)
+
+    curves = core.read_fdata_all(
+        fmts,
+        dlis.file,
+        indices,
+        sizes,
+        itemsizes,
+        allocs,
+        dlis.error_handler,
+        raws,
+    )
+
+    result = {}
+    for frame, dtype, fmt, raw, c in zip(frames, dtypes, fmts, raws, curves):
+        if raw:
+            c = fromraw(c, dtype, fmt)
+        result[frame.fingerprint] = c
+    return result
+
+def iter_curves(dlis, frame, dtype, fmt, chunk_frames, channels = None):
+    """ For internal use.
+    Generator of the curves of frame, chunk_frames frames at a time. The
+    arguments are checked up front, rather than on the first chunk.
+    """
+    if chunk_frames < 1:
+        msg = 'chunk_frames must be positive, was {}'
+        raise ValueError(msg.format(chunk_frames))
+
+    selected, colfmt, dtype = columns(frame, dtype, fmt, channels)
+    indices, sizes = fdata_records(dlis, frame)
+    if len(sizes) != len(indices):
+        sizes = []
+
+    return chunks(dlis, fmt, indices, sizes, dtype, colfmt, selected,
+                  chunk_frames)
+
+def chunks(dlis, fmt, indices, sizes, dtype, colfmt, selected, chunk_frames):
+    """ For internal use.
+    The records are decoded a few at a time, see chunk_records, so that every
+    decode holds at most chunk_frames frames, or the frames of a single
+    record if it holds more. The frames are copied into a single buffer of
+    chunk_frames rows, and the buffer is yielded whenever it is full. The
+    remaining frames are yielded at the end.
+    """
+    buffer = np.empty(shape = chunk_frames, dtype = dtype)
+    filled = 0
+    for first, last in chunk_records(fmt, sizes, len(indices), chunk_frames):
+        curves = decode(dlis, '', fmt, '',
+                        indices[first:last], sizes[first:last],
+                        dtype, colfmt, selected)
+
+        pos = 0
+        while pos < len(curves):
+            n = min(chunk_frames - filled, len(curves) - pos)
+            buffer[filled:filled + n] = curves[pos:pos + n]
+            filled += n
+            pos += n
+            if filled == chunk_frames:
+                yield buffer
+                filled = 0
+
+    if filled > 0:
+        yield buffer[:filled]
+
+def chunk_records(fmt, sizes, nrecords, chunk_frames):
+    """ For internal use.
+    Split the records into ranges [first, last) that hold at most
+    chunk_frames frames, going by an upper bound of the number of frames in
+    every record. A record that may hold more frames than that is a range of
+    its own. Without the sizes of the records, or with frames that are not
+    fixed-size, there is no bound, and every record is a range of its own.
+    """
+    size = min_frame_size(fmt)
+    if size == 0 or len(sizes) != nrecords:
+        return [(i, i + 1) for i in range(nrecords)]
+
+    ranges = []
+    first, frames = 0, 0
+    for i, recsize in enumerate(sizes):
+        n = max(recsize, 0) // size
+        if i > first and frames + n > chunk_frames:
+            ranges.append((first, i))
+            first, frames = i, 0
+        frames += n
+
+    if first < nrecords:
+        ranges.append((first, nrecords))
+    return ranges
+
+def checkout(out, dtype):
+    """ For internal use.
+    Check that out can be used as the output array for frames of dtype
+    """
+    if not isinstance(out, np.ndarray):
+        msg = 'out must be a numpy array, was {}'
+        raise TypeError(msg.format(type(out).__name__))
+
+    if out.dtype != dtype:
+        msg = 'out must have dtype {}, was {}'
+        raise ValueError(msg.format(dtype, out.dtype))
+
+    if out.ndim != 1 or not out.flags['C_CONTIGUOUS']:
+        raise ValueError('out must be a contiguous, one-dimensional array')
+
+    if not out.flags['WRITEABLE']:
+        raise ValueError('out must be writeable')
+
+def fdata_records(dlis, frame):
+    """ For internal use.
+    The fdata_index and fdata_sizes of frame
     """
     try:
         indices = dlis.fdata_index[frame.fingerprint]
     except KeyError:
         indices = []
+    sizes = dlis.fdata_sizes.get(frame.fingerprint, [])
+    return indices, sizes
+
+def columns(frame, dtype, fmt, channels, withindex = False):
+    """ For internal use.
+    The samples to decode, their format and the dtype of the decoded frames,
+    for the channels of frame. If channels is None, everything is decoded and
+    the selection is empty. If withindex, the index channel is decoded even
+    if it is not among the channels.
+    """
+    if channels is None:
+        return [], fmt, dtype
+
+    chosen = selection(frame, channels)
+    if withindex:
+        chosen[0] = True
+
+    selected = samples(frame, chosen)
+    colfmt = ''.join(x for x, keep in zip(fmt, selected) if keep)
+    return selected, colfmt, projection(dtype, chosen)
 
-    alloc = lambda size: np.empty(shape = size, dtype = dtype)
-    return core.read_fdata(
+def decode(dlis, pre_fmt, fmt, post_fmt, indices, sizes, dtype, colfmt,
+           selected, out = None, layout = 'rows', workers = None):
+    """ For internal use.
+    Decode the frames in the records at indices, where selected is the
+    samples of fmt to decode, colfmt is their format and dtype their dtype.
+    Frames where all the selected samples are fixed-size are read raw, and
+    converted with numpy.
+
+    If out is an array, the frames are decoded directly into it, and the
+    number of frames is returned.
+
+    If layout is 'columns', every field of dtype is decoded into its own
+    contiguous array, and a dict of name -> array is returned.
+
+    If workers is a number, the records are split between that many threads,
+    see streams.
+    """
+    raw = out is None and fixedwidth(colfmt)
+    rawtype = raw_dtype(dtype, colfmt) if raw else dtype
+
+    alloc = lambda size: np.empty(shape = size, dtype = rawtype)
+    widths = []
+    if layout == 'columns':
+        fields = [rawtype.fields[name][0] for name in rawtype.names]
+        widths = [int(np.prod(x.shape, dtype = int)) for x in fields]
+        alloc = lambda size: [
+            np.empty(shape = (size,) + x.shape, dtype = x.base)
+            for x in fields
+        ]
+    curves = core.read_fdata(
         pre_fmt,
         fmt,
         post_fmt,
         dlis.file,
         indices,
-        dtype.itemsize,
+        sizes,
+        rawtype.itemsize,
         alloc,
-        dlis.error_handler
+        dlis.error_handler,
+        raw,
+        selected,
+        out,
+        widths,
+        streams(dlis, workers),
     )
 
+    if layout == 'columns':
+        curves = dict(zip(dtype.names, curves))
+        if raw:
+            curves = fromraw_columns(curves, dtype, colfmt)
+        return curves
+
+    if raw:
+        curves = fromraw(curves, dtype, colfmt)
+
+    return curves
+
+def streams(dlis, workers):
+    """ For internal use.
+    The additional streams for reading curves with workers threads, one less
+    than workers, as the first thread reads from dlis.file. The streams are
+    opened on first use, and kept open until the logical file is closed. If
+    the logical file can not be reopened, there are no additional streams, and
+    the curves are read by a single thread.
+    """
+    if workers is None or dlis.reopen is None:
+        return []
+
+    while len(dlis.worker_streams) < workers - 1:
+        dlis.worker_streams.append(dlis.reopen())
+    return dlis.worker_streams[:workers - 1]
+
+def selection(frame, channels):
+    """ For internal use.
+    For every channel in frame.channels, True if it is in channels. Channels
+    can be given as Channel objects or by name. Channels that can not be
+    resolved (None) are never chosen.
+    """
+    chosen = [False] * len(frame.channels)
+    for channel in channels:
+        if isinstance(channel, str):
+            matches = [i for i, x in enumerate(frame.channels)
+                       if x is not None and x.name == channel]
+        else:
+            matches = [i for i, x in enumerate(frame.channels)
+                       if x is not None and x == channel]
+
+        if len(matches) == 0:
+            msg = '{} is not a channel in {}'
+            raise ValueError(msg.format(channel, frame))
+
+        if isinstance(channel, str) and len(matches) > 1:
+            msg = ('{} is ambiguous, there are {} channels with that name in '
+                   '{}. Use the Channel objects instead')
+            raise ValueError(msg.format(channel, len(matches), frame))
+
+        for i in matches:
+            chosen[i] = True
+
+    return chosen
+
+def samples(frame, chosen):
+    """ For internal use.
+    For every sample in frame.fmtstr(), True if it should be decoded. FRAMENO
+    is always decoded.
+    """
+    selected = [True]
+    for channel, keep in zip(frame.channels, chosen):
+        selected.extend([keep] * len(channel.fmtstr()))
+    return selected
+
+def projection(dtype, chosen):
+    """ For internal use.
+    The dtype of the frame with only FRAMENO and the chosen channels, with the
+    same names and titles as dtype
+    """
+    names = ['FRAMENO'] + [
+        name for name, keep in zip(dtype.names[1:], chosen) if keep
+    ]
+    fields = [dtype.fields[name] for name in names]
+    return np.dtype({
+        'names'   : names,
+        'formats' : [field[0] for field in fields],
+        'titles'  : [field[2] if len(field) > 2 else None for field in fields],
+    })
+
+""" fmt -> type-string of the samples as they are stored on disk
+
+Only the fixed-size samples that numpy can read directly, or that can be
+converted with a vectorized kernel (see rawconvert), are included.
+"""
+rawtype = {
+    'r' : '>u2', # FSHORT, see fshort
+    'f' : '>f4',
+    'x' : '>u4', # ISINGL, see isingl
+    'V' : '<u4', # VSINGL, see vsingl
+    'F' : '>f8',
+    'c' : '>c8',
+    'C' : '>c16',
+    'd' : 'i1',
+    'D' : '>i2',
+    'l' : '>i4',
+    'u' : 'u1',
+    'U' : '>u2',
+    'L' : '>u4',
+}
+
+def fixedwidth(fmt):
+    """ For internal use.
+    True if all samples in fmt but the leading FRAMENO are in rawtype, i.e.
+    if the frame is a plain struct of fixed-size samples on disk
+    """
+    return (len(fmt) > 1 and fmt[0] == 'i'
+            and all(x in rawtype for x in fmt[1:]))
+
+def min_frame_size(fmt):
+    """ For internal use.
+    The smallest possible size on disk of a frame of fmt, or 0 if fmt has
+    samples that are not in rawtype, such as strings. UVARI and ORIGIN take
+    1, 2 or 4 bytes, and count as 1 byte.
+    """
+    size = 0
+    for x in fmt:
+        if x in ('i', 'J'):
+            size += 1
+        elif x in rawtype:
+            size += np.dtype(rawtype[x]).itemsize
+        else:
+            return 0
+    return size
+
+def rawfields(dtype, fmt):
+    """ For internal use.
+    The (name, sample) of every column in dtype after FRAMENO, where sample is
+    the format of the samples in that column
+    """
+    pos = 1
+    for name in dtype.names[1:]:
+        subtype = dtype.fields[name][0]
+        yield name, fmt[pos]
+        pos += int(np.prod(subtype.shape, dtype = int))
+
+def raw_dtype(dtype, fmt):
+    """ For internal use.
+    The dtype of the frames of fmt as they are on disk, with the same names
+    and titles as dtype. Only FRAMENO, which is variable-length on disk, is
+    native.
+    """
+    names, formats, titles = ['FRAMENO'], [dtype.fields['FRAMENO'][0]], [None]
+    for name, sample in rawfields(dtype, fmt):
+        field = dtype.fields[name]
+        names.append(name)
+        formats.append((rawtype[sample], field[0].shape))
+        titles.append(field[2] if len(field) > 2 else None)
+
+    return np.dtype({ 'names' : names, 'formats' : formats, 'titles' : titles })
+
+def fromraw(raw, dtype, fmt):
+    """ For internal use.
+    Convert frames read with read_fdata(raw = True) to dtype, one column at a
+    time
+    """
+    curves = np.empty(shape = raw.shape, dtype = dtype)
+    curves['FRAMENO'] = raw['FRAMENO']
+    for name, sample in rawfields(dtype, fmt):
+        convert = rawconvert.get(sample)
+        curves[name] = raw[name] if convert is None else convert(raw[name])
+    return curves
+
+def fromraw_columns(columns, dtype, fmt):
+    """ For internal use.
+    Like fromraw, but for columns read with read_fdata(raw = True) into one
+    array per column. The columns are converted in place in the dict.
+    """
+    for name, sample in rawfields(dtype, fmt):
+        convert = rawconvert.get(sample)
+        column = columns[name]
+        if convert is None:
+            columns[name] = column.astype(dtype.fields[name][0].base,
+                                          copy = False)
+        else:
+            columns[name] = convert(column)
+    return columns
+
+def fshort(raw):
+    """ For internal use.
+    Vectorized dlis_fshort. Takes the 16-bit words of low precision floats
+    """
+    v = raw.astype(np.uint16)
+    sign = (v & 0x8000) != 0
+    exponent = (v & 0x000F).astype(np.int32)
+    fraction = (v & 0xFFF0) >> 4
+    fraction = np.where(sign, (~fraction & 0x0FFF) + 1, fraction)
+
+    value = fraction.astype(np.float32) / np.float32(0x0800)
+    value = np.where(sign, -value, value)
+    return np.ldexp(value, exponent).astype(np.float32)
+
+def isingl(raw):
+    """ For internal use.
+    Vectorized dlis_isingl. Takes the 32-bit words of IBM floats, and computes
+    the bit pattern of the IEEE floats with integer arithmetic
+    """
+    it = np.array([0x21800000, 0x21400000, 0x21000000, 0x21000000,
+                   0x20c00000, 0x20c00000, 0x20c00000, 0x20c00000],
+                  dtype = np.uint32)
+    mt = np.array([8, 4, 2, 2, 1, 1, 1, 1], dtype = np.uint32)
+
+    u = raw.astype(np.uint32)
+    manthi = u & np.uint32(0x00FFFFFF)
+    ix = manthi >> np.uint32(21)
+    iexp = ((u & np.uint32(0x7F000000)) - it[ix]) << np.uint32(1)
+    manthi = manthi * mt[ix] + iexp
+    inabs = u & np.uint32(0x7FFFFFFF)
+    manthi[inabs > np.uint32(0x611FFFFF)] = np.uint32(0x7FFFFFFF)
+    manthi |= u & np.uint32(0x80000000)
+    manthi[inabs < np.uint32(0x21200000)] = np.uint32(0)
+    return manthi.view(np.float32)
+
+def vsingl(raw):
+    """ For internal use.
+    Vectorized dlis_vsingl. Takes the VAX floats read as little-endian 32-bit
+    words, i.e. with the two 16-bit halves swapped
+    """
+    u = raw.astype(np.uint32)
+    v = (u << np.uint32(16)) | (u >> np.uint32(16))
+    sign = (v & np.uint32(0x80000000)) != 0
+    fraction = v & np.uint32(0x007FFFFF)
+    exponent = ((v & np.uint32(0x7F800000)) >> np.uint32(23)).astype(np.int32)
+
+    significand = (fraction | np.uint32(0x00800000)).astype(np.float32)
+    significand /= np.float32(2 ** 24)
+    significand = np.where(sign, -significand, significand)
+    value = np.ldexp(significand, exponent - 128).astype(np.float32)
+
+    # There are no denormalized VAX floats. With a zero exponent, the value is
+    # zero, or undefined if the sign bit is set
+    value[(exponent == 0) & ~sign] = 0
+    value[(exponent == 0) & sign] = np.nan
+    return value
+
+""" fmt -> vectorized conversion of the raw samples, for the samples in rawtype
+that numpy cannot read directly
+"""
+rawconvert = {
+    'r' : fshort,
+    'x' : isingl,
+    'V' : vsingl,
+}
+
+def framerange(frames):
+    """ For internal use.
+    The (start, stop) FRAMENO of a slice, where None means unbounded
+    """
+    if not isinstance(frames, slice):
+        msg = 'frames must be a slice, was {}'
+        raise TypeError(msg.format(type(frames).__name__))
+
+    if frames.step not in (None, 1):
+        msg = 'frames must be a contiguous range of frames, step was {}'
+        raise ValueError(msg.format(frames.step))
+
+    return frames.start, frames.stop
+
+def records_of_frames(framenos, nrecords, start, stop):
+    """ For internal use.
+    The range [first, last) of records that may hold frames with FRAMENO in
+    [start, stop).
+
+    Frames are numbered consecutively, so as long as the first FRAMENO of
+    every record is known and they are increasing, the range is found by
+    binary search. Otherwise, all the records must be read.
+    """
+    if start is not None and stop is not None and start >= stop:
+        return 0, 0
+
+    if len(framenos) != nrecords:
+        return 0, nrecords
+
+    if any(x < 0 for x in framenos):
+        return 0, nrecords
+
+    if any(x > y for x, y in zip(framenos, framenos[1:])):
+        return 0, nrecords
+
+    first, last = 0, nrecords
+    if start is not None:
+        # The last record starting before start may still hold start
+        first = max(bisect.bisect_left(framenos, start) - 1, 0)
+    if stop is not None:
+        last = bisect.bisect_left(framenos, stop)
+
+    return first, max(first, last)
+
 def noformat(noformat):
     """ For internal use.
     Reads noformat data for provided no-format object
@@ -39,3 +625,71 @@ def noformat(noformat):
         indices = []
 
     return core.read_noform(dlis.file, indices, dlis.error_handler)
+
+def has_index(frame):
+    """ For internal use.
+    True if the first channel of frame is its index, see Frame.index
+    """
+    return frame.index_type is not None and len(frame.channels) > 0
+
+def index_column(frame, dtype):
+    """ For internal use.
+    Name of the column in dtype that holds the index of frame
+    """
+    return dtype.names[1] if has_index(frame) else 'FRAMENO'
+
+def index_ranges(dlis, frame):
+    """ For internal use.
+    The zone map of frame, i.e. the [min, max] of the index in every record
+    in the fdata_index of frame, as an array of shape (records, 2). Records
+    where the range is unknown, such as broken records, have the range
+    [nan, nan].
+
+    The index is the first channel of the frame, or FRAMENO if the frame has
+    no index. For fixed-size frames, only the first and last frame of every
+    record is read, using the tails of the records from dlis.fdata_tails.
+    Other frames require a pass over all the records. The zone map is
+    computed on first use and then kept in dlis.fdata_zones.
+    """
+    try:
+        return dlis.fdata_zones[frame.fingerprint]
+    except KeyError:
+        pass
+
+    try:
+        indices = dlis.fdata_index[frame.fingerprint]
+    except KeyError:
+        indices = []
+    tails = dlis.fdata_tails.get(frame.fingerprint, [])
+
+    fmt = frame.fmtstr()
+    if has_index(frame):
+        index = frame.channels[0]
+        index_fmt = index.fmtstr()
+        if len(index_fmt) != 1:
+            msg = 'index channel {} of {} is not scalar'
+            raise ValueError(msg.format(index.name, frame.name))
+        pre_fmt, post_fmt = 'i', fmt[2:]
+    else:
+        pre_fmt, index_fmt, post_fmt = '', 'i', fmt[1:]
+
+    ranges = core.read_index_ranges(
+        pre_fmt,
+        index_fmt,
+        post_fmt,
+        dlis.file,
+        indices,
+        tails
+    )
+    ranges = np.array(ranges, dtype = float).reshape(-1, 2)
+    dlis.fdata_zones[frame.fingerprint] = ranges
+    return ranges
+
+def records_in_range(ranges, lo, hi):
+    """ For internal use.
+    The records which index ranges overlap [lo, hi]. Records with unknown
+    ranges are always included.
+    """
+    lower, upper = ranges[:, 0], ranges[:, 1]
+    overlap = (upper >= lo) & (lower <= hi)
+    return np.flatnonzero(overlap | np.isnan(lower)).tolist()
@@ -34,16 +34,38 @@ class regex_matcher(core.matcher):
 
         return bool(re.match(compiled, str(candidate)))
 
-class exact_matcher(core.matcher):
+class exact_matcher(core.exact_matcher):
     """ Exact matcher
 
     A matcher using the == operator for comparison, that can be passed to
-    dl::pool::get along with the search parameter(s).
+    dl::pool::get along with the search parameter(s). The comparison is
+    implemented in C++, so dl::pool::get runs without calling back into
+    python, and without holding the GIL.
+
+    Names are compared as they are decoded with the encodings from
+    :func:`dlisio.common.set_encodings`, like the names of the objects
+    themselves. Names that are valid UTF-8 are compared without decoding.
+
+    match is a static method, and can be called on the class, e.g.
+    exact_matcher.match(pattern, candidate). Subclasses can override match,
+    and are then called through python like any other matcher.
     """
     def __init__(self):
-        core.matcher.__init__(self)
+        core.exact_matcher.__init__(self)
 
-    @staticmethod
-    def match(pattern, candidate):
-        """ Overrides dl::matcher::match """
-        return pattern == candidate
+class icase_matcher(core.icase_matcher):
+    """ Case-insensitive matcher
+
+    Like exact_matcher, but ignores the case of ASCII letters. Use it instead
+    of a regex_matcher with re.IGNORECASE when the search parameters are
+    plain names, not patterns.
+
+    Examples
+    --------
+
+    >>> matcher = icase_matcher()
+    >>> matcher.match("tdep", "TDEP")
+    True
+    """
+    def __init__(self):
+        core.icase_matcher.__init__(self)
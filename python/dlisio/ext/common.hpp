@@ -1,6 +1,8 @@
 #ifndef DLISIO_EXT_COMMON
 #define DLISIO_EXT_COMMON
 
+#include <mutex>
+#include <stdexcept>
 #include <string>
 
 #include <pybind11/pybind11.h>
@@ -11,6 +13,56 @@ namespace dlisio { namespace detail {
 
 py::handle decode_str(const std::string& src) noexcept (false);
 
+/*
+ * Exclusive access to a file handle.
+ *
+ * The GIL is released while reading and decoding files, which means the GIL
+ * no longer serializes access to a stream that is shared between python
+ * threads, e.g. a logical file that is read from several threads. Everything
+ * that reads from a stream while the GIL might be released must hold the
+ * lock of that stream, identified by its lfp protocol.
+ *
+ * The lock must be taken while holding the GIL, and the GIL is released while
+ * waiting for it. Waiting for a stream while holding the GIL could otherwise
+ * deadlock with a thread that holds the stream and wants to call back into
+ * python, e.g. to log an error.
+ *
+ * The mutex of a stream only lives as long as some stream_lock holds or waits
+ * for it, so that closed streams leave nothing behind.
+ */
+struct stream_entry;
+
+class stream_lock {
+public:
+    explicit stream_lock(const void* protocol) noexcept (false);
+    ~stream_lock() noexcept (true);
+
+    stream_lock(const stream_lock&) = delete;
+    stream_lock& operator=(const stream_lock&) = delete;
+
+private:
+    const void* protocol;
+    stream_entry* shared;
+    std::unique_lock< std::mutex > lock;
+};
+
+/*
+ * A caller-supplied output array is too small for the data.
+ *
+ * This is an error in the arguments, not in the file, so it is never passed
+ * to the error handler, but always propagated to the caller (as ValueError).
+ */
+struct out_too_small : public std::length_error {
+    using std::length_error::length_error;
+};
+
+/*
+ * The number of rows of a caller-supplied output array, which must be a
+ * contiguous, one-dimensional array of rows of itemsize bytes.
+ */
+std::size_t out_rows(const py::buffer_info& info, std::size_t itemsize)
+noexcept (false);
+
 } // namespace detail
 
 } // namespace dlisio
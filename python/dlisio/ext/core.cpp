@@ -1,4 +1,7 @@
 #include <exception>
+#include <map>
+#include <memory>
+#include <mutex>
 #include <string>
 #include <vector>
 
@@ -76,6 +79,55 @@ const std::vector< std::string >& get_encodings() {
 } // namespace
 
 namespace dlisio { namespace detail {
+
+/*
+ * The mutex of a stream, and the number of stream_locks that hold or wait for
+ * it. The entry is removed from the registry when the last of them is done,
+ * so the registry only holds the streams that are in use, and a protocol that
+ * is allocated at the address of a closed one gets a fresh mutex.
+ */
+struct stream_entry {
+    std::mutex mutex;
+    std::size_t users = 0;
+};
+
+namespace {
+
+std::mutex registry_mutex;
+std::map< const void*, std::unique_ptr< stream_entry > > registry;
+
+}
+
+stream_lock::stream_lock(const void* protocol) noexcept (false) :
+    protocol(protocol)
+{
+    {
+        std::lock_guard< std::mutex > guard(registry_mutex);
+        auto& shared = registry[protocol];
+        if (not shared) shared.reset(new stream_entry());
+        ++shared->users;
+        this->shared = shared.get();
+    }
+
+    this->lock = std::unique_lock< std::mutex >(this->shared->mutex,
+                                                std::defer_lock);
+    try {
+        py::gil_scoped_release nogil;
+        this->lock.lock();
+    } catch (...) {
+        std::lock_guard< std::mutex > guard(registry_mutex);
+        if (--this->shared->users == 0) registry.erase(protocol);
+        throw;
+    }
+}
+
+stream_lock::~stream_lock() noexcept (true) {
+    this->lock.unlock();
+
+    std::lock_guard< std::mutex > guard(registry_mutex);
+    if (--this->shared->users == 0) registry.erase(this->protocol);
+}
+
 py::handle decode_str(const std::string& src) noexcept (false) {
     auto* p = PyUnicode_FromString(src.c_str());
     if (p) return p;
@@ -111,6 +163,22 @@ py::handle decode_str(const std::string& src) noexcept (false) {
     return pysrc.release();
 }
 
+std::size_t out_rows(const py::buffer_info& info, std::size_t itemsize)
+noexcept (false) {
+    if (info.ndim != 1)
+        throw std::invalid_argument("out must be one-dimensional");
+
+    if (info.strides[0] != py::ssize_t(itemsize)) {
+        const auto msg = "out must be contiguous, expected stride "
+                       + std::to_string(itemsize)
+                       + ", was "
+                       + std::to_string(info.strides[0]);
+        throw std::invalid_argument(msg);
+    }
+
+    return info.shape[0];
+}
+
 } // namespace detail
 
 } // namespace dlisio
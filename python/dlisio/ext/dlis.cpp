@@ -1,3 +1,4 @@
+#include <algorithm>
 #include <cstdint>
 #include <cstring>
 #include <exception>
@@ -8,6 +9,7 @@
 #include <limits>
 #include <functional>
 #include <stdexcept>
+#include <thread>
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl_bind.h>
@@ -527,31 +529,361 @@ void read_curve_sample(const char* f, const char*& ptr, const char* end,
     ptr += src_skip;
 }
 
-void read_fdata_frame(const char* fmt, const char*& ptr, const char* end,
-                      unsigned char*& dst) noexcept (false) {
+/*
+ * True if any of the samples in fmt are returned as python objects, rather
+ * than plain bytes in the array.
+ */
+bool has_object_samples(const char* fmt) noexcept (true) {
+    static const char objects[] = {
+        DLIS_FMT_FSING1,
+        DLIS_FMT_FSING2,
+        DLIS_FMT_FDOUB1,
+        DLIS_FMT_FDOUB2,
+        DLIS_FMT_ASCII,
+        DLIS_FMT_DTIME,
+        DLIS_FMT_OBNAME,
+        DLIS_FMT_OBJREF,
+        DLIS_FMT_ATTREF,
+        '\0',
+    };
+    return std::strpbrk(fmt, objects) != nullptr;
+}
+
+/*
+ * The smallest possible size on disk of a frame of pre_fmt, fmt and
+ * post_fmt, or 0 if the frame has variable-length samples such as strings.
+ * All of the frame counts, including the FRAMENO, no matter which part of
+ * it is read.
+ *
+ * UVARI and ORIGIN take 1, 2 or 4 bytes, and count as 1 byte. Otherwise,
+ * numeric frames are fixed-size, which means the number of frames in a record
+ * is bounded by the record size.
+ */
+std::size_t min_frame_size(const char* pre_fmt,
+                           const char* fmt,
+                           const char* post_fmt)
+noexcept (false) {
+    const auto frame = std::string(pre_fmt) + fmt + post_fmt;
+
+    std::string fixed;
+    std::size_t uvaris = 0;
+    for (auto f : frame) {
+        if (f == DLIS_FMT_UVARI or f == DLIS_FMT_ORIGIN)
+            ++uvaris;
+        else
+            fixed.push_back(f);
+    }
+
+    int size;
+    const auto err = dlis_pack_size(fixed.c_str(), &size, nullptr);
+    if (err != DLIS_OK) return 0;
+    return size + uvaris;
+}
+
+/*
+ * Skip a single sample of any type, without decoding it
+ */
+void skip_curve_sample(const char* f, const char*& ptr, const char* end) {
+    int src_skip;
+    const char localfmt[] = {*f, '\0'};
+    dlis_packflen(localfmt, ptr, &src_skip, nullptr);
+    assert_overflow(ptr, end, src_skip);
+    ptr += src_skip;
+}
+
+/*
+ * Decoders for fixed-size samples that are plain bytes in the output array.
+ * Each reads a single sample from src and writes it to dst, without going
+ * through the dispatch in dlis_packf.
+ */
+using sample_decoder = void (*)(const char*, unsigned char*);
+
+template < typename T, const char* (*decode)(const char*, T*) >
+void decode_sample(const char* src, unsigned char* dst) noexcept (true) {
+    T x;
+    decode(src, &x);
+    std::memcpy(dst, &x, sizeof(x));
+}
+
+template < typename T, const char* (*decode)(const char*, T*, T*) >
+void decode_complex(const char* src, unsigned char* dst) noexcept (true) {
+    T re;
+    T im;
+    decode(src, &re, &im);
+    std::memcpy(dst, &re, sizeof(re));
+    std::memcpy(dst + sizeof(re), &im, sizeof(im));
+}
+
+struct fixed_sample {
+    sample_decoder decode;
+    int src_size;
+    int dst_size;
+};
+
+/*
+ * The decoder of fmt character f, if samples of f are fixed-size on disk and
+ * plain bytes in the output array. Returns false for all other samples.
+ */
+bool fixed_sample_of(char f, fixed_sample& sample) noexcept (true) {
+    switch (f) {
+        case DLIS_FMT_FSHORT:
+            sample = { decode_sample< float, dlis_fshort >,
+                       DLIS_SIZEOF_FSHORT, sizeof(float) };
+            return true;
+        case DLIS_FMT_FSINGL:
+            sample = { decode_sample< float, dlis_fsingl >,
+                       DLIS_SIZEOF_FSINGL, sizeof(float) };
+            return true;
+        case DLIS_FMT_ISINGL:
+            sample = { decode_sample< float, dlis_isingl >,
+                       DLIS_SIZEOF_ISINGL, sizeof(float) };
+            return true;
+        case DLIS_FMT_VSINGL:
+            sample = { decode_sample< float, dlis_vsingl >,
+                       DLIS_SIZEOF_VSINGL, sizeof(float) };
+            return true;
+        case DLIS_FMT_FDOUBL:
+            sample = { decode_sample< double, dlis_fdoubl >,
+                       DLIS_SIZEOF_FDOUBL, sizeof(double) };
+            return true;
+        case DLIS_FMT_CSINGL:
+            sample = { decode_complex< float, dlis_csingl >,
+                       DLIS_SIZEOF_CSINGL, 2 * sizeof(float) };
+            return true;
+        case DLIS_FMT_CDOUBL:
+            sample = { decode_complex< double, dlis_cdoubl >,
+                       DLIS_SIZEOF_CDOUBL, 2 * sizeof(double) };
+            return true;
+        case DLIS_FMT_SSHORT:
+            sample = { decode_sample< std::int8_t, dlis_sshort >,
+                       DLIS_SIZEOF_SSHORT, sizeof(std::int8_t) };
+            return true;
+        case DLIS_FMT_SNORM:
+            sample = { decode_sample< std::int16_t, dlis_snorm >,
+                       DLIS_SIZEOF_SNORM, sizeof(std::int16_t) };
+            return true;
+        case DLIS_FMT_SLONG:
+            sample = { decode_sample< std::int32_t, dlis_slong >,
+                       DLIS_SIZEOF_SLONG, sizeof(std::int32_t) };
+            return true;
+        case DLIS_FMT_USHORT:
+            sample = { decode_sample< std::uint8_t, dlis_ushort >,
+                       DLIS_SIZEOF_USHORT, sizeof(std::uint8_t) };
+            return true;
+        case DLIS_FMT_UNORM:
+            sample = { decode_sample< std::uint16_t, dlis_unorm >,
+                       DLIS_SIZEOF_UNORM, sizeof(std::uint16_t) };
+            return true;
+        case DLIS_FMT_ULONG:
+            sample = { decode_sample< std::uint32_t, dlis_ulong >,
+                       DLIS_SIZEOF_ULONG, sizeof(std::uint32_t) };
+            return true;
+        case DLIS_FMT_STATUS:
+            sample = { decode_sample< std::uint8_t, dlis_status >,
+                       DLIS_SIZEOF_STATUS, sizeof(std::uint8_t) };
+            return true;
+        default:
+            return false;
+    }
+}
+
+/*
+ * Decode plan for the frames of a format string
+ *
+ * Decoding a frame sample by sample through dlis_packf means a string
+ * dispatch and a size computation (dlis_packflen) for every sample. The plan
+ * is compiled once from the format string instead. Runs of fixed-size
+ * samples become a single step: the record is checked for overflow once for
+ * the whole run, and then every sample is decoded with a decoder that is
+ * looked up up front. Consecutive samples of the same type, e.g. the values
+ * of a multi-dimensional channel, are merged into one kernel.
+ *
+ * Variable-size samples (UVARI, IDENT, ASCII, OBNAME, ...) and samples that
+ * are python objects go through read_curve_sample, one by one.
+ *
+ * A raw plan does not decode the fixed-size samples at all, but copies every
+ * run verbatim, so that the output has the same (big-endian) layout as the
+ * frame on disk. Converting the samples is then up to the caller.
+ *
+ * If selected is non-empty, it must have one entry per sample in fmt, and
+ * only the selected samples are written to the output. The others are
+ * skipped, which for runs of fixed-size samples is a single pointer bump.
+ *
+ * The output is split in columns, with one destination pointer per column.
+ * If widths is non-empty, it is the number of (selected) samples in every
+ * column, e.g. the number of samples of every channel. Otherwise, all the
+ * samples go to a single column, i.e. the frame is a row.
+ */
+class frame_plan {
+public:
+    explicit frame_plan(const char* fmt,
+                        bool raw = false,
+                        const std::vector< bool >& selected = {},
+                        const std::vector< std::size_t >& widths = {})
+    noexcept (false);
+
+    void read(const char*& ptr, const char* end, unsigned char** dst) const
+    noexcept (false);
+
+private:
+    struct kernel {
+        sample_decoder decode;
+        int count;
+        int src_size;
+        int dst_size;
+    };
+
+    struct step {
+        /* The sample for read_curve_sample, or nullptr for a fixed run */
+        const char* f;
+        /* Skip the sample or run, rather than writing it to the output */
+        bool skip;
+        /* The column of the output */
+        std::size_t column;
+        /* The kernels [first, last) of a fixed run, and its total size */
+        std::size_t first;
+        std::size_t last;
+        int src_size;
+    };
+
+    std::vector< kernel > kernels;
+    std::vector< step > steps;
+    bool raw;
+};
+
+frame_plan::frame_plan(const char* fmt,
+                       bool raw,
+                       const std::vector< bool >& selected,
+                       const std::vector< std::size_t >& widths)
+noexcept (false) :
+    raw(raw)
+{
+    const auto samples = std::strlen(fmt);
+    if (not selected.empty() and selected.size() != samples) {
+        const auto msg = "frame_plan: expected selection of size "
+                       + std::to_string(samples)
+                       + ", was "
+                       + std::to_string(selected.size());
+        throw std::invalid_argument(msg);
+    }
+
+    std::size_t outputs = samples;
+    if (not selected.empty())
+        outputs = std::count(selected.begin(), selected.end(), true);
+
+    std::size_t width = 0;
+    for (auto w : widths)
+        width += w;
+
+    if (not widths.empty() and width != outputs) {
+        const auto msg = "frame_plan: columns have "
+                       + std::to_string(width)
+                       + " samples, expected "
+                       + std::to_string(outputs);
+        throw std::invalid_argument(msg);
+    }
+
+    /* The column of the next output sample, and the samples left in it */
+    std::size_t column = 0;
+    std::size_t left = widths.empty() ? outputs : 0;
+
     for (auto* f = fmt; *f; ++f) {
-        read_curve_sample(f, ptr, end, dst);
+        const bool skip = not selected.empty() and not selected[f - fmt];
+
+        if (not skip) {
+            while (left == 0)
+                left = widths[column++];
+            left -= 1;
+        }
+        const auto col = column == 0 ? 0 : column - 1;
+
+        fixed_sample sample;
+        if (not fixed_sample_of(*f, sample)) {
+            this->steps.push_back({ f, skip, col, 0, 0, 0 });
+            continue;
+        }
+
+        if (this->steps.empty()
+            or this->steps.back().f
+            or this->steps.back().skip != skip
+            or (not skip and this->steps.back().column != col)) {
+            const auto n = this->kernels.size();
+            this->steps.push_back({ nullptr, skip, col, n, n, 0 });
+        }
+
+        auto& run = this->steps.back();
+        run.src_size += sample.src_size;
+        if (skip) continue;
+
+        if (run.last > run.first
+            and this->kernels.back().decode == sample.decode) {
+            this->kernels.back().count += 1;
+        } else {
+            this->kernels.push_back({ sample.decode,
+                                      1,
+                                      sample.src_size,
+                                      sample.dst_size });
+            run.last += 1;
+        }
+    }
+}
+
+void frame_plan::read(const char*& ptr,
+                      const char* end,
+                      unsigned char** columns) const
+noexcept (false) {
+    for (const auto& step : this->steps) {
+        auto*& dst = columns[step.column];
+
+        if (step.f and step.skip) {
+            skip_curve_sample(step.f, ptr, end);
+            continue;
+        }
+
+        if (step.f) {
+            read_curve_sample(step.f, ptr, end, dst);
+            continue;
+        }
+
+        assert_overflow(ptr, end, step.src_size);
+        if (step.skip) {
+            ptr += step.src_size;
+            continue;
+        }
+
+        if (this->raw) {
+            std::memcpy(dst, ptr, step.src_size);
+            ptr += step.src_size;
+            dst += step.src_size;
+            continue;
+        }
+
+        for (auto k = step.first; k < step.last; ++k) {
+            const auto& kernel = this->kernels[k];
+            for (int i = 0; i < kernel.count; ++i) {
+                kernel.decode(ptr, dst);
+                ptr += kernel.src_size;
+                dst += kernel.dst_size;
+            }
+        }
     }
 }
 
 void read_fdata_record(const char* pre_fmt,
-                       const char* fmt,
+                       const frame_plan& plan,
                        const char* post_fmt,
                        const char* ptr,
                        const char* end,
-                       unsigned char*& dst,
+                       unsigned char** dst,
                        std::size_t& frames,
-                       const std::size_t& itemsize,
                        std::size_t& allocated_rows,
                        std::function<void (std::size_t)> resize)
 noexcept (false) {
 
     /* get frame number and slots */
     while (ptr < end) {
-        if (frames == allocated_rows) {
-            resize(frames * 2);
-            dst += (frames * itemsize);
-        }
+        if (frames == allocated_rows)
+            resize(std::max< std::size_t >(frames * 2, 1));
 
         int src_skip;
 
@@ -559,7 +891,7 @@ noexcept (false) {
         assert_overflow(ptr, end, src_skip);
         ptr += src_skip;
 
-        read_fdata_frame(fmt, ptr, end, dst);
+        plan.read(ptr, end, dst);
 
         dlis_packflen(post_fmt, ptr, &src_skip, nullptr);
         assert_overflow(ptr, end, src_skip);
@@ -569,14 +901,399 @@ noexcept (false) {
     }
 }
 
+/*
+ * Read the frames of the records [first, last) into dst, see read_fdata.
+ *
+ * Records that can not be read are reported with skip, and skipped. If a
+ * record is broken half-way through a frame, the frame is discarded with
+ * rewind, which must point dst back to the first row after the complete
+ * frames.
+ */
+void read_fdata_records(const char* pre_fmt,
+                        const frame_plan& plan,
+                        const char* post_fmt,
+                        dlisio::stream& file,
+                        const long long* first,
+                        const long long* last,
+                        unsigned char** dst,
+                        std::size_t& frames,
+                        std::size_t& allocated_rows,
+                        dl::error_handler& errorhandler,
+                        std::function<void (std::size_t)> resize,
+                        std::function<void ()> rewind,
+                        std::function<void (const std::string&)> skip)
+noexcept (false) {
+    dl::record record;
+    for (auto itr = first; itr != last; ++itr) {
+        /*
+         * get record
+         *
+         * When the file is memory-mapped, the frames of single-segment
+         * records are decoded straight from the mapping, without copying the
+         * record first.
+         */
+        dl::record_view view;
+        try {
+            if (not dl::extract_view(file, *itr, view)) {
+                dl::extract(file, *itr, std::numeric_limits< long long >::max(),
+                            record, errorhandler);
+                view.attributes = record.attributes;
+                view.begin = record.data.data();
+                view.end = view.begin + record.data.size();
+            }
+        } catch (std::exception& e) {
+            skip(e.what());
+            continue;
+        }
+
+        if (view.isencrypted()) {
+            skip("encrypted FDATA record");
+            continue;
+        }
+
+        const auto* ptr = view.begin;
+        const auto* end = view.end;
+
+        /* read fingerprint */
+        std::int32_t origin;
+        std::uint8_t copy;
+        ptr = dlis_obname(ptr, &origin, &copy, nullptr, nullptr);
+
+        try {
+            read_fdata_record(pre_fmt, plan, post_fmt, ptr, end, dst,
+                              frames, allocated_rows, resize);
+        } catch (const dlisio::detail::out_too_small&) {
+            throw;
+        } catch (std::exception& e) {
+            skip(e.what());
+            /* When failing to write a frame (row) to dst, position of the dst
+             * pointer is left in an undefined state. I.e. it may be left
+             * anywhere within the partially written row. We discard the row
+             * completely by rewinding the dst pointer back to the start of the
+             * row.
+             */
+            rewind();
+        }
+        assert(allocated_rows >= frames);
+    }
+}
+
+/*
+ * Error handler that keeps the errors, so that they can be passed on to
+ * another error handler later. Worker threads run without the GIL, and can
+ * not log to a python error handler directly.
+ *
+ * Skipped records are kept with the number of frames read before them, as
+ * the frames are counted from the start of the first record of the worker,
+ * not from the start of the curves.
+ */
+struct recorded_error {
+    dl::error_severity severity;
+    std::string context;
+    std::string problem;
+    std::string specification;
+    std::string action;
+    std::string debug;
+    bool skipped;
+    std::size_t frames;
+};
+
+struct record_errors : public dl::error_handler {
+    void log(const dl::error_severity& severity,
+             const std::string& context,
+             const std::string& problem,
+             const std::string& specification,
+             const std::string& action,
+             const std::string& debug)
+        const noexcept (false) override
+    {
+        this->errors.push_back({ severity, context, problem, specification,
+                                 action, debug, false, 0 });
+    }
+
+    mutable std::vector< recorded_error > errors;
+};
+
+/*
+ * The frames of a contiguous range of records, read by one worker thread,
+ * with one buffer per output column.
+ */
+struct fdata_part {
+    std::vector< std::vector< unsigned char > > columns;
+    std::size_t frames;
+    record_errors errors;
+    std::exception_ptr failure;
+};
+
+void read_fdata_part(const char* pre_fmt,
+                     const frame_plan& plan,
+                     const char* post_fmt,
+                     dlisio::stream& file,
+                     const long long* first,
+                     const long long* last,
+                     const std::vector< std::size_t >& rowsizes,
+                     std::size_t rows,
+                     fdata_part& part)
+noexcept (true) {
+    try {
+        part.frames = 0;
+        part.columns.resize(rowsizes.size());
+        std::vector< unsigned char* > dst(rowsizes.size());
+        std::size_t allocated_rows = 0;
+
+        const auto rewind = [&]() {
+            for (std::size_t c = 0; c < dst.size(); ++c)
+                dst[c] = part.columns[c].data() + part.frames * rowsizes[c];
+        };
+
+        const auto resize = [&](std::size_t n) {
+            for (std::size_t c = 0; c < dst.size(); ++c)
+                part.columns[c].resize(n * rowsizes[c]);
+            allocated_rows = n;
+            rewind();
+        };
+
+        const auto skip = [&](const std::string& problem) {
+            const auto debug = "Physical tell (end of the record): " +
+                               std::to_string(file.ptell()) + " (dec)";
+            part.errors.errors.push_back({
+                dl::error_severity::CRITICAL,
+                "dlis::read_fdata: reading curves",
+                problem,
+                "",
+                "Record is skipped",
+                debug,
+                true,
+                part.frames,
+            });
+        };
+
+        resize(rows);
+        read_fdata_records(pre_fmt, plan, post_fmt, file, first, last,
+                           dst.data(), part.frames, allocated_rows,
+                           part.errors, resize, rewind, skip);
+    } catch (...) {
+        part.failure = std::current_exception();
+    }
+}
+
+/*
+ * The output arrays of read_fdata, and the frames written to them so far.
+ *
+ * Resizing is clumsy, because in-place resize (through the method) requires
+ * there to be no references to the underlying data. That means the
+ * buffer-info and buffer must be wiped before resizing takes place, and then
+ * carefully restored to the new memory. Only the number of rows changes, so
+ * columns with multiple samples per row keep their shape.
+ *
+ * The output holds python objects, and must be created and destroyed with
+ * the GIL held.
+ */
+class fdata_output {
+public:
+    /*
+     * Allocate rows frames with alloc, or use out if it is not None. If
+     * widths is non-empty, alloc returns a list of arrays, one per column.
+     */
+    fdata_output(py::object alloc,
+                 py::object out,
+                 std::size_t itemsize,
+                 std::size_t rows,
+                 const std::vector< std::size_t >& widths) noexcept (false);
+
+    /*
+     * Point the destinations to the first row after the frames read so far.
+     */
+    void rewind() noexcept (true);
+
+    /*
+     * Resize the arrays to n frames. Calls into python, and acquires the GIL.
+     * If the output is a caller-supplied array it is never resized, and
+     * out_too_small is thrown instead.
+     */
+    void resize(std::size_t n) noexcept (false);
+
+    /*
+     * Shrink the arrays to fit the frames, and return them, or the number of
+     * frames if the output is a caller-supplied array. The GIL must be held.
+     */
+    py::object result() noexcept (false);
+
+    std::vector< std::size_t > rowsizes() const noexcept (false);
+
+    std::vector< unsigned char* > dst;
+    std::size_t frames = 0;
+    std::size_t allocated_rows;
+
+private:
+    /*
+     * Get the buffers of the output arrays. The row size of a column is its
+     * stride, as a column may have multiple samples per row. Calls into
+     * python, so the GIL must be held.
+     */
+    void request() noexcept (false);
+
+    struct column {
+        py::object array;
+        py::buffer buffer;
+        py::buffer_info info;
+        std::size_t rowsize;
+    };
+
+    std::vector< column > columns;
+    bool fixed;
+    bool split;
+};
+
+fdata_output::fdata_output(py::object alloc,
+                           py::object out,
+                           std::size_t itemsize,
+                           std::size_t rows,
+                           const std::vector< std::size_t >& widths)
+noexcept (false) :
+    allocated_rows(rows),
+    fixed(not out.is_none()),
+    split(not widths.empty())
+{
+    if (this->fixed) {
+        this->columns.push_back({ out, {}, {}, itemsize });
+    } else if (not this->split) {
+        this->columns.push_back({ alloc(rows), {}, {}, itemsize });
+    } else {
+        for (auto array : alloc(rows)) {
+            const auto obj = py::reinterpret_borrow< py::object >(array);
+            this->columns.push_back({ obj, {}, {}, 0 });
+        }
+    }
+
+    if (this->split and this->columns.size() != widths.size()) {
+        const auto msg = "read_fdata: expected "
+                       + std::to_string(widths.size())
+                       + " columns, alloc returned "
+                       + std::to_string(this->columns.size());
+        throw std::invalid_argument(msg);
+    }
+
+    this->dst.resize(this->columns.size());
+    this->request();
+    if (this->fixed) {
+        const auto& info = this->columns.front().info;
+        this->allocated_rows = dlisio::detail::out_rows(info, itemsize);
+    }
+}
+
+void fdata_output::rewind() noexcept (true) {
+    for (std::size_t c = 0; c < this->columns.size(); ++c) {
+        const auto& col = this->columns[c];
+        auto* begin = static_cast< unsigned char* >(col.info.ptr);
+        this->dst[c] = begin + this->frames * col.rowsize;
+    }
+}
+
+void fdata_output::request() noexcept (false) {
+    for (auto& col : this->columns) {
+        col.buffer = py::buffer(col.array);
+        col.info = col.buffer.request(true);
+        if (this->split)
+            col.rowsize = col.info.strides[0];
+    }
+    this->rewind();
+}
+
+void fdata_output::resize(std::size_t n) noexcept (false) {
+    if (this->fixed) {
+        const auto msg = "out is too small, has room for "
+                       + std::to_string(this->allocated_rows)
+                       + " frames";
+        throw dlisio::detail::out_too_small(msg);
+    }
+
+    py::gil_scoped_acquire gil;
+    for (auto& col : this->columns) {
+        col.info = py::buffer_info {};
+        col.buffer = py::buffer {};
+        auto shape = py::list(col.array.attr("shape"));
+        shape[0] = n;
+        col.array.attr("resize")(py::tuple(shape));
+    }
+    this->allocated_rows = n;
+    this->request();
+}
+
+py::object fdata_output::result() noexcept (false) {
+    if (this->fixed)
+        return py::int_(this->frames);
+
+    if (this->allocated_rows > this->frames)
+        this->resize(this->frames);
+
+    if (not this->split)
+        return this->columns.front().array;
+
+    py::list arrays;
+    for (const auto& col : this->columns)
+        arrays.append(col.array);
+    return arrays;
+}
+
+std::vector< std::size_t > fdata_output::rowsizes() const noexcept (false) {
+    std::vector< std::size_t > sizes;
+    for (const auto& col : this->columns)
+        sizes.push_back(col.rowsize);
+    return sizes;
+}
+
+/*
+ * Upper bound of the number of frames of frame_size, see min_frame_size, in
+ * records of sizes, or one per record if the sizes are not known or the
+ * frames are not fixed-size.
+ */
+std::size_t bound_frames(std::size_t frame_size,
+                         std::size_t records,
+                         const long long* sizes,
+                         const long long* sizes_end)
+noexcept (true) {
+    if (frame_size == 0 or std::size_t(sizes_end - sizes) != records)
+        return records;
+
+    std::size_t frames = 0;
+    for (auto size = sizes; size != sizes_end; ++size)
+        frames += std::max(*size, 0LL) / frame_size;
+    return frames;
+}
+
+/*
+ * Report a record that can not be read to errorhandler
+ */
+void skip_fdata_record(dl::error_handler& errorhandler,
+                       const dlisio::stream& file,
+                       const std::string& problem,
+                       std::size_t frames)
+noexcept (false) {
+    const auto context = "dlis::read_fdata: reading curves";
+    const auto abs_msg = "Physical tell (end of the record): " +
+                         std::to_string(file.ptell()) + " (dec)";
+    const auto frames_msg =
+        "Processed number of frames: " + std::to_string(frames);
+    const auto debug = abs_msg + ", " + frames_msg;
+    errorhandler.log(dl::error_severity::CRITICAL, context, problem, "",
+                     "Record is skipped", debug);
+}
+
 py::object read_fdata(const char* pre_fmt,
                       const char* fmt,
                       const char* post_fmt,
                       dlisio::stream& file,
                       const std::vector< long long >& indices,
+                      const std::vector< long long >& sizes,
                       std::size_t itemsize,
                       py::object alloc,
-                      dl::error_handler& errorhandler)
+                      dl::error_handler& errorhandler,
+                      bool raw,
+                      const std::vector< bool >& selected,
+                      py::object out,
+                      const std::vector< std::size_t >& widths,
+                      const std::vector< dlisio::stream* >& streams)
 noexcept (false) {
     // TODO: reverse fingerprint to skip bytes ahead-of-time
     /*
@@ -604,28 +1321,71 @@ noexcept (false) {
      * By writing directly into the numpy array as we go, PyObjects are either
      * default-constructed (set to None) by numpy, or properly created (and
      * replaced) here.
+     *
+     * When the sizes of the records are known and the frames are fixed-size,
+     * the number of frames is bounded up front, and the array is allocated
+     * only once. It is shrunk to fit when all the records are read.
+     * Otherwise, start with one row per record and grow as needed.
+     *
+     * With raw, the fixed-size samples are copied as they are on disk, and
+     * with a non-empty selected, only the selected samples are read. See
+     * frame_plan.
+     *
+     * If out is not None, the frames are written to out, which is never
+     * resized, and the number of frames is returned instead of the array.
+     *
+     * If widths is non-empty, the frames are written column by column, with
+     * widths[i] samples in column i. alloc must then return a list of
+     * arrays, one per column, and the list is returned.
+     *
+     * streams are additional, independent streams of the same logical file
+     * as file. If there are any, the records are read in parallel, one
+     * thread per stream (and file).
      */
-    auto allocated_rows = indices.size();
-    auto dstobj = alloc(allocated_rows);
-    auto dstb = py::buffer(dstobj);
-    auto info = dstb.request(true);
-    auto* dst = static_cast< unsigned char* >(info.ptr);
+    const auto plan = frame_plan(fmt, raw, selected, widths);
+    const auto* sizes_end = sizes.data() + sizes.size();
+
+    const auto frame_size = min_frame_size(pre_fmt, fmt, post_fmt);
+    const auto rows = bound_frames(frame_size, indices.size(), sizes.data(),
+                                   sizes_end);
+    fdata_output output(alloc, out, itemsize, rows, widths);
+
+    auto& frames = output.frames;
+    auto& allocated_rows = output.allocated_rows;
+    auto& dst = output.dst;
+    const auto resize = [&](std::size_t n) { output.resize(n); };
+    const auto rewind = [&]() { output.rewind(); };
 
     /*
-     * Resizing is clumsy, because in-place resize (through the method)
-     * requires there to be no references to the underlying data. That means
-     * the buffer-info and buffer must be wiped before resizing takes place,
-     * and then carefully restored to the new memory.
+     * Unless some samples are python objects, decoding is pure C++ and the
+     * GIL is released. It must be released after the python objects above
+     * are created, so that it is re-acquired before they are destroyed.
+     *
+     * Without python objects, the records are split into one contiguous
+     * range per stream, and read in parallel, one thread per stream. The
+     * streams must all be locked before the GIL is released.
      */
-    auto resize = [&](std::size_t n) {
-        info = py::buffer_info {};
-        dstb = py::buffer {};
-        dstobj.attr("resize")(n);
-        allocated_rows = n;
-        dstb = py::buffer(dstobj);
-        info = dstb.request(true);
-        dst = static_cast< unsigned char* >(info.ptr);
-    };
+    std::string projected;
+    for (std::size_t i = 0; fmt[i]; ++i) {
+        if (selected.empty() or selected[i])
+            projected.push_back(fmt[i]);
+    }
+
+    const bool objects = has_object_samples(projected.c_str());
+    const auto threads = objects
+                       ? std::size_t(1)
+                       : std::min(streams.size() + 1, indices.size());
+
+    dlisio::detail::stream_lock lock(file.protocol());
+    std::vector< std::unique_ptr< dlisio::detail::stream_lock > > locks;
+    for (std::size_t k = 1; k < threads; ++k) {
+        const auto* protocol = streams[k - 1]->protocol();
+        locks.emplace_back(new dlisio::detail::stream_lock(protocol));
+    }
+
+    std::unique_ptr< py::gil_scoped_release > nogil;
+    if (not objects)
+        nogil.reset(new py::gil_scoped_release());
 
 
     /*
@@ -638,62 +1398,410 @@ noexcept (false) {
     assert(std::string(pre_fmt) == "");
     assert(std::string(post_fmt) == "");
 
-    std::size_t frames = 0;
-
     const auto handle = [&]( const std::string& problem ) {
-        const auto context = "dlis::read_fdata: reading curves";
-        const auto abs_msg = "Physical tell (end of the record): " +
-                             std::to_string(file.ptell()) + " (dec)";
-        const auto frames_msg =
-            "Processed number of frames: " + std::to_string(frames);
-        const auto debug = abs_msg + ", " + frames_msg;
-        errorhandler.log(dl::error_severity::CRITICAL, context, problem, "",
-                         "Record is skipped", debug);
+        skip_fdata_record(errorhandler, file, problem, frames);
     };
 
-    for (auto i : indices) {
-        /* get record */
-        dl::record record;
+    if (threads < 2) {
+        read_fdata_records(pre_fmt, plan, post_fmt, file,
+                           indices.data(), indices.data() + indices.size(),
+                           dst.data(), frames, allocated_rows, errorhandler,
+                           resize, rewind, handle);
+    } else {
+        /*
+         * The number of frames in a record is not known until it is read, so
+         * the threads can not write directly into the output. Every thread
+         * reads into buffers of its own, which are copied into the output
+         * in order when all the threads are done. Errors are recorded by the
+         * threads, and passed on to the error handler in the same order as
+         * when read by a single thread.
+         */
+        const auto rowsizes = output.rowsizes();
+
+        std::vector< std::size_t > bounds;
+        for (std::size_t k = 0; k <= threads; ++k)
+            bounds.push_back(k * indices.size() / threads);
+
+        std::vector< fdata_part > parts(threads);
+        const auto work = [&](std::size_t k) {
+            auto& stream = k == 0 ? file : *streams[k - 1];
+            const auto first = bounds[k];
+            const auto last  = bounds[k + 1];
+
+            const auto* size_first = sizes_end;
+            const auto* size_last  = sizes_end;
+            if (sizes.size() == indices.size()) {
+                size_first = sizes.data() + first;
+                size_last  = sizes.data() + last;
+            }
+            const auto rows = bound_frames(frame_size, last - first,
+                                           size_first, size_last);
+
+            read_fdata_part(pre_fmt, plan, post_fmt, stream,
+                            indices.data() + first, indices.data() + last,
+                            rowsizes, rows, parts[k]);
+        };
+
+        std::vector< std::thread > workers;
         try {
-            record = dl::extract(file, i, errorhandler);
-        } catch (std::exception& e) {
-            handle(e.what());
-            continue;
+            for (std::size_t k = 1; k < threads; ++k)
+                workers.emplace_back(work, k);
+        } catch (...) {
+            for (auto& worker : workers)
+                worker.join();
+            throw;
+        }
+
+        work(0);
+        for (auto& worker : workers)
+            worker.join();
+
+        nogil.reset();
+
+        std::size_t total = 0;
+        for (const auto& part : parts) {
+            for (const auto& e : part.errors.errors) {
+                auto debug = e.debug;
+                if (e.skipped) {
+                    debug += ", Processed number of frames: "
+                           + std::to_string(total + e.frames);
+                }
+                errorhandler.log(e.severity, e.context, e.problem,
+                                 e.specification, e.action, debug);
+            }
+
+            if (part.failure)
+                std::rethrow_exception(part.failure);
+
+            total += part.frames;
         }
 
-        if (record.isencrypted()) {
-            handle("encrypted FDATA record");
+        if (total > allocated_rows)
+            resize(total);
+
+        py::gil_scoped_release copying;
+        for (const auto& part : parts) {
+            for (std::size_t c = 0; c < dst.size(); ++c) {
+                const auto size = part.frames * rowsizes[c];
+                if (size > 0)
+                    std::memcpy(dst[c], part.columns[c].data(), size);
+                dst[c] += size;
+            }
+        }
+        frames = total;
+    }
+
+    nogil.reset();
+    return output.result();
+}
+
+/*
+ * Read the curves of many frames in a single pass over the file.
+ *
+ * Reading every frame with read_fdata goes through the file once per frame,
+ * as the records of the frames are interleaved. Here, the records of all
+ * the frames are read once, in file order, and every record is decoded into
+ * the output of its frame. The arguments are those of read_fdata, with one
+ * entry per frame, and the list of the curves of every frame is returned.
+ */
+py::list read_fdata_all(const std::vector< std::string >& fmts,
+                        dlisio::stream& file,
+                        const std::vector< std::vector< long long > >& indices,
+                        const std::vector< std::vector< long long > >& sizes,
+                        const std::vector< std::size_t >& itemsizes,
+                        const std::vector< py::object >& allocs,
+                        dl::error_handler& errorhandler,
+                        const std::vector< bool >& raw)
+noexcept (false) {
+    const auto n = fmts.size();
+    if (indices.size()   != n or
+        sizes.size()     != n or
+        itemsizes.size() != n or
+        allocs.size()    != n or
+        raw.size()       != n) {
+        const auto msg = "read_fdata_all: expected arguments for "
+                       + std::to_string(n)
+                       + " frames";
+        throw std::invalid_argument(msg);
+    }
+
+    std::vector< frame_plan > plans;
+    std::vector< fdata_output > outputs;
+    plans.reserve(n);
+    outputs.reserve(n);
+
+    /* (tell, frame) of every record */
+    std::vector< std::pair< long long, std::size_t > > records;
+    bool objects = false;
+    for (std::size_t i = 0; i < n; ++i) {
+        const auto* fmt = fmts[i].c_str();
+        const auto& s = sizes[i];
+        const auto rows = bound_frames(min_frame_size("", fmt, ""),
+                                       indices[i].size(), s.data(),
+                                       s.data() + s.size());
+
+        plans.emplace_back(fmt, raw[i]);
+        outputs.emplace_back(allocs[i], py::none(), itemsizes[i], rows,
+                             std::vector< std::size_t >());
+        objects = objects or has_object_samples(fmt);
+
+        for (auto tell : indices[i])
+            records.emplace_back(tell, i);
+    }
+    std::sort(records.begin(), records.end());
+
+    /* See read_fdata */
+    dlisio::detail::stream_lock lock(file.protocol());
+    std::unique_ptr< py::gil_scoped_release > nogil;
+    if (not objects)
+        nogil.reset(new py::gil_scoped_release());
+
+    for (const auto& record : records) {
+        const auto& plan = plans[record.second];
+        auto& output = outputs[record.second];
+
+        const auto resize = [&](std::size_t rows) { output.resize(rows); };
+        const auto rewind = [&]() { output.rewind(); };
+        const auto handle = [&]( const std::string& problem ) {
+            skip_fdata_record(errorhandler, file, problem, output.frames);
+        };
+
+        read_fdata_records("", plan, "", file,
+                           &record.first, &record.first + 1,
+                           output.dst.data(), output.frames,
+                           output.allocated_rows, errorhandler,
+                           resize, rewind, handle);
+    }
+
+    nogil.reset();
+    py::list curves;
+    for (auto& output : outputs)
+        curves.append(output.result());
+    return curves;
+}
+
+/*
+ * True if samples of f are plain numbers, which can be used as index values
+ */
+bool is_index_sample(const char* f) noexcept (true) {
+    static const char numbers[] = {
+        DLIS_FMT_FSHORT,
+        DLIS_FMT_FSINGL,
+        DLIS_FMT_ISINGL,
+        DLIS_FMT_VSINGL,
+        DLIS_FMT_FDOUBL,
+        DLIS_FMT_SSHORT,
+        DLIS_FMT_SNORM,
+        DLIS_FMT_SLONG,
+        DLIS_FMT_USHORT,
+        DLIS_FMT_UNORM,
+        DLIS_FMT_ULONG,
+        DLIS_FMT_UVARI,
+        DLIS_FMT_ORIGIN,
+        '\0',
+    };
+    return std::strlen(f) == 1 and std::strchr(numbers, *f) != nullptr;
+}
+
+double read_index_sample(const char* f, const char*& ptr, const char* end)
+noexcept (false) {
+    assert_overflow(ptr, end, 1);
+    int src_skip;
+    dlis_packflen(f, ptr, &src_skip, nullptr);
+    assert_overflow(ptr, end, src_skip);
+
+    double value = 0;
+    switch (*f) {
+        case DLIS_FMT_FSHORT: { float x; dlis_fshort(ptr, &x); value = x; break; }
+        case DLIS_FMT_FSINGL: { float x; dlis_fsingl(ptr, &x); value = x; break; }
+        case DLIS_FMT_ISINGL: { float x; dlis_isingl(ptr, &x); value = x; break; }
+        case DLIS_FMT_VSINGL: { float x; dlis_vsingl(ptr, &x); value = x; break; }
+        case DLIS_FMT_FDOUBL: { double x; dlis_fdoubl(ptr, &x); value = x; break; }
+        case DLIS_FMT_SSHORT: { std::int8_t x;  dlis_sshort(ptr, &x); value = x; break; }
+        case DLIS_FMT_SNORM:  { std::int16_t x; dlis_snorm(ptr, &x);  value = x; break; }
+        case DLIS_FMT_SLONG:  { std::int32_t x; dlis_slong(ptr, &x);  value = x; break; }
+        case DLIS_FMT_USHORT: { std::uint8_t x;  dlis_ushort(ptr, &x); value = x; break; }
+        case DLIS_FMT_UNORM:  { std::uint16_t x; dlis_unorm(ptr, &x);  value = x; break; }
+        case DLIS_FMT_ULONG:  { std::uint32_t x; dlis_ulong(ptr, &x);  value = x; break; }
+        case DLIS_FMT_UVARI:
+        case DLIS_FMT_ORIGIN: { std::int32_t x; dlis_uvari(ptr, &x); value = x; break; }
+        default:
+            throw std::invalid_argument("index sample must be a number");
+    }
+
+    ptr += src_skip;
+    return value;
+}
+
+/*
+ * Error handler that ignores everything. read_index_ranges is only a guide
+ * to which records to read, the problems with the records are reported when
+ * they are actually read.
+ */
+struct ignore_errors : public dl::error_handler {
+    void log(const dl::error_severity&, const std::string&,
+             const std::string&, const std::string&,
+             const std::string&, const std::string&)
+        const noexcept (false) override
+    {}
+};
+
+/*
+ * The range [min, max] of the index in the frames of the record body
+ * [ptr, end), where the index is the first sample after pre_fmt in every
+ * frame, and post_fmt is what follows it. Throws if the body is not made up
+ * of whole frames.
+ */
+std::pair< double, double > index_range_of(const char* pre_fmt,
+                                           const char* index_fmt,
+                                           const char* post_fmt,
+                                           const char* ptr,
+                                           const char* end)
+noexcept (false) {
+    auto lo = std::numeric_limits< double >::infinity();
+    auto hi = -lo;
+    while (ptr < end) {
+        int src_skip;
+        dlis_packflen(pre_fmt, ptr, &src_skip, nullptr);
+        assert_overflow(ptr, end, src_skip);
+        ptr += src_skip;
+
+        const auto value = read_index_sample(index_fmt, ptr, end);
+        lo = std::min(lo, value);
+        hi = std::max(hi, value);
+
+        dlis_packflen(post_fmt, ptr, &src_skip, nullptr);
+        assert_overflow(ptr, end, src_skip);
+        ptr += src_skip;
+    }
+    return std::make_pair(lo, hi);
+}
+
+/*
+ * The size of fmt on disk, or 0 if it has variable-size samples
+ */
+int fixed_size(const std::string& fmt) noexcept (true) {
+    int size;
+    const auto err = dlis_pack_size(fmt.c_str(), &size, nullptr);
+    if (err != DLIS_OK) return DLIS_VARIABLE_LENGTH;
+    return size;
+}
+
+/*
+ * The range [min, max] of the index of every record in indices, where the
+ * index is the first sample after pre_fmt in every frame, and post_fmt is
+ * what follows it.
+ *
+ * tails are the tails of the records, as found by findoffsets. When the index
+ * and the samples after it are of fixed size, the last index of a record is
+ * read directly from the end of the last frame, so only the head and tail of
+ * the record is read. The index is assumed to be monotonic within a record,
+ * as required by the DIRECTION of the frame. Records where that is not
+ * possible, or without a known tail, are decoded in full, but only the index
+ * is decoded and all other samples are skipped.
+ *
+ * Records that are empty, broken or encrypted get the range (NaN, NaN).
+ */
+std::vector< std::pair< double, double > >
+read_index_ranges(const char* pre_fmt,
+                  const char* index_fmt,
+                  const char* post_fmt,
+                  dlisio::stream& file,
+                  const std::vector< long long >& indices,
+                  const std::vector< std::pair< long long, long long > >& tails)
+noexcept (false) {
+    if (not is_index_sample(index_fmt)) {
+        const auto msg = "read_index_ranges: invalid index format '" +
+                         std::string(index_fmt) + "'";
+        throw std::invalid_argument(msg);
+    }
+
+    const auto nan = std::numeric_limits< double >::quiet_NaN();
+    std::vector< std::pair< double, double > > ranges(
+        indices.size(), std::make_pair(nan, nan)
+    );
+
+    /*
+     * The OBNAME, the samples before the index and the index itself. Any
+     * longer pre_fmt makes the head read fall back to a full read.
+     */
+    constexpr long long HEAD_SIZE = 262 + 4 + 8;
+    const int index_size = fixed_size(index_fmt);
+    const int tail_size = fixed_size(std::string(index_fmt) + post_fmt);
+    const bool use_tails = tail_size != DLIS_VARIABLE_LENGTH
+                       and tails.size() == indices.size();
+
+    dlisio::detail::stream_lock lock(file.protocol());
+    py::gil_scoped_release nogil;
+
+    ignore_errors errorhandler;
+    dl::record record;
+    std::vector< char > last(index_size);
+    for (std::size_t i = 0; i < indices.size(); ++i) {
+        const auto tell = indices[i];
+        try {
+            dl::extract(file, tell, HEAD_SIZE, record, errorhandler);
+        } catch (const std::exception&) {
             continue;
         }
 
-        const auto* ptr = record.data.data();
-        const auto* end = ptr + record.data.size();
+        if (record.isencrypted()) continue;
+
+        const auto* data = record.data.data();
+        const auto* end = data + record.data.size();
 
-        /* read fingerprint */
         std::int32_t origin;
         std::uint8_t copy;
-        ptr = dlis_obname(ptr, &origin, &copy, nullptr, nullptr);
+        const auto* body = dlis_obname(data, &origin, &copy, nullptr, nullptr);
+        if (body >= end) continue;
 
-        try {
-            read_fdata_record(pre_fmt, fmt, post_fmt, ptr, end, dst, frames,
-                              itemsize, allocated_rows, resize);
-        } catch (std::exception& e) {
-            handle(e.what());
-            /* When failing to write a frame (row) to dst, position of the dst
-             * pointer is left in an undefined state. I.e. it may be left
-             * anywhere within the partially written row. We discard the row
-             * completely by rewinding the dst pointer back to the start of the
-             * row.
-             */
-            dst = static_cast< unsigned char* >(info.ptr) + (frames * itemsize);
+        if (use_tails and tails[i].second >= 0) {
+            try {
+                const auto* ptr = body;
+                int src_skip;
+                dlis_packflen(pre_fmt, ptr, &src_skip, nullptr);
+                assert_overflow(ptr, end, src_skip);
+                ptr += src_skip;
+
+                /*
+                 * The last index must be entirely in the last segment, and not
+                 * before the first index if that is in the same segment
+                 */
+                const auto tail_begin = tails[i].first;
+                const auto last_index = tails[i].second - tail_size;
+                auto first_index = tail_begin;
+                if (tail_begin == tell + DLIS_LRSH_SIZE)
+                    first_index += ptr - data;
+
+                if (last_index >= first_index) {
+                    const auto first = read_index_sample(index_fmt, ptr, end);
+
+                    file.seek(last_index);
+                    const auto nread = file.read(last.data(), index_size);
+                    const auto* lastptr = last.data();
+                    const auto value =
+                        read_index_sample(index_fmt, lastptr, lastptr + nread);
+
+                    ranges[i] = std::make_pair(std::min(first, value),
+                                               std::max(first, value));
+                    continue;
+                }
+            } catch (const std::exception&) {}
         }
-        assert(allocated_rows >= frames);
-    }
 
-    if (allocated_rows > frames)
-        resize(frames);
+        try {
+            record = dl::extract(file, tell, errorhandler);
+            data = record.data.data();
+            end = data + record.data.size();
+            body = dlis_obname(data, &origin, &copy, nullptr, nullptr);
+            const auto range =
+                index_range_of(pre_fmt, index_fmt, post_fmt, body, end);
+            if (range.first <= range.second)
+                ranges[i] = range;
+        } catch (const std::exception&) {}
+    }
 
-    return dstobj;
+    return ranges;
 }
 
 py::bytes read_noform(dlisio::stream& file,
@@ -701,32 +1809,39 @@ py::bytes read_noform(dlisio::stream& file,
                                       dl::error_handler& errorhandler) {
 
     auto noform = std::vector< char > {};
-    for (auto i : indices) {
-        dl::record rec;
-        try {
-            rec = dl::extract(file, i, errorhandler);
-        } catch (const std::exception& e) {
-            const auto context =
-                "dlis::read_noform: Reading raw bytes from record";
-            const auto debug = "Physical tell (end of the record): " +
-                               std::to_string(file.ptell()) + " (dec)";
-            errorhandler.log(dl::error_severity::CRITICAL, context,
-                             e.what(), "", "Data part is skipped", debug);
-            continue;
-        }
 
-        /* read obname */
-        std::int32_t origin;
-        std::uint8_t copy;
-        const auto ptr =
-            dlis_obname(rec.data.data(), &origin, &copy, nullptr, nullptr);
+    {
+        dlisio::detail::stream_lock lock(file.protocol());
+        py::gil_scoped_release nogil;
+        for (auto i : indices) {
+            dl::record rec;
+            try {
+                rec = dl::extract(file, i, errorhandler);
+            } catch (const std::exception& e) {
+                const auto context =
+                    "dlis::read_noform: Reading raw bytes from record";
+                const auto debug = "Physical tell (end of the record): " +
+                                   std::to_string(file.ptell()) + " (dec)";
+                errorhandler.log(dl::error_severity::CRITICAL, context,
+                                 e.what(), "", "Data part is skipped",
+                                 debug);
+                continue;
+            }
 
-        const auto prevsize = noform.size();
-        const std::size_t obname_size = ptr - rec.data.data();
-        const auto record_size = rec.data.size() - obname_size;
+            /* read obname */
+            std::int32_t origin;
+            std::uint8_t copy;
+            const auto* data = rec.data.data();
+            const auto ptr =
+                dlis_obname(data, &origin, &copy, nullptr, nullptr);
 
-        noform.resize( prevsize + record_size );
-        std::memcpy( noform.data() + prevsize, ptr, record_size );
+            const auto prevsize = noform.size();
+            const std::size_t obname_size = ptr - data;
+            const auto record_size = rec.data.size() - obname_size;
+
+            noform.resize( prevsize + record_size );
+            std::memcpy( noform.data() + prevsize, ptr, record_size );
+        }
     }
 
     return py::bytes(noform.data(), noform.size());
@@ -762,6 +1877,175 @@ public:
     }
 };
 
+/*
+ * A native matcher for names as python sees them
+ *
+ * The native matchers compare the bytes of the names, while python compares
+ * the names decoded with the encodings from set_encodings, see decode_str.
+ * For names that are UTF-8 that is the same thing, and the names are
+ * compared as they are, without the GIL. Other names are decoded like python
+ * does. Strings are then compared by their UTF-8 encoding, and names that
+ * cannot be decoded by their bytes. A string never matches a name that
+ * cannot be decoded.
+ */
+template < typename Matcher >
+class decoded_matcher : public Matcher {
+public:
+    bool match(const dl::ident& pattern, const dl::ident& candidate)
+    const noexcept (false) override {
+        const auto& lhs = dl::decay(pattern);
+        const auto& rhs = dl::decay(candidate);
+        if (dl::is_utf8(lhs) and dl::is_utf8(rhs))
+            return Matcher::match(pattern, candidate);
+
+        py::gil_scoped_acquire gil;
+        const auto p = py::reinterpret_steal< py::object >(
+            dlisio::detail::decode_str(lhs)
+        );
+        const auto c = py::reinterpret_steal< py::object >(
+            dlisio::detail::decode_str(rhs)
+        );
+
+        const bool pstr = py::isinstance< py::str >(p);
+        const bool cstr = py::isinstance< py::str >(c);
+        if (pstr != cstr) return false;
+        if (not pstr)     return Matcher::match(pattern, candidate);
+
+        return Matcher::match(dl::ident{ p.cast< std::string >() },
+                              dl::ident{ c.cast< std::string >() });
+    }
+};
+
+/*
+ * A native matcher subclassed in python, that overrides match
+ */
+class overridden_matcher : public dl::matcher {
+public:
+    explicit overridden_matcher(py::function f) : fn(std::move(f)) {}
+
+    bool match(const dl::ident& pattern, const dl::ident& candidate)
+    const noexcept (false) override {
+        py::gil_scoped_acquire gil;
+        return this->fn(pattern, candidate).cast< bool >();
+    }
+
+private:
+    py::function fn;
+};
+
+/*
+ * The matcher for pool::get to use in place of a matcher from python, or
+ * nullptr if the matcher is used as it is. Must be called with the GIL held.
+ */
+std::unique_ptr< dl::matcher > pool_matcher(const dl::matcher& matcher)
+noexcept (false) {
+    const auto* exact = dynamic_cast< const dl::exact_matcher* >(&matcher);
+    if (exact) {
+        auto fn = py::get_override(exact, "match");
+        if (fn) return std::unique_ptr< dl::matcher >(
+            new overridden_matcher(std::move(fn))
+        );
+        return std::unique_ptr< dl::matcher >(
+            new decoded_matcher< dl::exact_matcher >()
+        );
+    }
+
+    const auto* icase = dynamic_cast< const dl::icase_matcher* >(&matcher);
+    if (icase) {
+        auto fn = py::get_override(icase, "match");
+        if (fn) return std::unique_ptr< dl::matcher >(
+            new overridden_matcher(std::move(fn))
+        );
+        return std::unique_ptr< dl::matcher >(
+            new decoded_matcher< dl::icase_matcher >()
+        );
+    }
+
+    return nullptr;
+}
+
+bool calls_python(const dl::matcher& matcher) noexcept (true) {
+    return dynamic_cast< const Pymatcher* >(&matcher)
+        or dynamic_cast< const overridden_matcher* >(&matcher);
+}
+
+/*
+ * dl::pool::get, with the GIL released unless the matcher is implemented in
+ * python. The native matchers, e.g. dl::exact_matcher, then run as pure C++,
+ * and only take the GIL to decode names that are not UTF-8. Error handlers
+ * implemented in python acquire the GIL when they are called.
+ *
+ * The pool parses its object sets on first use, so only one thread at a time
+ * may query it. The pool is locked with the same per-address locks as the
+ * streams.
+ */
+dl::object_vector pool_get(dl::pool& pool,
+                           const std::string& type,
+                           const std::string& name,
+                           const dl::matcher& matcher,
+                           const dl::error_handler& errorhandler)
+noexcept (false) {
+    const auto native = pool_matcher(matcher);
+    const auto& m = native ? *native : matcher;
+
+    dlisio::detail::stream_lock lock(&pool);
+    std::unique_ptr< py::gil_scoped_release > nogil;
+    if (not calls_python(m))
+        nogil.reset(new py::gil_scoped_release());
+
+    return pool.get(type, name, m, errorhandler);
+}
+
+dl::object_vector pool_get_type(dl::pool& pool,
+                                const std::string& type,
+                                const dl::matcher& matcher,
+                                const dl::error_handler& errorhandler)
+noexcept (false) {
+    const auto native = pool_matcher(matcher);
+    const auto& m = native ? *native : matcher;
+
+    dlisio::detail::stream_lock lock(&pool);
+    std::unique_ptr< py::gil_scoped_release > nogil;
+    if (not calls_python(m))
+        nogil.reset(new py::gil_scoped_release());
+
+    return pool.get(type, m, errorhandler);
+}
+
+dl::object_vector pool_get_object(dl::pool& pool,
+                                  const std::string& type,
+                                  const std::string& name,
+                                  std::int32_t origin,
+                                  std::uint8_t copynumber,
+                                  const dl::error_handler& errorhandler)
+noexcept (false) {
+    dl::obname obname;
+    obname.origin = dl::origin{ origin };
+    obname.copy   = dl::ushort{ copynumber };
+    obname.id     = dl::ident{ name };
+
+    decoded_matcher< dl::exact_matcher > matcher;
+    dlisio::detail::stream_lock lock(&pool);
+    py::gil_scoped_release nogil;
+    return pool.get(type, obname, matcher, errorhandler);
+}
+
+/*
+ * match for the native matchers, for use from python
+ *
+ * It is bound as a static method, like exact_matcher.match has always been in
+ * python, so it can be called on the class as well as on instances. As it is
+ * not an override, pool_matcher still picks the native matcher for instances
+ * of subclasses that do not override it.
+ */
+template < typename Matcher >
+bool native_match(const std::string& pattern,
+                  const std::string& candidate)
+noexcept (false) {
+    decoded_matcher< Matcher > matcher;
+    return matcher.match(dl::ident{ pattern }, dl::ident{ candidate });
+}
+
 }
 
 void init_dlis_extension(py::module_ &m) {
@@ -769,14 +2053,20 @@ void init_dlis_extension(py::module_ &m) {
 
     py::bind_vector<std::vector< dl::object_set >>(m, "list(object_set)");
 
-    m.def("open", &dl::open);
+    m.def("open", &dl::open,
+            py::arg("path"),
+            py::arg("offset") = 0,
+            py::arg("mmap")   = false
+    );
     m.def("open_rp66", &dl::open_rp66);
     m.def("open_tif", &dl::open_tapeimage);
 
     m.def( "storage_label", storage_label );
     m.def("fingerprint", fingerprint);
     m.def("read_fdata", read_fdata);
+    m.def("read_fdata_all", read_fdata_all);
     m.def("read_noform", read_noform);
+    m.def("read_index_ranges", read_index_ranges);
 
     /*
      * TODO: support constructor with kwargs
@@ -922,17 +2212,9 @@ void init_dlis_extension(py::module_ &m) {
     py::class_< dl::pool >( m, "pool" )
         .def(py::init< std::vector< dl::object_set> >())
         .def_property_readonly( "types", &dl::pool::types )
-        .def( "get", (dl::object_vector (dl::pool::*) (
-            const std::string&,
-            const std::string&,
-            const dl::matcher&,
-            const dl::error_handler&
-        )) &dl::pool::get )
-        .def( "get", (dl::object_vector (dl::pool::*) (
-            const std::string&,
-            const dl::matcher&,
-            const dl::error_handler&
-        )) &dl::pool::get )
+        .def( "get", pool_get )
+        .def( "get", pool_get_type )
+        .def( "get", pool_get_object )
     ;
 
     py::enum_< dl::representation_code >( m, "dlis_reprc" )
@@ -1009,6 +2291,9 @@ void init_dlis_extension(py::module_ &m) {
     m.def( "extract", [](dlisio::stream& s,
                         const std::vector< long long >& tells,
                         dl::error_handler& errorhandler) {
+        dlisio::detail::stream_lock lock(s.protocol());
+        py::gil_scoped_release nogil;
+
         std::vector< dl::record > recs;
         recs.reserve( tells.size() );
         for (auto tell : tells) {
@@ -1048,20 +2333,47 @@ void init_dlis_extension(py::module_ &m) {
             }
         }
         return objects;
-    });
+    }, py::call_guard< py::gil_scoped_release >());
 
     m.def( "findsul", dl::findsul );
     m.def( "findvrl", dl::findvrl );
-    m.def("findfdata", dl::findfdata);
+    m.def( "findfdata", []( dlisio::stream& file,
+                            const std::vector< long long >& tells,
+                            dl::error_handler& errorhandler ) {
+        dlisio::detail::stream_lock lock(file.protocol());
+        py::gil_scoped_release nogil;
+        return dl::findfdata( file, tells, errorhandler );
+    });
 
     m.def( "findoffsets", []( dlisio::stream& file,
                               dl::error_handler& errorhandler) {
-        const auto ofs = dl::findoffsets( file, errorhandler );
-        return py::make_tuple( ofs.explicits, ofs.implicits, ofs.broken );
+        dl::stream_offsets ofs;
+        {
+            dlisio::detail::stream_lock lock(file.protocol());
+            py::gil_scoped_release nogil;
+            ofs = dl::findoffsets( file, errorhandler );
+        }
+        return py::make_tuple( ofs.explicits,
+                               ofs.implicits,
+                               ofs.broken,
+                               ofs.fdata,
+                               ofs.fdata_sizes,
+                               ofs.fdata_framenos,
+                               ofs.fdata_tails );
     });
 
 
     py::class_< dl::matcher, Pymatcher >( m, "matcher")
         .def(py::init<>())
     ;
+
+    py::class_< dl::exact_matcher, dl::matcher >( m, "exact_matcher" )
+        .def(py::init<>())
+        .def_static("match", native_match< dl::exact_matcher >)
+    ;
+
+    py::class_< dl::icase_matcher, dl::matcher >( m, "icase_matcher" )
+        .def(py::init<>())
+        .def_static("match", native_match< dl::icase_matcher >)
+    ;
 }
@@ -1,3 +1,6 @@
+#include <memory>
+#include <string>
+
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 #include <mpark/variant.hpp>
@@ -449,7 +452,8 @@ noexcept (false) {
     dst += fconf.framesize * ( fconf.samples - 1 );
 }
 
-void read_data_record( const lis::record& src,
+void read_data_record( const char*        ptr,
+                       const char*        end,
                        unsigned char*&    dst,
                        int& frames,
                        indexchannel& index,
@@ -458,10 +462,6 @@ void read_data_record( const lis::record& src,
                        std::function<void (std::size_t)> resize )
 noexcept (false) {
 
-
-    const auto* ptr = src.data.data();
-    const auto* end = ptr + src.data.size();
-
     /* Store the index value
      *
      * In depth recording mode == 1 the index is not recorded as part of the
@@ -493,7 +493,8 @@ py::object read_data_records( lis::iodevice& file,
                               const lis::record_index& idx,
                               const lis::record_info& recinfo,
                               const frameconfig& fconf,
-                              py::object alloc )
+                              py::object alloc,
+                              py::object out )
 noexcept (false) {
     /*
      * TODO: veriy that format string is valid
@@ -517,21 +518,42 @@ noexcept (false) {
      * By writing directly into the numpy array as we go, PyObjects are either
      * default-constructed (set to None) by numpy, or properly created (and
      * replaced) here.
+     *
+     * If out is not None, the frames are written to out, which is never
+     * resized, and the number of frames is returned instead of the array.
+     * Frames are written fconf.samples rows at a time, so only whole
+     * multiples of fconf.samples rows of out are used.
      */
+    const bool fixed = not out.is_none();
+
     auto implicits = idx.implicits_of( recinfo.ltell );
     auto allocated_rows = implicits.size() * fconf.samples;
-    auto dstobj = alloc(allocated_rows);
+    auto dstobj = fixed ? out : alloc(allocated_rows);
     auto dstb = py::buffer(dstobj);
     auto info = dstb.request(true);
     auto* dst = static_cast< unsigned char* >(info.ptr);
+    if (fixed) {
+        const auto rows = dlisio::detail::out_rows(info, fconf.framesize);
+        allocated_rows = rows - (rows % fconf.samples);
+    }
 
     /*
      * Resizing is clumsy, because in-place resize (through the method)
      * requires there to be no references to the underlying data. That means
      * the buffer-info and buffer must be wiped before resizing takes place,
      * and then carefully restored to the new memory.
+     *
+     * Resizing calls into python, so the GIL must be held.
      */
     auto resize = [&](std::size_t n) {
+        if (fixed) {
+            const auto msg = "out is too small, has room for "
+                           + std::to_string(allocated_rows)
+                           + " frames";
+            throw dlisio::detail::out_too_small(msg);
+        }
+
+        py::gil_scoped_acquire gil;
         info = py::buffer_info {};
         dstb = py::buffer {};
         dstobj.attr("resize")(n);
@@ -544,10 +566,38 @@ noexcept (false) {
     int frames = 0;
     auto index = indexchannel();
 
+    /*
+     * Unless some samples are strings (python objects), decoding is pure C++
+     * and the GIL is released. It must be released after the python objects
+     * above are created, so that it is re-acquired before they are destroyed.
+     */
+    const auto has_strings = [](const std::string& fmt) {
+        return fmt.find(LIS_FMT_STRING) != std::string::npos;
+    };
+
+    dlisio::detail::stream_lock lock(file.protocol());
+    std::unique_ptr< py::gil_scoped_release > nogil;
+    if (not has_strings(fconf.fmtstr) and not has_strings(fconf.indexfmt))
+        nogil.reset(new py::gil_scoped_release());
+
     for ( const auto& head : implicits ) {
-        /* get record */
-        auto record = file.read_record( head );
-        read_data_record( record,
+        /*
+         * get record
+         *
+         * When the file is memory-mapped, records that fit in a single PR are
+         * decoded straight from the mapping, without copying them first.
+         */
+        const char* ptr;
+        const char* end;
+        lis::record record;
+        if ( not file.view_record( head, &ptr, &end ) ) {
+            record = file.read_record( head );
+            ptr = record.data.data();
+            end = ptr + record.data.size();
+        }
+
+        read_data_record( ptr,
+                          end,
                           dst,
                           frames,
                           index,
@@ -558,6 +608,10 @@ noexcept (false) {
         assert(allocated_rows >= frames);
     }
 
+    nogil.reset();
+    if (fixed)
+        return py::int_(frames);
+
     if (allocated_rows > frames)
         resize(frames);
 
@@ -657,7 +711,8 @@ void init_lis_extension(py::module_ &m) {
     m.def("openlis", &lis::open,
             py::arg("filepath"),
             py::arg("offset")    = 0,
-            py::arg("tapeimage") = true
+            py::arg("tapeimage") = true,
+            py::arg("mmap")      = false
     );
 
     py::class_< lis::iodevice >( m, "lis_stream" )
@@ -666,7 +721,11 @@ void init_lis_extension(py::module_ &m) {
         })
         .def( "read_record",   &lis::iodevice::read_record )
         .def( "read_records",  &lis::iodevice::read_records )
-        .def( "index_records", &lis::iodevice::index_records )
+        .def( "index_records", []( lis::iodevice& s ) {
+            dlisio::detail::stream_lock lock(s.protocol());
+            py::gil_scoped_release nogil;
+            return s.index_records();
+        })
         .def( "index_record",  &lis::iodevice::index_record )
         .def( "ptell",         &lis::iodevice::ptell )
         .def( "close",         &lis::iodevice::close )
@@ -100,7 +100,7 @@ def curves_metadata(dfsr, sample_rate=None, strict=True):
 
     return dict(zip(uniques, [index] + channels))
 
-def curves(f, dfsr, sample_rate=None, strict=True):
+def curves(f, dfsr, sample_rate=None, strict=True, out=None):
     """ Read curves
 
     Read the curves described by the :ref:`Data Format Specification` Record
@@ -184,12 +184,23 @@ def curves(f, dfsr, sample_rate=None, strict=True):
         this restriction and dlisio will append numerical values (i.e. 0, 1, 2
         ..) to the labels used for column-names in the returned array.
 
+    out : np.ndarray, optional
+        Write the curves to the start of this array instead of allocating a
+        new one, e.g. to reuse the same array for many files, or to write to
+        a np.memmap or shared memory. It must be a contiguous,
+        one-dimensional array with the dtype of the returned curves, and big
+        enough for all the frames.
+
     Returns
     -------
 
     curves : np.ndarray
         Numpy structured ndarray with mnemonics as column names
 
+    count : int
+        If out is given, the number of rows written to out is returned
+        instead
+
     Raises
     ------
 
@@ -202,6 +213,9 @@ def curves(f, dfsr, sample_rate=None, strict=True):
         If the DFSR contains one or more channel where the type of the samples
         is lis::mask
 
+    ValueError
+        If out has the wrong dtype or layout, or is too small
+
     Examples
     --------
 
@@ -269,6 +283,18 @@ def curves(f, dfsr, sample_rate=None, strict=True):
     dtype     = dfsr_dtype(dfsr, sample_rate=sample_rate, strict=strict)
     framesize = dtype.itemsize
 
+    if out is not None:
+        if not isinstance(out, np.ndarray):
+            msg = 'out must be a numpy array, was {}'
+            raise TypeError(msg.format(type(out).__name__))
+
+        if out.dtype != dtype:
+            msg = 'out must have dtype {}, was {}'
+            raise ValueError(msg.format(dtype, out.dtype))
+
+        if out.ndim != 1 or not out.flags['C_CONTIGUOUS']:
+            raise ValueError('out must be a contiguous, one-dimensional array')
+
     config = core.frameconfig(idx, fmt, sample_rate, mode, spacing, framesize)
     alloc  = lambda size: np.empty(shape = size, dtype = dtype)
 
@@ -278,6 +304,7 @@ def curves(f, dfsr, sample_rate=None, strict=True):
         dfsr.info,
         config,
         alloc,
+        out,
     )
 
 
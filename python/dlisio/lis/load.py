@@ -2,7 +2,7 @@ from .. import core
 from .. import common
 from .file import LogicalFile, PhysicalFile, HeaderTrailer
 
-def load(path, error_handler = None):
+def load(path, error_handler = None, mmap = False):
     """ Loads and indexes a LIS file
 
     Load does more than just opening the file. A LIS file has no random access
@@ -46,6 +46,12 @@ def load(path, error_handler = None):
         Defines how load will behave when encountering any errors while
         indexing the file.
 
+    mmap : bool, optional
+        Read the file through a memory-mapping rather than with regular file
+        reads. Data records that fit in a single physical record are decoded
+        straight from the mapping, without being copied first. Defaults to
+        False.
+
     Returns
     -------
 
@@ -79,7 +85,7 @@ def load(path, error_handler = None):
     if not error_handler:
         error_handler = common.ErrorHandler()
 
-    indexer = FileIndexer(path, error_handler)
+    indexer = FileIndexer(path, error_handler, mmap)
     while not indexer.complete:
         try:
             indexer.index_logical_file()
@@ -95,8 +101,9 @@ class FileIndexer:
     Contains all the internal information required to correctly parse logical
     files.
     """
-    def __init__(self, path, error_handler):
+    def __init__(self, path, error_handler, mmap = False):
         self.error_handler = error_handler
+        self.mmap = mmap
         self.path = path
         self.complete = False
 
@@ -110,7 +117,7 @@ class FileIndexer:
         """ Checks whether file is TIFed and adjusts initial offset accordingly
         """
         initial_offset = 0
-        f = core.open(self.path, initial_offset)
+        f = core.open(self.path, initial_offset, self.mmap)
 
         def read_as_tapemark(f):
             try:
@@ -142,7 +149,8 @@ class FileIndexer:
         """ Open a file and index it.
         """
         try:
-            file = core.openlis(self.path, self.offset, self.is_tif)
+            file = core.openlis(self.path, self.offset, self.is_tif,
+                                self.mmap)
         except EOFError:
             self.complete = True
             return
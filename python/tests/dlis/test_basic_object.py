@@ -85,6 +85,35 @@ def test_link_empty_object(tmpdir_factory, merge_files_manyLR):
         # fingerprint fails for default (0, 0, "", "") objref
         assert ref[0] == ("", (0, 0, ""))
 
+def test_getitem_cached(f):
+    f.cache_metadata(True)
+    try:
+        frame = f.object('FRAME', 'FRAME1')
+        channels = frame.channels
+        assert 'CHANNELS' in frame.attribute_cache
+
+        # The cached list is not handed out, so modifying the returned list
+        # does not affect later lookups
+        channels.append(None)
+        assert frame.channels == channels[:-1]
+        assert frame.channels is not frame.channels
+
+        # A changed linkage rule takes effect on the next lookup
+        frame.linkage = dict(frame.linkage)
+        frame.linkage['CHANNELS'] = linkage.obname('FRAME')
+        assert frame.channels == [None, None]
+    finally:
+        f.cache_metadata(True)
+
+def test_getitem_not_cached(f):
+    f.cache_metadata(False)
+    try:
+        frame = f.object('FRAME', 'FRAME1')
+        _ = frame.channels
+        assert frame.attribute_cache == {}
+    finally:
+        f.cache_metadata(True)
+
 
 def test_parse_attribute_scalar():
     res = parsevalue([1], scalar)
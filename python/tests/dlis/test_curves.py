@@ -4,10 +4,12 @@ helper functionality
 """
 import pytest
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-from dlisio import dlis
+from dlisio import dlis, core
 from dlisio.dlis.frame import mkunique
+from dlisio.dlis.utils.fdata import records_of_frames, records_in_range
 
 def load_curves(fpath):
     with dlis.load(fpath) as (f, *_):
@@ -16,15 +18,32 @@ def load_curves(fpath):
         return curves
 
 def test_curves_are_copy(f):
-    # All channel.curves() really does is to slice the full frame array
-    # returned by frame.curves(). Make sure the returned slice is a copy not a
-    # view.  Returning a view makes it impossible to free up any memory from
-    # the original array, hence holding on to way more memory than needed.
+    # channel.curves() must not return a view into a bigger array. Returning
+    # a view makes it impossible to free up any memory from the original
+    # array, hence holding on to way more memory than needed.
 
     channel = f.object('CHANNEL', 'CHANN1')
     curves = channel.curves()
     assert curves.flags['OWNDATA']
 
+def test_channel_curves(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    curves = frame.curves()
+    for channel in frame.channels:
+        curve = channel.curves()
+        assert curve.flags['C_CONTIGUOUS']
+        assert curve.flags['WRITEABLE']
+        assert curve.shape == curves[channel.fingerprint].shape
+        np.testing.assert_array_equal(curve, curves[channel.fingerprint])
+
+def test_channel_curves_all_reprcodes():
+    fpath = 'data/chap4-7/iflr/all-reprcodes.dlis'
+    with dlis.load(fpath) as (f, *_):
+        frame = f.object('FRAME', 'FRAME-REPRCODE', 10, 0)
+        curves = frame.curves()
+        for channel in frame.channels:
+            assert channel.curves()[0] == curves[0][channel.fingerprint]
+
 def test_curves_values(f):
     frame = f.object('FRAME', 'FRAME1', 10, 0)
     curves = frame.curves()
@@ -60,6 +79,575 @@ def test_curves_values(f):
     np.testing.assert_array_equal(curves['CHANN2'][2], val)
     np.testing.assert_array_equal(curves[2]['CHANN2'], val)
 
+def test_curves_in_threads(fpath):
+    # The GIL is released while curves are read. Reading concurrently, also
+    # from the same logical file, must give the same result as reading
+    # sequentially
+    with dlis.load(fpath) as (f, *_):
+        frame = f.object('FRAME', 'FRAME1', 10, 0)
+        expected = frame.curves()
+
+        with ThreadPoolExecutor(max_workers = 4) as executor:
+            futures = [executor.submit(frame.curves) for _ in range(16)]
+            results = [future.result() for future in futures]
+
+    for curves in results:
+        np.testing.assert_array_equal(curves, expected)
+
+def test_curves_mmap(fpath):
+    with dlis.load(fpath) as (f, *_):
+        frame = f.object('FRAME', 'FRAME1', 10, 0)
+        expected = frame.curves()
+
+    with dlis.load(fpath, mmap=True) as (f, *_):
+        frame = f.object('FRAME', 'FRAME1', 10, 0)
+        np.testing.assert_array_equal(frame.curves(), expected)
+
+@pytest.mark.parametrize('fpath', [
+    'data/tif/layout/fdata-aligned.dlis',
+    'data/tif/layout/fdata-disaligned.dlis',
+])
+def test_curves_mmap_tif(fpath):
+    # Records split by tapemarks are not consecutive on disk, and can not be
+    # decoded straight from the mapping
+    with dlis.load(fpath) as (f, *_):
+        frame = f.object('FRAME', 'FRAME-REPRCODE', 10, 0)
+        expected = frame.curves()
+
+    with dlis.load(fpath, mmap=True) as (f, *_):
+        frame = f.object('FRAME', 'FRAME-REPRCODE', 10, 0)
+        np.testing.assert_array_equal(frame.curves(), expected)
+
+def test_curves_presized(fpath):
+    # The size of every fdata record is recorded when indexing, and used to
+    # size the curves up front. Bad sizes must never give wrong curves
+    with dlis.load(fpath) as (f, *_):
+        assert f.fdata_sizes.keys() == f.fdata_index.keys()
+        for key, sizes in f.fdata_sizes.items():
+            assert len(sizes) == len(f.fdata_index[key])
+            assert all(size > 0 for size in sizes)
+
+        frame = f.object('FRAME', 'FRAME1', 10, 0)
+        expected = frame.curves()
+
+        f.fdata_sizes = { k : [0] * len(v) for k, v in f.fdata_sizes.items() }
+        np.testing.assert_array_equal(frame.curves(), expected)
+
+        f.fdata_sizes = {}
+        np.testing.assert_array_equal(frame.curves(), expected)
+
+@pytest.mark.parametrize('start, stop', [
+    (None, None),
+    (2,    None),
+    (None, 3),
+    (2,    4),
+    (3,    3),
+    (0,    2),
+    (10,   20),
+])
+def test_curves_frames(fpath, start, stop):
+    with dlis.load(fpath) as (f, *_):
+        frame = f.object('FRAME', 'FRAME1', 10, 0)
+        curves = frame.curves()
+        framenos = f.fdata_framenos[frame.fingerprint]
+        assert len(framenos) == len(f.fdata_index[frame.fingerprint])
+
+        mask = np.ones(len(curves), dtype=bool)
+        if start is not None: mask &= curves['FRAMENO'] >= start
+        if stop  is not None: mask &= curves['FRAMENO'] < stop
+
+        selected = frame.curves(frames=slice(start, stop))
+        np.testing.assert_array_equal(selected, curves[mask])
+
+def test_curves_frames_out_of_order():
+    # Records are not in FRAMENO order, so every record must be read
+    fpath = 'data/chap4-7/iflr/out-of-order-framenos-two-frames-multifdata.dlis'
+    with dlis.load(fpath) as (f, *_):
+        frame = f.object('FRAME', 'FRAME-REPRCODE', 10, 0)
+        curves = frame.curves()
+        selected = frame.curves(frames=slice(None, 2))
+        np.testing.assert_array_equal(selected, curves[curves['FRAMENO'] < 2])
+        np.testing.assert_array_equal(selected['FRAMENO'], [1])
+
+def test_curves_frames_invalid(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    with pytest.raises(ValueError):
+        _ = frame.curves(frames=slice(1, 10, 2))
+
+    with pytest.raises(TypeError):
+        _ = frame.curves(frames=[1, 2])
+
+def test_records_of_frames():
+    framenos = [1, 11, 21, 31]
+    assert records_of_frames(framenos, 4, None, None) == (0, 4)
+    assert records_of_frames(framenos, 4, 1,    11)   == (0, 1)
+    assert records_of_frames(framenos, 4, 5,    15)   == (0, 2)
+    assert records_of_frames(framenos, 4, 11,   12)   == (0, 2)
+    assert records_of_frames(framenos, 4, 25,   None) == (2, 4)
+    assert records_of_frames(framenos, 4, 40,   50)   == (3, 4)
+    assert records_of_frames(framenos, 4, 5,    5)    == (0, 0)
+
+    # Unknown or unordered frame numbers, all records must be read
+    assert records_of_frames([1, -1, 21], 3, 25, None) == (0, 3)
+    assert records_of_frames([21, 1, 11], 3, 25, None) == (0, 3)
+    assert records_of_frames([], 3, 25, None)          == (0, 3)
+
+def test_curves_index_range():
+    fpath = 'data/206_05a-_3_DWL_DWL_WIRE_258276498.DLIS'
+    with dlis.load(fpath) as (f,):
+        frames = [x for x in f.frames if x.index != 'FRAMENO']
+        assert len(frames) > 0
+
+        for frame in frames:
+            curves = frame.curves()
+            index = curves[curves.dtype.names[1]]
+            if len(index) == 0: continue
+
+            lo, hi = np.quantile(index, [0.3, 0.6])
+            expected = curves[(index >= lo) & (index <= hi)]
+
+            selected = frame.curves(index_range=(lo, hi))
+            np.testing.assert_array_equal(selected, expected)
+
+            # The order of the range does not matter, e.g. for frames with
+            # decreasing index
+            selected = frame.curves(index_range=(hi, lo))
+            np.testing.assert_array_equal(selected, expected)
+
+            ranges = f.fdata_zones[frame.fingerprint]
+            assert len(ranges) == len(f.fdata_index[frame.fingerprint])
+
+def test_index_ranges_from_tails():
+    # The ranges found from the first and last frame of every record are the
+    # same as when every frame is decoded
+    fpath = 'data/206_05a-_3_DWL_DWL_WIRE_258276498.DLIS'
+    with dlis.load(fpath) as (f,):
+        frames = [x for x in f.frames if x.index != 'FRAMENO']
+        assert len(frames) > 0
+
+        for frame in frames:
+            indices = f.fdata_index[frame.fingerprint]
+            tails = f.fdata_tails[frame.fingerprint]
+            assert len(tails) == len(indices)
+            assert all(end >= begin for begin, end in tails)
+
+            fmt = frame.fmtstr()
+            args = ('i', fmt[1], fmt[2:], f.file, indices)
+            full = core.read_index_ranges(*args, [])
+            np.testing.assert_array_equal(
+                core.read_index_ranges(*args, tails),
+                full
+            )
+
+def test_curves_index_range_frameno():
+    # Without an index channel, the range is a range of frame numbers
+    fpath = 'data/chap4-7/iflr/out-of-order-framenos-two-frames-multifdata.dlis'
+    with dlis.load(fpath) as (f, *_):
+        frame = f.object('FRAME', 'FRAME-REPRCODE', 10, 0)
+        assert frame.index_type is None
+        curves = frame.curves()
+        selected = frame.curves(index_range=(2, 3))
+        expected = curves[(curves['FRAMENO'] >= 2) & (curves['FRAMENO'] <= 3)]
+        np.testing.assert_array_equal(selected, expected)
+
+def test_curves_index_range_not_scalar(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    with pytest.raises(ValueError) as exc:
+        _ = frame.curves(index_range=(1, 2))
+    assert 'not scalar' in str(exc.value)
+
+    with pytest.raises(ValueError) as exc:
+        _ = frame.curves(frames=slice(1, 2), index_range=(1, 2))
+
+def test_records_in_range():
+    # Records with unknown ranges are always read
+    ranges = np.array([
+        [1,      10],
+        [11,     20],
+        [np.nan, np.nan],
+        [21,     30],
+    ])
+
+    assert records_in_range(ranges, 0,  100) == [0, 1, 2, 3]
+    assert records_in_range(ranges, 5,  12)  == [0, 1, 2]
+    assert records_in_range(ranges, 20, 21)  == [1, 2, 3]
+    assert records_in_range(ranges, 40, 50)  == [2]
+
+def test_curves_channels(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    curves = frame.curves()
+
+    selected = frame.curves(channels=['CHANN2'])
+    assert selected.dtype.names == ('FRAMENO', 'CHANN2')
+    np.testing.assert_array_equal(selected['FRAMENO'], curves['FRAMENO'])
+    np.testing.assert_array_equal(selected['CHANN2'], curves['CHANN2'])
+
+    channel = f.object('CHANNEL', 'CHANN1')
+    selected = frame.curves(channels=[channel])
+    assert selected.dtype.names == ('FRAMENO', 'CHANN1')
+    np.testing.assert_array_equal(selected['CHANN1'], curves['CHANN1'])
+
+    selected = frame.curves(channels=[])
+    assert selected.dtype.names == ('FRAMENO',)
+    np.testing.assert_array_equal(selected['FRAMENO'], curves['FRAMENO'])
+
+def test_curves_channels_all_reprcodes():
+    # Skipped columns of all types, including variable-length and object
+    # samples, must be stepped over correctly
+    fpath = 'data/chap4-7/iflr/all-reprcodes.dlis'
+    with dlis.load(fpath) as (f, *_):
+        frame = f.object('FRAME', 'FRAME-REPRCODE', 10, 0)
+        curves = frame.curves()
+        for channel in frame.channels:
+            selected = frame.curves(channels=[channel.name])
+            assert selected.dtype.names == ('FRAMENO', channel.name)
+            assert selected[0][1] == curves[0][channel.name]
+
+        names = [x.name for x in frame.channels[18:23]]
+        selected = frame.curves(channels=names)
+        assert selected.dtype.names == tuple(['FRAMENO'] + names)
+        for name in names:
+            assert selected[0][name] == curves[0][name]
+
+def test_curves_channels_index_range():
+    fpath = 'data/206_05a-_3_DWL_DWL_WIRE_258276498.DLIS'
+    with dlis.load(fpath) as (f,):
+        frames = [x for x in f.frames if x.index != 'FRAMENO']
+        for frame in frames:
+            if len(frame.channels) < 2: continue
+            curves = frame.curves()
+            index = curves[curves.dtype.names[1]]
+            if len(index) == 0: continue
+
+            lo, hi = np.quantile(index, [0.3, 0.6])
+            expected = curves[(index >= lo) & (index <= hi)]
+
+            # The index is used for filtering, but not returned unless asked
+            name = curves.dtype.names[2]
+            selected = frame.curves(index_range=(lo, hi), channels=[name])
+            assert selected.dtype.names == ('FRAMENO', name)
+            np.testing.assert_array_equal(selected[name], expected[name])
+
+def test_curves_channels_invalid(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    with pytest.raises(ValueError) as exc:
+        _ = frame.curves(channels=['NOT-A-CHANNEL'])
+    assert 'not a channel' in str(exc.value)
+
+    channel = f.object('CHANNEL', 'CHANN3', 10, 0)
+    with pytest.raises(ValueError):
+        _ = frame.curves(channels=[channel])
+
+def test_curves_columns(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    curves = frame.curves()
+    columns = frame.curves(layout='columns')
+
+    assert list(columns.keys()) == list(curves.dtype.names)
+    for name, column in columns.items():
+        assert column.flags['C_CONTIGUOUS']
+        assert column.dtype == curves.dtype[name].base
+        np.testing.assert_array_equal(column, curves[name])
+
+    columns = frame.curves(channels=['CHANN2'], frames=slice(2, None),
+                           layout='columns')
+    selected = curves[curves['FRAMENO'] >= 2]
+    assert list(columns.keys()) == ['FRAMENO', 'CHANN2']
+    np.testing.assert_array_equal(columns['FRAMENO'], selected['FRAMENO'])
+    np.testing.assert_array_equal(columns['CHANN2'], selected['CHANN2'])
+
+def test_curves_columns_all_reprcodes():
+    fpath = 'data/chap4-7/iflr/all-reprcodes.dlis'
+    with dlis.load(fpath) as (f, *_):
+        frame = f.object('FRAME', 'FRAME-REPRCODE', 10, 0)
+        curves = frame.curves()
+        columns = frame.curves(layout='columns')
+        assert list(columns.keys()) == list(curves.dtype.names)
+        for name in curves.dtype.names:
+            assert columns[name][0] == curves[0][name]
+
+def test_curves_columns_invalid(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    with pytest.raises(ValueError):
+        _ = frame.curves(layout='diagonal')
+
+    out = np.zeros(10, dtype=frame.dtype())
+    with pytest.raises(ValueError):
+        _ = frame.curves(layout='columns', out=out)
+
+@pytest.mark.parametrize('workers', [1, 2, 4, 16])
+def test_curves_workers(f, workers):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    curves = frame.curves()
+    np.testing.assert_array_equal(frame.curves(workers=workers), curves)
+
+    columns = frame.curves(layout='columns', workers=workers)
+    for name, column in columns.items():
+        np.testing.assert_array_equal(column, curves[name])
+
+def test_curves_workers_many_records():
+    fpath = 'data/206_05a-_3_DWL_DWL_WIRE_258276498.DLIS'
+    with dlis.load(fpath) as (f,):
+        for frame in f.frames:
+            curves = frame.curves()
+            np.testing.assert_array_equal(frame.curves(workers=3), curves)
+
+            channels = [frame.channels[-1]]
+            expected = frame.curves(channels=channels)
+            selected = frame.curves(channels=channels, workers=3)
+            np.testing.assert_array_equal(selected, expected)
+
+            out = np.zeros(len(curves), dtype=frame.dtype())
+            assert frame.curves(out=out, workers=3) == len(curves)
+            np.testing.assert_array_equal(out, curves)
+
+        assert len(f.worker_streams) == 2
+
+def test_curves_workers_invalid(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    with pytest.raises(ValueError):
+        _ = frame.curves(workers=0)
+
+    out = np.zeros(1, dtype=frame.dtype())
+    with pytest.raises(ValueError):
+        _ = frame.curves(out=out, workers=2)
+
+def test_curves_all(f):
+    curves = f.curves_all()
+    assert len(curves) == len(f.frames)
+    for frame in f.frames:
+        expected = frame.curves()
+        np.testing.assert_array_equal(curves[frame.fingerprint], expected)
+        assert curves[frame.fingerprint].dtype == expected.dtype
+
+def test_curves_all_many_frames():
+    fpath = 'data/206_05a-_3_DWL_DWL_WIRE_258276498.DLIS'
+    with dlis.load(fpath) as (f,):
+        curves = f.curves_all()
+        assert len(curves) == len(f.frames)
+        for frame in f.frames:
+            expected = frame.curves()
+            np.testing.assert_array_equal(curves[frame.fingerprint], expected)
+
+def test_curves_all_reprcodes():
+    fpath = 'data/chap4-7/iflr/all-reprcodes.dlis'
+    with dlis.load(fpath) as (f, *_):
+        frame = f.object('FRAME', 'FRAME-REPRCODE', 10, 0)
+        curves = f.curves_all()[frame.fingerprint]
+        expected = frame.curves()
+        for name in expected.dtype.names:
+            assert curves[0][name] == expected[0][name]
+
+def test_curves_cache(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    channel = f.object('CHANNEL', 'CHANN1')
+    expected = frame.curves()
+
+    cache = f.cache_curves(1024 * 1024)
+    try:
+        first = frame.curves()
+        second = frame.curves()
+        assert first is second
+        assert not second.flags['WRITEABLE']
+        np.testing.assert_array_equal(second, expected)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # Channel.curves is served from the cached frame, and is a copy
+        curves = channel.curves()
+        assert (cache.hits, cache.misses) == (2, 1)
+        assert curves.flags['OWNDATA'] and curves.flags['WRITEABLE']
+
+        # Different arguments are different entries
+        selected = frame.curves(channels=['CHANN2'])
+        assert (cache.hits, cache.misses) == (2, 2)
+        assert frame.curves(channels=['CHANN2']) is selected
+
+        columns = frame.curves(layout='columns')
+        columns['FRAMENO'] = None
+        assert frame.curves(layout='columns')['FRAMENO'] is not None
+
+        # Curves read into out are not cached
+        out = np.zeros(len(expected), dtype=frame.dtype())
+        assert frame.curves(out=out) == len(expected)
+        assert (cache.hits, cache.misses) == (4, 3)
+    finally:
+        f.cache_curves(None)
+
+    assert frame.curves().flags['WRITEABLE']
+
+def test_curves_cache_eviction():
+    cache = dlis.utils.CurveCache(100)
+    a, b, c = (np.zeros(40, dtype=np.uint8) for _ in range(3))
+    cache.put('a', a)
+    cache.put('b', b)
+    assert cache.get('a') is a
+    cache.put('c', c)
+    assert cache.nbytes == 80
+    assert cache.get('b') is None
+    assert cache.get('a') is a
+    assert cache.get('c') is c
+
+    # Bigger than the budget, never cached
+    d = np.zeros(101, dtype=np.uint8)
+    assert cache.put('d', d) is d
+    assert d.flags['WRITEABLE']
+    assert cache.get('d') is None
+    assert (cache.hits, cache.misses) == (3, 2)
+
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+    with pytest.raises(ValueError):
+        _ = dlis.utils.CurveCache(-1)
+
+def test_curves_out(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    curves = frame.curves()
+
+    out = np.zeros(len(curves) + 2, dtype = frame.dtype())
+    assert frame.curves(out=out) == len(curves)
+    np.testing.assert_array_equal(out[:len(curves)], curves)
+
+    # Reusing the array overwrites it from the start
+    out[:] = np.zeros(1, dtype = frame.dtype())
+    n = frame.curves(frames=slice(2, None), out=out)
+    np.testing.assert_array_equal(out[:n], curves[curves['FRAMENO'] >= 2])
+
+    selected = frame.curves(channels=['CHANN2'])
+    out = np.zeros(len(curves), dtype = selected.dtype)
+    assert frame.curves(channels=['CHANN2'], out=out) == len(selected)
+    np.testing.assert_array_equal(out, selected)
+
+def test_curves_out_memmap(f, tmpdir):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    curves = frame.curves()
+
+    path = str(tmpdir.join('curves.npy'))
+    out = np.lib.format.open_memmap(path, mode = 'w+',
+                                    dtype = frame.dtype(),
+                                    shape = (len(curves),))
+    assert frame.curves(out=out) == len(curves)
+    out.flush()
+    np.testing.assert_array_equal(np.load(path), curves)
+
+def test_curves_out_invalid(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    curves = frame.curves()
+
+    with pytest.raises(ValueError) as exc:
+        _ = frame.curves(out=np.zeros(len(curves) - 1, dtype=frame.dtype()))
+    assert 'too small' in str(exc.value)
+
+    with pytest.raises(ValueError):
+        _ = frame.curves(out=np.zeros(len(curves), dtype='f4'))
+
+    with pytest.raises(ValueError):
+        out = np.zeros(2 * len(curves), dtype=frame.dtype())
+        _ = frame.curves(out=out[::2])
+
+    with pytest.raises(TypeError):
+        _ = frame.curves(out=[])
+
+@pytest.mark.parametrize('chunk_frames', [1, 3, 4, 1000])
+def test_iter_curves(f, chunk_frames):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    curves = frame.curves()
+
+    chunks = [x.copy() for x in frame.iter_curves(chunk_frames=chunk_frames)]
+    assert all(len(x) == chunk_frames for x in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= chunk_frames
+    np.testing.assert_array_equal(np.concatenate(chunks), curves)
+
+def test_iter_curves_multiple_frames_per_record():
+    fpath = 'data/chap4-7/iflr/multidimensions-multifdata.dlis'
+    with dlis.load(fpath) as (f, *_):
+        for frame in f.frames:
+            curves = frame.curves()
+            chunks = [x.copy() for x in frame.iter_curves(chunk_frames=2)]
+            if len(curves) == 0:
+                assert chunks == []
+                continue
+            np.testing.assert_array_equal(np.concatenate(chunks), curves)
+
+def test_iter_curves_bounded_decode(tmpdir, merge_files_manyLR, monkeypatch):
+    # Records of three frames each, made from the frames of FRAME1
+    frames = []
+    for i in (1, 2, 3):
+        fpath = 'data/chap4-7/eflr/fdata-frame1-{}.dlis.part'.format(i)
+        with open(fpath, 'rb') as fd:
+            part = fd.read()
+        # LRS header and obname, then a single frame
+        header, frame = part[:13], bytearray(part[13:])
+        frames.append(frame)
+
+    content = [
+        'data/chap4-7/eflr/envelope.dlis.part',
+        'data/chap4-7/eflr/file-header.dlis.part',
+        'data/chap4-7/eflr/origin.dlis.part',
+        'data/chap4-7/eflr/channel.dlis.part',
+        'data/chap4-7/eflr/frame.dlis.part',
+    ]
+    frameno = 1
+    for i in range(4):
+        record = bytearray(header)
+        for frame in frames:
+            frame[0] = frameno
+            record += frame
+            frameno += 1
+
+        part = str(tmpdir.join('fdata-{}.dlis.part'.format(i)))
+        with open(part, 'wb') as fd:
+            fd.write(record)
+        content.append(part)
+
+    fpath = str(tmpdir.join('many-frames-per-record.dlis'))
+    merge_files_manyLR(fpath, content)
+
+    decoded = []
+    decode = dlis.utils.fdata.decode
+    def counting_decode(*args, **kwargs):
+        curves = decode(*args, **kwargs)
+        decoded.append(len(curves))
+        return curves
+    monkeypatch.setattr(dlis.utils.fdata, 'decode', counting_decode)
+
+    with dlis.load(fpath) as (f, *_):
+        frame = f.object('FRAME', 'FRAME1', 10, 0)
+        curves = frame.curves()
+        assert len(curves) == 12
+
+        # Every decode holds at most chunk_frames frames
+        del decoded[:]
+        chunks = [x.copy() for x in frame.iter_curves(chunk_frames=6)]
+        assert decoded == [6, 6]
+        np.testing.assert_array_equal(np.concatenate(chunks), curves)
+
+        del decoded[:]
+        chunks = [x.copy() for x in frame.iter_curves(chunk_frames=4)]
+        assert decoded == [3, 3, 3, 3]
+        np.testing.assert_array_equal(np.concatenate(chunks), curves)
+
+        # Unless a single record holds more
+        del decoded[:]
+        chunks = [x.copy() for x in frame.iter_curves(chunk_frames=2)]
+        assert decoded == [3, 3, 3, 3]
+        np.testing.assert_array_equal(np.concatenate(chunks), curves)
+
+def test_iter_curves_channels(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    curves = frame.curves(channels=['CHANN2'])
+    chunks = [x.copy() for x in frame.iter_curves(chunk_frames=3,
+                                                  channels=['CHANN2'])]
+    np.testing.assert_array_equal(np.concatenate(chunks), curves)
+
+def test_iter_curves_invalid(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    with pytest.raises(ValueError):
+        _ = frame.iter_curves(chunk_frames=0)
+
+    with pytest.raises(ValueError):
+        _ = frame.iter_curves(channels=['NOT-A-CHANNEL'])
+
 def test_various_fdata_in_one_iflr():
     fpath = 'data/chap4-7/iflr/various-fdata-in-one-iflr.dlis'
 
@@ -359,6 +947,20 @@ def test_channels_with_same_id(assert_info):
         assert ch1.frame == fr1
         assert ch2.frame == fr2
 
+def test_channel_frame_index(f):
+    frame = f.object('FRAME', 'FRAME1', 10, 0)
+    for channel in frame.channels:
+        assert channel.frame == frame
+    assert f.store.owners is not None
+
+    # The index is dropped with the metadata cache
+    f.cache_metadata(False)
+    assert f.store.owners is None
+    channel = f.object('CHANNEL', 'CHANN1', 10, 0)
+    assert channel.frame == frame
+    assert f.store.owners is None
+    f.cache_metadata(True)
+
 def test_channel_in_multiple_frames(assert_info):
     fpath = "data/chap4-7/eflr/frames-and-channels/1-channel-2-frames.dlis"
     with dlis.load(fpath) as (f, *_):
@@ -381,6 +983,26 @@ def test_channel_missing():
         msg = "Channel dlisio.core.obname(id='TDEP', origin=0, copynum=0) not found"
         assert msg in str(exc.value)
 
+def test_channel_missing_selection():
+    # Channels that can not be resolved are None in frame.channels, and must
+    # be skipped when selecting channels
+    fpath = "data/chap4-7/eflr/frames-and-channels/channel-missing.dlis"
+    with dlis.load(fpath) as (f, *_):
+        fr = f.object("FRAME", "MAINFRAME")
+        assert fr.channels[1] is None
+
+        chosen = dlis.utils.fdata.selection(fr, [fr.channels[0]])
+        assert chosen == [True, False, False]
+
+        with pytest.raises(ValueError) as exc:
+            _ = dlis.utils.fdata.selection(fr, ['TDEP'])
+        assert "TDEP is not a channel in" in str(exc.value)
+
+        with pytest.raises(ValueError) as exc:
+            _ = fr.curves(channels=[fr.channels[0]])
+        msg = "Channel dlisio.core.obname(id='TDEP', origin=0, copynum=0) not found"
+        assert msg in str(exc.value)
+
 def test_channel_duplicated_in_frame(assert_info):
     fpath = "data/chap4-7/eflr/frames-and-channels/duplicated.dlis"
     with dlis.load(fpath) as (f, *_):
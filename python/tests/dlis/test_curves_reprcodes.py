@@ -409,3 +409,40 @@ def test_fmt_broken(fpath):
     with pytest.raises(RuntimeError) as exc:
         _ = load_curves(fpath)
     assert "fmtstr would read past end" in str(exc.value)
+
+def test_fixedwidth_conversions():
+    # Frames of fixed-size samples are read as they are on disk, and the
+    # samples numpy can't read are converted afterwards
+    from dlisio.dlis.utils import fshort, isingl, vsingl
+
+    raw = np.frombuffer(b'\x40\x01\x80\x00\x00\x00', dtype = '>u2')
+    np.testing.assert_array_equal(fshort(raw), [1.0, -1.0, 0.0])
+
+    raw = np.frombuffer(b'\xc2\x76\xa0\x00\x00\x00\x00\x00', dtype = '>u4')
+    np.testing.assert_array_equal(isingl(raw), [-118.625, 0.0])
+
+    raw = np.frombuffer(b'\x00\x3f\x00\x00'
+                        b'\x00\x00\x00\x00'
+                        b'\x00\x80\x00\x00', dtype = '<u4')
+    np.testing.assert_array_equal(vsingl(raw), [0.125, 0.0, np.nan])
+
+def test_fixedwidth_raw_dtype():
+    from dlisio.dlis.utils import fixedwidth, raw_dtype
+
+    assert fixedwidth('iffxV')
+    assert not fixedwidth('i')
+    assert not fixedwidth('ifS')
+    assert not fixedwidth('ifq')
+
+    dtype = np.dtype({
+        'names'   : ['FRAMENO', 'A', 'B'],
+        'formats' : ['i4', ('f4', (2,)), 'u2'],
+        'titles'  : [None, 'T.A', 'T.B'],
+    })
+    raw = raw_dtype(dtype, 'iffU')
+    assert raw.names == dtype.names
+    assert raw.fields['FRAMENO'][0] == np.dtype('i4')
+    assert raw.fields['A'][0] == np.dtype(('>f4', (2,)))
+    assert raw.fields['B'][0] == np.dtype('>u2')
+    assert raw.fields['T.A'] == raw.fields['A']
+    assert raw.itemsize == 4 + 8 + 2
@@ -31,6 +31,22 @@ def test_string_latin1_encoding_works(fpath):
     finally:
         dlisio.common.set_encodings(prev_encodings)
 
+def test_string_encoding_change_cached_object(fpath):
+    prev_encodings = dlisio.common.get_encodings()
+    try:
+        dlisio.common.set_encodings([])
+        with dlis.load(fpath) as (f, *_):
+            channel = f.object('CHANNEL', 'CHANN1', 10, 0)
+            with pytest.warns(UnicodeWarning):
+                assert channel.units == b'custom unit\xb0'
+
+            # The attribute is decoded again with the new encodings
+            dlisio.common.set_encodings(['latin1'])
+            assert channel.units == "custom unit°"
+            assert f.object('CHANNEL', 'CHANN1', 10, 0).units == "custom unit°"
+    finally:
+        dlisio.common.set_encodings(prev_encodings)
+
 
 @pytest.mark.future_test_attributes
 def test_broken_utf8_value(tmpdir, merge_files_oneLR):
@@ -244,6 +260,45 @@ def test_access_to_object_with_non_utf8_name(tmpdir, merge_files_oneLR):
         dlisio.common.set_encodings(prev_encodings)
         f.close()
 
+def test_access_to_object_with_non_utf8_fullname(tmpdir, merge_files_oneLR):
+    # Like above, but with origin and copynumber, which without caching are
+    # looked up directly in the pool
+
+    path = os.path.join(str(tmpdir), 'broken_utf8_object_name.dlis')
+    content = [
+        'data/chap3/start.dlis.part',
+        'data/chap3/template/default.dlis.part',
+        'data/chap3/object/broken-utf8-object.dlis.part',
+    ]
+    merge_files_oneLR(path, content)
+
+    prev_encodings = dlisio.common.get_encodings()
+    dlisio.common.set_encodings([])
+
+    try:
+        f, = dlis.load(path)
+        f.cache_metadata(False)
+
+        with pytest.raises(ValueError):
+            with pytest.warns(UnicodeWarning):
+                _ = f.object('VERY_MUCH_TESTY_SET', 'КАДР', 12, 0)
+
+        with pytest.warns(UnicodeWarning):
+            obj = f.object('VERY_MUCH_TESTY_SET', b'\xeb\xe1\xe4\xf2', 12, 0)
+
+        assert obj.name == b'\xeb\xe1\xe4\xf2'
+
+        dlisio.common.set_encodings(['koi8_r'])
+        obj = f.object('VERY_MUCH_TESTY_SET', 'КАДР', 12, 0)
+        assert obj.name == 'КАДР'
+
+        with pytest.raises(ValueError):
+            _ = f.object('VERY_MUCH_TESTY_SET', 'КАДР', 12, 1)
+
+    finally:
+        dlisio.common.set_encodings(prev_encodings)
+        f.close()
+
 def test_non_utf8_frame():
     # findfdata (and hence load) should _not_ fail because of a non-utf8
     # Frame name. Furthermore, it should be possible to extract the curves of
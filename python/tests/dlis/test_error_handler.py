@@ -111,6 +111,26 @@ def test_curves_broken_fmt_in_multirecord_frame(assert_error):
         expected =  np.array([1, 2, 3, 4, 5, 7, 8, 9])
         assert np.array_equal(curves['FRAMENO'], expected)
 
+def test_curves_broken_fmt_workers(assert_error):
+    path = 'data/chap4-7/iflr/broken-fmt-multiframe.dlis'
+    with dlis.load(path, error_handler=errorhandler) as (f, *_):
+        frame = f.object('FRAME', 'FRAME-REPRCODE', 10, 0)
+        curves = frame.curves(workers=2)
+        assert_error("fmtstr would read past end")
+
+        expected =  np.array([1, 2, 3, 4, 5, 7, 8, 9])
+        assert np.array_equal(curves['FRAMENO'], expected)
+
+def test_curves_all_broken_fmt(assert_error):
+    path = 'data/chap4-7/iflr/broken-fmt-multiframe.dlis'
+    with dlis.load(path, error_handler=errorhandler) as (f, *_):
+        frame = f.object('FRAME', 'FRAME-REPRCODE', 10, 0)
+        curves = f.curves_all()[frame.fingerprint]
+        assert_error("fmtstr would read past end")
+
+        expected =  np.array([1, 2, 3, 4, 5, 7, 8, 9])
+        assert np.array_equal(curves['FRAMENO'], expected)
+
 def test_parse_objects_unexpected_attribute_in_set(assert_error):
     path = 'data/chap3/explicit/broken-in-set.dlis'
     with dlis.load(path, error_handler=errorhandler) as (f, *_):
@@ -6,6 +6,8 @@ import pytest
 
 import shutil
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import dlisio
 from dlisio import dlis
@@ -99,7 +101,7 @@ def test_filehandles_closed_when_load_fails(tmpdir):
     with pytest.raises(RuntimeError):
         _ =  dlis.load(extract)
 
-    # dlis.load fails at core.findfdata
+    # dlis.load fails at core.findoffsets (indexing fdata)
     with pytest.raises(RuntimeError):
         _ =  dlis.load(fdata)
 
@@ -147,6 +149,129 @@ def test_context_manager_with():
         for g in files:
             _ = g.fileheader
 
+def test_load_in_threads():
+    # The GIL is released while indexing, so files can be loaded concurrently
+    path = 'data/chap4-7/many-logical-files.dlis'
+
+    def summary(path):
+        with dlis.load(path) as files:
+            return [(f.fdata_index, len(f.find('.*', '.*'))) for f in files]
+
+    expected = summary(path)
+    with ThreadPoolExecutor(max_workers = 4) as executor:
+        results = list(executor.map(summary, [path] * 16))
+
+    assert all(result == expected for result in results)
+
+def test_lazy_load(monkeypatch):
+    path = 'data/chap4-7/many-logical-files.dlis'
+
+    def summary(f):
+        return (
+            f.fdata_index,
+            sorted(obj.fingerprint for obj in f.find('.*', '.*')),
+        )
+
+    with dlis.load(path) as files:
+        expected = [summary(f) for f in files]
+
+    parsed = []
+    parse_objects = dlisio.core.parse_objects
+    def counting_parse_objects(*args):
+        parsed.append(args)
+        return parse_objects(*args)
+
+    monkeypatch.setattr(dlisio.core, 'parse_objects', counting_parse_objects)
+    with dlis.load(path, lazy=True) as files:
+        assert len(files) == 3
+        assert len(parsed) == 0
+
+        f, *_ = files
+        _ = f.fileheader
+        assert len(parsed) == 1
+
+        assert [summary(f) for f in files] == expected
+        assert len(parsed) == 3
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_load_many(executor):
+    paths = [
+        'data/chap4-7/many-logical-files.dlis',
+        'data/chap4-7/iflr/multidimensions-multifdata.dlis',
+    ] * 4
+
+    def summary(files):
+        return [
+            (
+                f.fdata_index,
+                sorted(obj.fingerprint for obj in f.find('.*', '.*')),
+            )
+            for f in files
+        ]
+
+    expected = {}
+    for path in set(paths):
+        with dlis.load(path) as files:
+            expected[path] = summary(files)
+
+    loaded = []
+    for path, files in dlis.load_many(paths, workers=2, executor=executor):
+        with files:
+            assert summary(files) == expected[path]
+        loaded.append(path)
+
+    assert sorted(loaded) == sorted(paths)
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_load_many_errors(executor, tmpdir):
+    path = 'data/chap4-7/many-logical-files.dlis'
+    missing = str(tmpdir.join('missing.dlis'))
+    paths = [path, missing, path]
+
+    with pytest.raises(RuntimeError) as exc:
+        for _, files in dlis.load_many(paths, workers=1, executor=executor):
+            files.close()
+    assert 'missing.dlis' in str(exc.value)
+    assert 'is not an existing regular file' in str(exc.value)
+
+    handler = dlisio.common.ErrorHandler(
+        critical=dlisio.common.Actions.LOG_ERROR)
+
+    loaded = []
+    for p, files in dlis.load_many(paths, workers=1, executor=executor,
+                                   error_handler=handler):
+        with files:
+            loaded.append(p)
+
+    assert loaded == [path, path]
+
+def test_load_many_invalid_executor():
+    with pytest.raises(ValueError):
+        _ = list(dlis.load_many([], executor='fork'))
+
+def test_load_mmap_not_slower():
+    # Indexing through the mapping must not be slower than plain reads. The
+    # best of many runs is compared, with some slack for timing noise. Reads
+    # that are served one byte at a time from the mapping are an order of
+    # magnitude slower on this file.
+    path = 'data/206_05a-_3_DWL_DWL_WIRE_258276498.DLIS'
+
+    def index(mmap):
+        best = float('inf')
+        for _ in range(20):
+            start = time.perf_counter()
+            files = dlis.load(path, lazy=True, mmap=mmap)
+            best = min(best, time.perf_counter() - start)
+            fdata_index = [f.fdata_index for f in files]
+            files.close()
+        return best, fdata_index
+
+    plain, expected = index(mmap=False)
+    mapped, fdata_index = index(mmap=True)
+
+    assert fdata_index == expected
+    assert mapped < 2 * plain
+
 def test_load_nonexisting_file():
     with pytest.raises(OSError) as exc:
         _ = dlis.load("this_file_does_not_exist.dlis")
@@ -177,3 +302,55 @@ def test_invalid_attribute_in_load():
     with dlis.load(path) as files:
         for f in files:
             f.load()
+
+def test_index_cache(tmpdir, monkeypatch):
+    path = str(tmpdir.join('many-logical-files.dlis'))
+    shutil.copyfile('data/chap4-7/many-logical-files.dlis', path)
+    cache = str(tmpdir.join('cache'))
+
+    def summary(files):
+        return [(
+            f.storage_label(),
+            f.fdata_index,
+            f.fdata_sizes,
+            f.fdata_framenos,
+            {k : [tuple(x) for x in v] for k, v in f.fdata_tails.items()},
+            sorted(obj.fingerprint for obj in f.find('.*', '.*')),
+        ) for f in files]
+
+    with dlis.load(path) as files:
+        expected = summary(files)
+
+    with dlis.load(path, index_cache=cache) as files:
+        assert summary(files) == expected
+    assert len(os.listdir(cache)) == 1
+
+    # A warm load does not scan the file
+    def findoffsets(*args):
+        raise AssertionError('file was scanned')
+
+    with monkeypatch.context() as m:
+        m.setattr(dlisio.core, 'findoffsets', findoffsets)
+        with dlis.load(path, index_cache=cache) as files:
+            assert summary(files) == expected
+
+    # The cached index is invalidated when the file changes
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    with monkeypatch.context() as m:
+        m.setattr(dlisio.core, 'findoffsets', findoffsets)
+        with pytest.raises(AssertionError):
+            _ = dlis.load(path, index_cache=cache)
+
+    with dlis.load(path, index_cache=cache) as files:
+        assert summary(files) == expected
+
+def test_index_cache_not_written_on_errors(tmpdir):
+    cache = str(tmpdir.join('cache'))
+    errorhandler = dlisio.common.ErrorHandler(
+        critical=dlisio.common.Actions.LOG_ERROR)
+
+    path = 'data/chap2/zeroed-in-1st-lr.dlis'
+    with dlis.load(path, error_handler=errorhandler, index_cache=cache):
+        pass
+    assert not os.path.exists(cache) or len(os.listdir(cache)) == 0
@@ -154,6 +154,64 @@ def test_find_type(tmpdir_factory, merge_files_manyLR):
         for obj in objs:
             assert obj in refs
 
+def test_find_native_matchers(tmpdir_factory, merge_files_manyLR):
+    fpath = str(tmpdir_factory.mktemp('lf').join('find-native.dlis'))
+    content = [
+        'data/chap4-7/eflr/envelope.dlis.part',
+        'data/chap4-7/eflr/file-header.dlis.part',
+        'data/chap4-7/eflr/match/T.CHANNEL-I.MATCH1-O.16-C.0.dlis.part',
+        'data/chap4-7/eflr/match/T.CHANNEL-I.MATCH111-O.16-C.0.dlis.part',
+        'data/chap4-7/eflr/match/T.CHANNEL-I.MATCH1-O.127-C.0.dlis.part',
+    ]
+    merge_files_manyLR(fpath, content)
+    with dlis.load(fpath) as (f, *_):
+        exact = dlis.utils.exact_matcher()
+        icase = dlis.utils.icase_matcher()
+
+        assert exact.match('MATCH1', 'MATCH1')
+        assert not exact.match('match1', 'MATCH1')
+        assert icase.match('match1', 'MATCH1')
+        assert not icase.match('match1', 'MATCH11')
+
+        # match is a static method, and can be called on the class
+        assert dlis.utils.exact_matcher.match('MATCH1', 'MATCH1')
+        assert not dlis.utils.exact_matcher.match('MATCH1', 'MATCH11')
+        assert dlis.utils.icase_matcher.match('match1', 'MATCH1')
+
+        assert len(f.find('CHANNEL', 'MATCH1', matcher=exact)) == 2
+        assert len(f.find('CHANNEL', 'match1', matcher=exact)) == 0
+        assert len(f.find('channel', 'match1', matcher=icase)) == 2
+        assert len(f.find('channel', matcher=icase)) == 3
+
+        # Without caching, the matchers are passed on to the pool
+        f.cache_metadata(False)
+        assert len(f.find('CHANNEL', 'MATCH1', matcher=exact)) == 2
+        assert len(f.find('channel', 'match1', matcher=icase)) == 2
+
+        # Subclasses that override match are called through python
+        class prefix_matcher(dlis.utils.exact_matcher):
+            def match(self, pattern, candidate):
+                return candidate.startswith(pattern)
+
+        prefix = prefix_matcher()
+        assert len(f.find('CHANNEL', 'MATCH1', matcher=prefix)) == 3
+
+def test_object_without_caching(f):
+    expected = f.object('CHANNEL', 'CHANN1', 10, 0)
+    f.cache_metadata(False)
+    try:
+        channel = f.object('CHANNEL', 'CHANN1', 10, 0)
+        assert channel == expected
+        assert f.object('CHANNEL', 'CHANN1') == expected
+
+        with pytest.raises(ValueError):
+            _ = f.object('CHANNEL', 'CHANN1', 11, 0)
+
+        with pytest.raises(ValueError):
+            _ = f.object('CHANNEL', 'CHANN1', 10, 1000)
+    finally:
+        f.cache_metadata(True)
+
 def test_find_invalid_regex(f):
     with pytest.raises(ValueError):
         _ = next(f.find('*'))
@@ -301,6 +359,41 @@ def test_objectstore_objects_are_cached(f):
     _ = f.object('TOOL', 'TOOL1')
     assert len(f.store.cache['TOOL']) == 2
 
+def test_objectstore_fingerprints(f):
+    # Make sure the cache is cleared
+    f.store.clear_cache()
+    assert f.store.fingerprints == {}
+
+    channel = f.object('CHANNEL', 'CHANN1', 10, 0)
+    assert f.store.fingerprints[channel.fingerprint] == [channel]
+
+    # Only objects of the so-far queried types are indexed
+    assert all(x.startswith('T.CHANNEL-') for x in f.store.fingerprints)
+
+    # Origin and copynumber that no object can have
+    with pytest.raises(ValueError):
+        _ = f.object('CHANNEL', 'CHANN1', 10, 1000)
+
+    f.store.clear_cache()
+    assert f.store.fingerprints == {}
+
+def test_resolve_all(f):
+    # Make sure the cache is cleared
+    f.store.clear_cache()
+
+    try:
+        f.resolve_all()
+        assert set(f.store.cache.keys()) == f.store.types()
+
+        frame = f.object('FRAME', 'FRAME1', 10, 0)
+        assert 'CHANNELS' in frame.attribute_cache
+        assert frame.channels == [
+            f.object('CHANNEL', 'CHANN1', 10, 0),
+            f.object('CHANNEL', 'CHANN2', 10, 0),
+        ]
+    finally:
+        f.store.clear_cache()
+
 def test_objectstore_objects_are_not_cached(f):
     f.cache_metadata(False)
 
@@ -30,6 +30,17 @@ def test_dfsr_dtype():
 
         assert dtype == expected
 
+def test_curves_mmap():
+    path = 'data/lis/MUD_LOG_1.LIS'
+
+    with lis.load(path) as (lf, *tail):
+        dfsr = lf.data_format_specs()[0]
+        expected = lis.curves(lf, dfsr)
+
+    with lis.load(path, mmap=True) as (lf, *tail):
+        dfsr = lf.data_format_specs()[0]
+        np.testing.assert_array_equal(lis.curves(lf, dfsr), expected)
+
 
 headers = [
     'data/lis/records/RHLR-1.lis.part',
@@ -550,6 +561,35 @@ def test_fdata_many_frames_per_record(tmpdir, merge_lis_prs):
         expected = np.array([3, 6, 9, 12])
         np.testing.assert_array_equal(curves['CH03'], expected)
 
+def test_fdata_out(tmpdir, merge_lis_prs):
+    fpath = os.path.join(str(tmpdir), 'many-frames-per-record.lis')
+
+    content = headers + [
+        'data/lis/records/curves/dfsr-simple.lis.part',
+        'data/lis/records/curves/fdata-frames-in-record.lis.part',
+    ] + trailers
+
+    merge_lis_prs(fpath, content)
+
+    with lis.load(fpath) as (f,):
+        dfs = f.data_format_specs()[0]
+        curves = lis.curves(f, dfs)
+
+        out = np.zeros(6, dtype = curves.dtype)
+        assert lis.curves(f, dfs, out = out) == 4
+        np.testing.assert_array_equal(out[:4], curves)
+        np.testing.assert_array_equal(out[4:], np.zeros(2, curves.dtype))
+
+        with pytest.raises(ValueError) as exc:
+            lis.curves(f, dfs, out = np.zeros(3, dtype = curves.dtype))
+        assert 'too small' in str(exc.value)
+
+        with pytest.raises(ValueError):
+            lis.curves(f, dfs, out = np.zeros(6, dtype = 'f4'))
+
+        with pytest.raises(ValueError):
+            lis.curves(f, dfs, out = np.zeros(12, dtype = curves.dtype)[::2])
+
 
 def test_depth_mode_1_dir_down_nospace(tmpdir, merge_lis_prs):
     fpath = os.path.join(str(tmpdir), 'depth-dir-down.lis')
@@ -1136,6 +1176,14 @@ def test_fdata_fast_channel_two_different(tmpdir, merge_lis_prs):
         expected = np.array([4, 5, 6, 10, 11, 12])
         np.testing.assert_array_equal(curves['CH03'], expected)
 
+        # Fast channels are written a whole frame, i.e. 3 rows, at a time
+        out = np.zeros(7, dtype = curves.dtype)
+        assert lis.curves(f, dfs, sample_rate=3, out=out) == 6
+        np.testing.assert_array_equal(out[:6], curves)
+
+        with pytest.raises(ValueError):
+            lis.curves(f, dfs, sample_rate=3, out=out[:5])
+
 def test_fdata_fast_channel_two_same(tmpdir, merge_lis_prs):
     fpath = os.path.join(str(tmpdir), 'fast-channels-sampled-same.lis')
 
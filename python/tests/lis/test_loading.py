@@ -30,6 +30,21 @@ def test_filehandles_closed(tmpdir):
     os.remove(tmp)
     os.remove(load_failure_escape)
 
+def test_load_mmap():
+    path = 'data/lis/layouts/layout_tif_01.lis'
+
+    def summary(files):
+        return [
+            [(rec.type, rec.size) for rec in f.explicits()]
+            for f in files
+        ]
+
+    with lis.load(path) as files:
+        expected = summary(files)
+
+    with lis.load(path, mmap=True) as files:
+        assert summary(files) == expected
+
 def test_filehandles_closed_when_load_fails(tmpdir, merge_lis_prs):
     # majority of exceptions in load are hard to invoke, so they are not tested
     empty = os.path.join(str(tmpdir), 'empty.lis')